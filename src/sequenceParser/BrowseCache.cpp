@@ -0,0 +1,101 @@
+#include "BrowseCache.hpp"
+#include "filesystem.hpp"
+
+#include "detail/DirectoryCache.hpp"
+
+#include <boost/lexical_cast.hpp>
+#include <boost/make_shared.hpp>
+#include <boost/foreach.hpp>
+
+
+namespace sequenceParser {
+
+namespace bfs = boost::filesystem;
+
+namespace {
+
+/**
+ * @return the key of a browse in the cache
+ */
+std::string getBrowseKey( const bfs::path& directory, const EDetection detectOptions, const std::vector<std::string>& filters )
+{
+	// the separator can't be in a path
+	static const char separator = '\0';
+	std::string key( directory.string() );
+	key += separator;
+	key += boost::lexical_cast<std::string>( int( detectOptions ) );
+	BOOST_FOREACH( const std::string& filter, filters )
+	{
+		key += separator;
+		key += filter;
+	}
+	return key;
+}
+
+}
+
+BrowseCache::BrowseCache( const std::size_t maxSize )
+	: _cache( new detail::DirectoryCache( maxSize ) )
+{
+}
+
+BrowseCache::~BrowseCache()
+{
+	delete _cache;
+}
+
+std::vector<Item> BrowseCache::browse(
+		const bfs::path& directory,
+		const EDetection detectOptions,
+		const std::vector<std::string>& filters )
+{
+	detail::DirectoryVersion version;
+	if( ! detail::getDirectoryVersion( directory, version ) )
+	{
+		// a pattern or a file
+		_cache->addMiss();
+		return sequenceParser::browse( directory, detectOptions, filters );
+	}
+
+	const std::string key = getBrowseKey( directory, detectOptions, filters );
+	detail::DirectoryCache::ItemsPtr items = _cache->get( key, version );
+	if( ! items )
+	{
+		// the version is taken before the read: a modification during the browse invalidates the result
+		items = boost::make_shared<const std::vector<Item> >( sequenceParser::browse( directory, detectOptions, filters ) );
+		_cache->put( key, version, items );
+	}
+	return *items;
+}
+
+void BrowseCache::clear()
+{
+	_cache->clear();
+}
+
+void BrowseCache::setMaxSize( const std::size_t maxSize )
+{
+	_cache->setMaxSize( maxSize );
+}
+
+std::size_t BrowseCache::getMaxSize() const
+{
+	return _cache->getMaxSize();
+}
+
+std::size_t BrowseCache::size() const
+{
+	return _cache->size();
+}
+
+BrowseCacheCounters BrowseCache::getCounters() const
+{
+	return _cache->getCounters();
+}
+
+void BrowseCache::resetCounters()
+{
+	_cache->resetCounters();
+}
+
+}
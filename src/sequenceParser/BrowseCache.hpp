@@ -0,0 +1,102 @@
+#ifndef _SEQUENCE_PARSER_BROWSE_CACHE_HPP_
+#define _SEQUENCE_PARSER_BROWSE_CACHE_HPP_
+
+#include "common.hpp"
+#include "Item.hpp"
+
+#include <boost/filesystem/path.hpp>
+
+#include <vector>
+#include <string>
+
+
+namespace sequenceParser {
+
+#ifndef SWIG
+namespace detail {
+class DirectoryCache;
+}
+#endif
+
+/**
+ * @brief Number of browses done through a BrowseCache, since the last reset.
+ * @see BrowseCache::getCounters
+ */
+struct BrowseCacheCounters
+{
+	std::size_t nbHits; ///< browses answered from the cache
+	std::size_t nbMisses; ///< browses which read the directory
+	std::size_t nbEvictions; ///< results removed from the cache to respect its max size
+};
+
+/**
+ * @brief Browse directories, and keep the results to browse them again without reading them.
+ * The results are kept by directory, detection options and filters,
+ * and reused as long as the modification time and the last change time of the directory don't change
+ * (checked with a single stat of the directory for each browse).
+ * When the cache is full, the least recently used results are removed.
+ *
+ * @note Only the browses of directories are cached (not the browses of a pattern or of a file).
+ * @note A directory modified less than a second before its browse is not cached,
+ * because an other modification in the same clock tick would not be detected.
+ * @note Thread-safe.
+ * @see browse
+ */
+class BrowseCache
+{
+public:
+	/**
+	 * @param[in] maxSize: max number of browse results in the cache
+	 */
+	explicit BrowseCache( const std::size_t maxSize = 256 );
+
+	~BrowseCache();
+
+	/**
+	 * @brief Browse the content of a directory, from the cache if the directory has not changed.
+	 * @see browse
+	 */
+	std::vector<Item> browse(
+		const std::string& directory,
+		const EDetection detectOptions = eDetectionDefault,
+		const std::vector<std::string>& filters = std::vector<std::string>() )
+	{
+#ifdef SWIGJAVA
+		return browse( boost::filesystem::path(utf8_to_latin1(directory)), detectOptions, filters );
+#else
+		return browse( boost::filesystem::path(directory), detectOptions, filters );
+#endif
+	}
+
+#ifndef SWIG
+	std::vector<Item> browse(
+		const boost::filesystem::path& directory,
+		const EDetection detectOptions = eDetectionDefault,
+		const std::vector<std::string>& filters = std::vector<std::string>() );
+#endif
+
+	/// @brief Remove all the results from the cache.
+	void clear();
+
+	void setMaxSize( const std::size_t maxSize );
+	std::size_t getMaxSize() const;
+
+	/// @return number of browse results in the cache
+	std::size_t size() const;
+
+	BrowseCacheCounters getCounters() const;
+	void resetCounters();
+
+private:
+	BrowseCache( const BrowseCache& );
+	BrowseCache& operator=( const BrowseCache& );
+
+private:
+#ifndef SWIG
+	detail::DirectoryCache* _cache;
+#endif
+};
+
+}
+
+#endif
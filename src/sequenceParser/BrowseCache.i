@@ -0,0 +1,7 @@
+%include "common.i"
+
+%{
+#include "sequenceParser/BrowseCache.hpp"
+%}
+
+%include "BrowseCache.hpp"
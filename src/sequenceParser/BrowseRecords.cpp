@@ -0,0 +1,106 @@
+#include "BrowseRecords.hpp"
+#include "ItemStream.hpp"
+
+#include <boost/foreach.hpp>
+
+#include <stdexcept>
+
+
+namespace sequenceParser {
+
+namespace bfs = boost::filesystem;
+
+BrowseRecords::BrowseRecords()
+	: _rangeOffsets( 1, 0 )
+{
+}
+
+BrowseRecords::BrowseRecords( const std::vector<Item>& items )
+	: _rangeOffsets( 1, 0 )
+{
+	BOOST_FOREACH( const Item& item, items )
+	{
+		push_back( item );
+	}
+}
+
+void BrowseRecords::push_back( const Item& item )
+{
+	_types.push_back( item.getType() );
+
+	// each folder is stored once
+	const std::string folder = item.getFolder();
+	const std::pair<boost::unordered_map<std::string, std::size_t>::iterator, bool> folderIndex =
+		_folderIndexByPath.insert( std::make_pair( folder, _folders.size() ) );
+	if( folderIndex.second )
+		_folders.push_back( folder );
+	_folderIndices.push_back( folderIndex.first->second );
+
+	_names.push_back( item.getFilename() );
+
+	if( item.getType() != eTypeSequence )
+	{
+		_prefixes.push_back( std::string() );
+		_suffixes.push_back( std::string() );
+		_fixedPaddings.push_back( 0 );
+		_maxPaddings.push_back( 0 );
+		_firstTimes.push_back( 0 );
+		_lastTimes.push_back( 0 );
+		_nbFiles.push_back( 1 );
+		_rangeOffsets.push_back( _rangeOffsets.back() );
+		return;
+	}
+
+	const Sequence& sequence = item.getSequence();
+	_prefixes.push_back( sequence.getPrefix() );
+	_suffixes.push_back( sequence.getSuffix() );
+	_fixedPaddings.push_back( sequence.getFixedPadding() );
+	_maxPaddings.push_back( sequence.getMaxPadding() );
+	_firstTimes.push_back( sequence.getFirstTime() );
+	_lastTimes.push_back( sequence.getLastTime() );
+	_nbFiles.push_back( sequence.getNbFiles() );
+	BOOST_FOREACH( const FrameRange& range, sequence.getFrameRanges() )
+	{
+		_ranges.push_back( range.first );
+		_ranges.push_back( range.last );
+		_ranges.push_back( range.step );
+	}
+	_rangeOffsets.push_back( _rangeOffsets.back() + sequence.getFrameRanges().size() );
+}
+
+Item BrowseRecords::getItem( const std::size_t i ) const
+{
+	if( i >= size() )
+		throw std::out_of_range( "no item at this index" );
+
+	const bfs::path folder( _folders.at( _folderIndices[i] ) );
+	const EType type = static_cast<EType>( _types[i] );
+	if( type != eTypeSequence )
+		return Item( type, folder / _names.at( i ) );
+
+	Sequence sequence( _prefixes.at( i ), _fixedPaddings[i], _maxPaddings[i], _suffixes.at( i ), _firstTimes[i], _lastTimes[i] );
+	std::vector<FrameRange>& ranges = sequence.getFrameRanges();
+	ranges.clear();
+	for( long long r = _rangeOffsets[i]; r < _rangeOffsets[i+1]; ++r )
+	{
+		ranges.push_back( FrameRange( _ranges[3*r], _ranges[3*r+1], _ranges[3*r+2] ) );
+	}
+	return Item( sequence, folder );
+}
+
+BrowseRecords browseRecords(
+		const bfs::path& directory,
+		const EDetection detectOptions,
+		const std::vector<std::string>& filters )
+{
+	BrowseRecords records;
+	ItemStream stream( directory, detectOptions, filters );
+	Item item;
+	while( stream.next( item ) )
+	{
+		records.push_back( item );
+	}
+	return records;
+}
+
+}
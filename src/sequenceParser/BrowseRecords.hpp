@@ -0,0 +1,148 @@
+#ifndef _SEQUENCE_PARSER_BROWSE_RECORDS_HPP_
+#define _SEQUENCE_PARSER_BROWSE_RECORDS_HPP_
+
+#include "common.hpp"
+#include "Item.hpp"
+
+#include <boost/filesystem/path.hpp>
+#include <boost/unordered_map.hpp>
+
+#include <vector>
+#include <string>
+
+
+namespace sequenceParser {
+
+#ifndef SWIG
+/**
+ * @brief Strings stored one after the other in a single buffer.
+ * The string i is between offsets[i] and offsets[i+1].
+ */
+struct StringColumn
+{
+	StringColumn()
+		: offsets( 1, 0 )
+	{}
+
+	void push_back( const std::string& str )
+	{
+		data += str;
+		offsets.push_back( data.size() );
+	}
+
+	std::size_t size() const { return offsets.size() - 1; }
+
+	std::string at( const std::size_t i ) const
+	{
+		return data.substr( offsets[i], offsets[i+1] - offsets[i] );
+	}
+
+	std::string data;
+	std::vector<long long> offsets;
+};
+#endif
+
+/**
+ * @brief Items of a browse, stored by columns instead of Item objects.
+ * All the values of an attribute are contiguous, so they can be read at once
+ * (in python: as int64 buffers usable by numpy without any copy, and lists of strings),
+ * without an object for each item.
+ *
+ * For an item i:
+ * - type: EType of the item,
+ * - folder: folders[folderIndices[i]] (the folders are stored once),
+ * - name: the filename, or the pattern of a sequence (like "foo.####.jpg"),
+ * - prefix, suffix: the prefix and the suffix of a sequence (empty for the other items),
+ * - fixedPadding, maxPadding, firstTime, lastTime: of a sequence (0 for the other items),
+ * - nbFiles: the number of files of a sequence (1 for the other items),
+ * - frame ranges of a sequence: ranges[rangeOffsets[i]] to ranges[rangeOffsets[i+1]] (excluded),
+ *   with 3 values by range: first, last, step.
+ *
+ * @see browseRecords
+ */
+class BrowseRecords
+{
+public:
+	BrowseRecords();
+
+	/// @brief Records of a list of items (from browseRecursive for example).
+	explicit BrowseRecords( const std::vector<Item>& items );
+
+	/// @brief Add the record of an item.
+	void push_back( const Item& item );
+
+	/// @return number of items
+	std::size_t size() const { return _types.size(); }
+
+	/// @brief Recreate the item i.
+	Item getItem( const std::size_t i ) const;
+
+#ifndef SWIG
+	const std::vector<long long>& getTypes() const { return _types; }
+	const std::vector<long long>& getFolderIndices() const { return _folderIndices; }
+	const StringColumn& getFolders() const { return _folders; }
+	const StringColumn& getNames() const { return _names; }
+	const StringColumn& getPrefixes() const { return _prefixes; }
+	const StringColumn& getSuffixes() const { return _suffixes; }
+	const std::vector<long long>& getFixedPaddings() const { return _fixedPaddings; }
+	const std::vector<long long>& getMaxPaddings() const { return _maxPaddings; }
+	const std::vector<long long>& getFirstTimes() const { return _firstTimes; }
+	const std::vector<long long>& getLastTimes() const { return _lastTimes; }
+	const std::vector<long long>& getNbFiles() const { return _nbFiles; }
+	/// @return number of ranges before the ranges of each item (and the total number of ranges at the end)
+	const std::vector<long long>& getRangeOffsets() const { return _rangeOffsets; }
+	/// @return first, last and step of each range
+	const std::vector<long long>& getRanges() const { return _ranges; }
+#endif
+
+private:
+#ifndef SWIG
+	std::vector<long long> _types;
+	std::vector<long long> _folderIndices;
+	StringColumn _folders;
+	boost::unordered_map<std::string, std::size_t> _folderIndexByPath;
+	StringColumn _names;
+	StringColumn _prefixes;
+	StringColumn _suffixes;
+	std::vector<long long> _fixedPaddings;
+	std::vector<long long> _maxPaddings;
+	std::vector<long long> _firstTimes;
+	std::vector<long long> _lastTimes;
+	std::vector<long long> _nbFiles;
+	std::vector<long long> _rangeOffsets;
+	std::vector<long long> _ranges;
+#endif
+};
+
+#ifndef SWIG
+/**
+ * @brief Browse the content of a directory, like browse, and get the items by columns.
+ * The items are added to the records one at a time, without a list of all the items.
+ * @see browse
+ */
+BrowseRecords browseRecords(
+		const boost::filesystem::path& directory,
+		const EDetection detectOptions = eDetectionDefault,
+		const std::vector<std::string>& filters = std::vector<std::string>() );
+#endif
+
+/**
+ * @brief Browse the content of a directory, like browse, and get the items by columns.
+ * @note With the python binding, the GIL is released during the browse.
+ * @see browse
+ */
+inline BrowseRecords browseRecords(
+		const std::string& directory,
+		const EDetection detectOptions = eDetectionDefault,
+		const std::vector<std::string>& filters = std::vector<std::string>() )
+{
+#ifdef SWIGJAVA
+	return browseRecords( boost::filesystem::path(utf8_to_latin1(directory)), detectOptions, filters );
+#else
+	return browseRecords( boost::filesystem::path(directory), detectOptions, filters );
+#endif
+}
+
+}
+
+#endif
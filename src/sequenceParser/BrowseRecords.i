@@ -0,0 +1,78 @@
+%include "common.i"
+
+%{
+#include "sequenceParser/BrowseRecords.hpp"
+%}
+
+#ifdef SWIGPYTHON
+
+%{
+/// @return a buffer of a column of int64 values
+PyObject* sequenceParser_getColumnBuffer( const std::vector<long long>& column, const std::size_t nbColumns )
+{
+	long long* values = NULL;
+	PyObject* buffer = sequenceParser_newInt64Buffer( column.size(), nbColumns, values );
+	if( ! column.empty() )
+		std::memcpy( values, &column[0], column.size() * sizeof( long long ) );
+	return buffer;
+}
+
+/// @return a list of the strings of a column
+PyObject* sequenceParser_getColumnStrings( const sequenceParser::StringColumn& column )
+{
+	PyObject* list = PyList_New( column.size() );
+	if( ! list )
+		throw std::bad_alloc();
+	for( std::size_t i = 0; i < column.size(); ++i )
+	{
+		PyObject* str = PyUnicode_DecodeUTF8( column.data.data() + column.offsets[i], column.offsets[i+1] - column.offsets[i], "surrogateescape" );
+		if( ! str )
+		{
+			Py_DECREF( list );
+			throw std::invalid_argument( "can't decode a string" );
+		}
+		PyList_SET_ITEM( list, i, str );
+	}
+	return list;
+}
+%}
+
+SEQUENCEPARSER_RELEASE_GIL(sequenceParser::browseRecords)
+
+%extend sequenceParser::BrowseRecords
+{
+	/// @brief EType of each item, in an int64 buffer.
+	PyObject* getTypes() const { return sequenceParser_getColumnBuffer( $self->getTypes(), 1 ); }
+	/// @brief Index of the folder of each item in getFolders(), in an int64 buffer.
+	PyObject* getFolderIndices() const { return sequenceParser_getColumnBuffer( $self->getFolderIndices(), 1 ); }
+	PyObject* getFixedPaddings() const { return sequenceParser_getColumnBuffer( $self->getFixedPaddings(), 1 ); }
+	PyObject* getMaxPaddings() const { return sequenceParser_getColumnBuffer( $self->getMaxPaddings(), 1 ); }
+	PyObject* getFirstTimes() const { return sequenceParser_getColumnBuffer( $self->getFirstTimes(), 1 ); }
+	PyObject* getLastTimes() const { return sequenceParser_getColumnBuffer( $self->getLastTimes(), 1 ); }
+	PyObject* getNbFiles() const { return sequenceParser_getColumnBuffer( $self->getNbFiles(), 1 ); }
+	/// @brief Index of the first range of each item in getRanges() (and the number of ranges at the end), in an int64 buffer.
+	PyObject* getRangeOffsets() const { return sequenceParser_getColumnBuffer( $self->getRangeOffsets(), 1 ); }
+	/// @brief All the ranges, in an int64 buffer with 3 columns: first, last, step.
+	PyObject* getRanges() const { return sequenceParser_getColumnBuffer( $self->getRanges(), 3 ); }
+
+	/// @brief The folders, each one once.
+	PyObject* getFolders() const { return sequenceParser_getColumnStrings( $self->getFolders() ); }
+	PyObject* getNames() const { return sequenceParser_getColumnStrings( $self->getNames() ); }
+	PyObject* getPrefixes() const { return sequenceParser_getColumnStrings( $self->getPrefixes() ); }
+	PyObject* getSuffixes() const { return sequenceParser_getColumnStrings( $self->getSuffixes() ); }
+
+	%pythoncode
+	{
+		def __len__(self):
+			return self.size()
+
+		def __getitem__(self, index):
+			if index < 0:
+				index += self.size()
+			return self.getItem(index)
+	}
+}
+
+#endif
+
+%include "BrowseRecords.hpp"
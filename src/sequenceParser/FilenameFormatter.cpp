@@ -0,0 +1,159 @@
+#include "FilenameFormatter.hpp"
+
+#include <boost/foreach.hpp>
+
+#include <algorithm>
+#include <cstring>
+#include <limits>
+#include <stdexcept>
+
+
+namespace sequenceParser {
+
+namespace {
+
+/// max number of digits of a Time
+const std::size_t maxDigits = std::numeric_limits<unsigned long long>::digits10 + 1;
+
+/**
+ * @brief The ranges can come from the bindings, where the step is not checked.
+ * @return the number of frames of the range, 0 if it is reversed (first > last)
+ * @throw std::invalid_argument if the step is not at least 1
+ */
+Time getNbFramesToFormat( const FrameRange& range )
+{
+	if( range.step < 1 )
+		throw std::invalid_argument( "The step of a frame range must be at least 1." );
+	if( range.first > range.last )
+		return 0;
+	return range.getNbFrames();
+}
+
+}
+
+void FilenameFormatter::init( const Sequence& sequence, const boost::filesystem::path& folder )
+{
+	_head = folder.string();
+	if( ! _head.empty() && _head[_head.size() - 1] != '/' && _head[_head.size() - 1] != boost::filesystem::path::preferred_separator )
+		_head += boost::filesystem::path::preferred_separator;
+	_head += sequence.getPrefix();
+	_suffix = sequence.getSuffix();
+	_padding = sequence.getFixedPadding();
+}
+
+std::size_t FilenameFormatter::getMaxNumberLength( const std::size_t padding )
+{
+	// the sign and the digits
+	return 1 + std::max( padding, maxDigits );
+}
+
+std::size_t FilenameFormatter::formatNumber( const Time time, const std::size_t padding, char* buffer )
+{
+	// digits from the end, without the sign (the absolute value of the min Time is not a Time)
+	char digits[maxDigits];
+	char* digitsBegin = digits + maxDigits;
+	unsigned long long value = ( time < 0 ) ? 0ULL - static_cast<unsigned long long>( time ) : static_cast<unsigned long long>( time );
+	do
+	{
+		*--digitsBegin = static_cast<char>( '0' + value % 10 );
+		value /= 10;
+	}
+	while( value != 0 );
+	const std::size_t nbDigits = digits + maxDigits - digitsBegin;
+
+	// "-0002" and not "00-2"
+	char* out = buffer;
+	if( time < 0 )
+		*out++ = '-';
+	if( nbDigits < padding )
+	{
+		std::memset( out, '0', padding - nbDigits );
+		out += padding - nbDigits;
+	}
+	std::memcpy( out, digitsBegin, nbDigits );
+	out += nbDigits;
+	return out - buffer;
+}
+
+std::size_t FilenameFormatter::getMaxLength() const
+{
+	return _head.size() + getMaxNumberLength( _padding ) + _suffix.size();
+}
+
+std::size_t FilenameFormatter::format( const Time time, char* buffer ) const
+{
+	char* out = buffer;
+	std::memcpy( out, _head.data(), _head.size() );
+	out += _head.size();
+	out += formatNumber( time, _padding, out );
+	std::memcpy( out, _suffix.data(), _suffix.size() );
+	out += _suffix.size();
+	return out - buffer;
+}
+
+void FilenameFormatter::format( const Time time, std::string& outName ) const
+{
+	outName.assign( _head );
+	// write the number directly at the end of the string
+	const std::size_t length = outName.size();
+	outName.resize( length + getMaxNumberLength( _padding ) );
+	outName.resize( length + formatNumber( time, _padding, &outName[length] ) );
+	outName.append( _suffix );
+}
+
+std::string FilenameFormatter::getNameAt( const Time time ) const
+{
+	std::string name;
+	name.reserve( getMaxLength() );
+	format( time, name );
+	return name;
+}
+
+void FilenameFormatter::appendRange( std::string& buffer, const FrameRange& range, const char separator ) const
+{
+	if( range.first > range.last )
+		return;
+	const std::size_t maxLength = getMaxLength() + 1;
+	for( Time t = range.first; ; t += range.step )
+	{
+		// write directly at the end of the buffer
+		const std::size_t length = buffer.size();
+		buffer.resize( length + maxLength );
+		buffer[length] = separator;
+		buffer.resize( length + 1 + format( t, &buffer[length + 1] ) );
+		// stop before the next frame, which could overflow near the max Time
+		if( static_cast<unsigned long long>( range.last ) - static_cast<unsigned long long>( t ) < static_cast<unsigned long long>( range.step ) )
+			break;
+	}
+}
+
+std::string FilenameFormatter::formatRange( const FrameRange& range, const char separator ) const
+{
+	std::string buffer;
+	buffer.reserve( getNbFramesToFormat( range ) * ( getMaxLength() + 1 ) );
+	appendRange( buffer, range, separator );
+	// no separator before the first name
+	if( ! buffer.empty() )
+		buffer.erase( 0, 1 );
+	return buffer;
+}
+
+std::string FilenameFormatter::formatRanges( const std::vector<FrameRange>& ranges, const char separator ) const
+{
+	Time nbFrames = 0;
+	BOOST_FOREACH( const FrameRange& range, ranges )
+	{
+		nbFrames += getNbFramesToFormat( range );
+	}
+	std::string buffer;
+	buffer.reserve( nbFrames * ( getMaxLength() + 1 ) );
+	BOOST_FOREACH( const FrameRange& range, ranges )
+	{
+		appendRange( buffer, range, separator );
+	}
+	if( ! buffer.empty() )
+		buffer.erase( 0, 1 );
+	return buffer;
+}
+
+}
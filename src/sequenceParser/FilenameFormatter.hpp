@@ -0,0 +1,103 @@
+#ifndef _SEQUENCE_PARSER_FILENAME_FORMATTER_HPP_
+#define _SEQUENCE_PARSER_FILENAME_FORMATTER_HPP_
+
+#include "common.hpp"
+#include "Sequence.hpp"
+
+#include <boost/filesystem/path.hpp>
+
+#include <string>
+#include <vector>
+
+
+namespace sequenceParser {
+
+/**
+ * @brief Build the filenames of a sequence, without any stream.
+ * The prefix, the folder and the padding are prepared once,
+ * then each name is written with a direct integer to digits conversion.
+ *
+ * @note The negative frames are written with the sign before the padding: "foo.-0002.jpg" (not "foo.00-2.jpg").
+ * @see Sequence::getFilenameAt
+ */
+class FilenameFormatter
+{
+public:
+	/**
+	 * @param[in] sequence: the sequence (its prefix, suffix and padding are copied)
+	 * @param[in] folder: folder added before the filenames, nothing if empty
+	 */
+	explicit FilenameFormatter( const Sequence& sequence, const std::string& folder = "" )
+	{
+#ifdef SWIGJAVA
+		init( sequence, boost::filesystem::path( utf8_to_latin1( folder ) ) );
+#else
+		init( sequence, boost::filesystem::path( folder ) );
+#endif
+	}
+
+#ifndef SWIG
+	FilenameFormatter( const Sequence& sequence, const boost::filesystem::path& folder )
+	{
+		init( sequence, folder );
+	}
+
+	/**
+	 * @brief Write the name of a frame in a buffer, without any allocation.
+	 * @param[out] buffer: at least getMaxLength() chars, no null character is added
+	 * @return number of written chars
+	 */
+	std::size_t format( const Time time, char* buffer ) const;
+
+	/**
+	 * @brief Write the name of a frame in a string.
+	 * The string keeps its memory: if it's reused for all the frames, there is no allocation.
+	 */
+	void format( const Time time, std::string& outName ) const;
+
+	/**
+	 * @brief Write a frame number with a padding.
+	 * @param[out] buffer: at least getMaxNumberLength( padding ) chars
+	 * @return number of written chars
+	 */
+	static std::size_t formatNumber( const Time time, const std::size_t padding, char* buffer );
+
+	/// @return max number of chars of a frame number with a padding
+	static std::size_t getMaxNumberLength( const std::size_t padding );
+#endif
+
+	/// @return max number of chars of a name
+	std::size_t getMaxLength() const;
+
+	/// @return the name of a frame
+	std::string getNameAt( const Time time ) const;
+
+	/**
+	 * @brief Get all the names of a frame range in a single buffer (useful for the bindings: a single call for all the names).
+	 * @param[in] separator: added between the names
+	 * @throw std::invalid_argument if the step of the range is not at least 1
+	 */
+	std::string formatRange( const FrameRange& range, const char separator = '\n' ) const;
+
+	/**
+	 * @brief Get all the names of frame ranges in a single buffer (useful for the bindings: a single call for all the names).
+	 * @param[in] separator: added between the names
+	 * @throw std::invalid_argument if the step of a range is not at least 1
+	 */
+	std::string formatRanges( const std::vector<FrameRange>& ranges, const char separator = '\n' ) const;
+
+private:
+	void init( const Sequence& sequence, const boost::filesystem::path& folder );
+
+	/// @brief Add the names of a range at the end of a buffer, each one preceded by the separator.
+	void appendRange( std::string& buffer, const FrameRange& range, const char separator ) const;
+
+private:
+	std::string _head; ///< folder and prefix
+	std::string _suffix;
+	std::size_t _padding;
+};
+
+}
+
+#endif
@@ -0,0 +1,7 @@
+%include "common.i"
+
+%{
+#include "sequenceParser/FilenameFormatter.hpp"
+%}
+
+%include "FilenameFormatter.hpp"
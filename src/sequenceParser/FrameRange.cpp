@@ -1,5 +1,7 @@
 #include "FrameRange.hpp"
 
+#include <boost/next_prior.hpp>
+
 #include <algorithm>
 #include <sstream>
 
@@ -47,80 +49,308 @@ std::ostream& operator<<(std::ostream& os, const FrameRangesView& frameRanges)
 	return os;
 }
 
-std::vector<FrameRange> extractFrameRanges( const std::vector<Time>& times )
+FrameRangesBuilder::FrameRangesBuilder( std::vector<FrameRange>& outRanges )
+	: _ranges( outRanges )
+	, _nbFrames( 0 )
+	, _previous( 0 )
 {
-	std::vector<FrameRange> res;
-	if( times.empty() )
-		return res;
-	if( times.size() == 1 )
+	_ranges.clear();
+}
+
+void FrameRangesBuilder::add( const Time time )
+{
+	switch( _nbFrames )
 	{
-		res.push_back(FrameRange(times.front()));
-		return res;
+		case 0:
+			_ranges.push_back( FrameRange( time ) );
+			break;
+		case 1:
+			_ranges.back() = FrameRange( _previous, time, std::max( Time(1), time - _previous ) );
+			break;
+		default:
+			addToRanges( time, time - _previous );
 	}
-	res.push_back( FrameRange(times[0], times[1], std::max(Time(1), times[1]-times[0])) );
-	if( times.size() == 2 )
+	_previous = time;
+	++_nbFrames;
+}
+
+void FrameRangesBuilder::addToRanges( const Time time, const Time newStep )
+{
+	FrameRange& prevRange = _ranges.back();
+	if( prevRange.step == newStep )
 	{
-		return res;
+		// same step as previous range, so update it.
+		prevRange.last = time;
 	}
+	else if( prevRange.getNbFrames() == 1 )
+	{
+		// the previous range only contains one frame (without step)
+		// so update it with the new step
+		prevRange.last = time;
+		prevRange.step = newStep;
 
-	std::vector<Time>::const_iterator itPrev = times.begin();
-	std::vector<Time>::const_iterator itEnd = times.end();
-	std::vector<Time>::const_iterator it = itPrev;
-	++it;
+		// The range has only 2 frames.
+	}
+	else if( prevRange.getNbFrames() == 2 )
+	{
+		// The previous range has only 2 frames, so it's not really a range...
+		// So steal the frame of the previous range.
+		const FrameRange newFrameRange( prevRange.last, time, newStep );
+
+		// Previous range is a still frame
+		prevRange.last = prevRange.first;
+		prevRange.step = 1;
+
+		_ranges.push_back( newFrameRange );
+	}
+	else
+	{
+		// The previous range is complete.
+		// Create a new one.
+		_ranges.push_back( FrameRange( time, time ) );
+	}
+}
 
-	itPrev = it;
-	++it;
+void FrameRangesBuilder::finish()
+{
+	// with 2 frames, a single range of 2 frames
+	if( _nbFrames <= 2 )
+		return;
 
-	for( ; it != itEnd; itPrev = it, ++it )
+	FrameRange& lastRange = _ranges.back();
+	if( lastRange.getNbFrames() == 2 )
 	{
-		Time newStep = *it - *itPrev;
-		FrameRange& prevRange = res.back();
-		if( prevRange.step == newStep )
+		// If the last range has only 2 frames, so it's not really a range...
+		// Split in 2 ranges of 1 frame.
+		const FrameRange newFrameRange( lastRange.last, lastRange.last, 1 );
+		lastRange.last = lastRange.first;
+		lastRange.step = 1;
+
+		_ranges.push_back( newFrameRange );
+	}
+}
+
+std::vector<FrameRange> extractFrameRanges( const std::vector<Time>& times )
+{
+	std::vector<FrameRange> res;
+	FrameRangesBuilder builder( res );
+	BOOST_FOREACH( const Time time, times )
+	{
+		builder.add( time );
+	}
+	builder.finish();
+	return res;
+}
+
+namespace {
+
+/// Under this number of frames, a radix sort is slower than a std::sort
+const std::size_t minNbFramesForRadixSort = 1024;
+
+/// Number of bits of a digit of the radix sort
+const std::size_t radixBits = 8;
+const std::size_t radixSize = 1 << radixBits;
+const std::size_t nbRadixDigits = sizeof( Time ) * 8 / radixBits;
+
+/// @return the key to sort a frame as an unsigned number: the sign bit is flipped
+inline unsigned long long radixKey( const Time time )
+{
+	return static_cast<unsigned long long>( time ) ^ ( 1ULL << ( sizeof( Time ) * 8 - 1 ) );
+}
+
+/**
+ * @brief Least significant digit radix sort.
+ * The histograms of all the digits are computed in a single pass,
+ * and a digit with the same value for all the frames is skipped
+ * (the high digits of the frames numbers usually).
+ */
+void radixSortFrames( std::vector<Time>& frames )
+{
+	std::vector<std::size_t> histograms( nbRadixDigits * radixSize, 0 );
+	BOOST_FOREACH( const Time time, frames )
+	{
+		const unsigned long long key = radixKey( time );
+		for( std::size_t digit = 0; digit < nbRadixDigits; ++digit )
+			++histograms[digit * radixSize + ( ( key >> ( digit * radixBits ) ) & ( radixSize - 1 ) )];
+	}
+
+	std::vector<Time> buffer( frames.size() );
+	for( std::size_t digit = 0; digit < nbRadixDigits; ++digit )
+	{
+		std::size_t* histogram = &histograms[digit * radixSize];
+		const unsigned long long firstValue = ( radixKey( frames.front() ) >> ( digit * radixBits ) ) & ( radixSize - 1 );
+		if( histogram[firstValue] == frames.size() )
+			continue; // all the frames have the same digit
+
+		// offset of each digit value
+		std::size_t offset = 0;
+		for( std::size_t value = 0; value < radixSize; ++value )
 		{
-			// same step as previous range, so update it.
-			prevRange.last = *it;
+			const std::size_t count = histogram[value];
+			histogram[value] = offset;
+			offset += count;
 		}
-		else if( prevRange.getNbFrames() == 1 )
+		BOOST_FOREACH( const Time time, frames )
 		{
-			// the previous range only contains one frame (without step)
-			// so update it with the new step
-			prevRange.last = *it;
-			prevRange.step = newStep;
-
-			// The range has only 2 frames.
+			buffer[histogram[( radixKey( time ) >> ( digit * radixBits ) ) & ( radixSize - 1 )]++] = time;
 		}
-		else if( prevRange.getNbFrames() == 2 )
-		{
-			// The previous range has only 2 frames, so it's not really a range...
-			// So steal the frame of the previous range.
-			FrameRange newFrameRange(prevRange.last, *it, newStep);
+		frames.swap( buffer );
+	}
+}
 
-			// Previous range is a still frame
-			prevRange.last = prevRange.first;
-			prevRange.step = 1;
+}
 
-			res.push_back( newFrameRange );
-		}
-		else
+void sortFrames( std::vector<Time>& frames )
+{
+	// the frames are usually read in order
+	bool sorted = true;
+	for( std::size_t i = 1; sorted && i < frames.size(); ++i )
+		sorted = frames[i-1] <= frames[i];
+	if( sorted )
+		return;
+
+	if( frames.size() < minNbFramesForRadixSort )
+		std::sort( frames.begin(), frames.end() );
+	else
+		radixSortFrames( frames );
+}
+
+std::vector<FrameRange> extractFrameRangesFromUnsorted( std::vector<Time>& frames )
+{
+	sortFrames( frames );
+	frames.erase( std::unique( frames.begin(), frames.end() ), frames.end() );
+	return extractFrameRanges( frames );
+}
+
+void copyFrames( const std::vector<FrameRange>& ranges, long long* outFrames )
+{
+	BOOST_FOREACH( const FrameRange& range, ranges )
+	{
+		const Time nbFrames = range.getNbFrames();
+		// no frame after the last one, which could overflow near the max Time
+		for( Time i = 0; i < nbFrames; ++i )
+			*outFrames++ = range.first + i * range.step;
+	}
+}
+
+namespace {
+
+bool rangeEndsBefore( const FrameRange& range, const Time time )
+{
+	return range.last < time;
+}
+
+}
+
+std::vector<FrameRange>::const_iterator findFrameRange( const std::vector<FrameRange>& ranges, const Time time )
+{
+	return std::lower_bound( ranges.begin(), ranges.end(), time, rangeEndsBefore );
+}
+
+bool insertFrame( std::vector<FrameRange>& ranges, const Time time )
+{
+	std::vector<FrameRange>::iterator it = ranges.begin() + ( findFrameRange( ranges, time ) - ranges.begin() );
+	if( it != ranges.end() && it->first < time )
+	{
+		if( it->contains( time ) )
+			return false;
+		// between two frames of a range with a step: split the range around the new frame
+		const Time before = it->first + ( ( time - it->first ) / it->step ) * it->step;
+		const FrameRange after( before + it->step, it->last, it->step );
+		it->last = before;
+		it = ranges.insert( it + 1, after );
+		ranges.insert( it, FrameRange( time ) );
+		return true;
+	}
+	if( it != ranges.end() && it->first == time )
+		return false;
+
+	// the frame is between the previous range and this one
+	if( it != ranges.begin() )
+	{
+		FrameRange& previous = *( it - 1 );
+		if( previous.last + previous.step == time )
 		{
-			// The previous range is complete.
-			// Create a new one.
-			res.push_back( FrameRange(*it, *it) );
+			previous.last = time;
+			if( it != ranges.end() && it->step == previous.step && it->first == time + previous.step )
+			{
+				// the frame fills the hole between the two ranges
+				previous.last = it->last;
+				ranges.erase( it );
+			}
+			return true;
 		}
 	}
+	if( it != ranges.end() && it->first - it->step == time )
+	{
+		it->first = time;
+		return true;
+	}
+	ranges.insert( it, FrameRange( time ) );
+	return true;
+}
 
-	FrameRange& lastRange = res.back();
-	if( lastRange.getNbFrames() == 2 )
+bool eraseFrame( std::vector<FrameRange>& ranges, const Time time )
+{
+	std::vector<FrameRange>::iterator it = ranges.begin() + ( findFrameRange( ranges, time ) - ranges.begin() );
+	if( it == ranges.end() || ! it->contains( time ) )
+		return false;
+
+	if( it->first == it->last )
 	{
-		// If the last range has only 2 frames, so it's not really a range...
-		// Split in 2 ranges of 1 frame.
-		FrameRange newFrameRange(lastRange.last, lastRange.last, 1);
-		lastRange.last = lastRange.first;
-		lastRange.step = 1;
+		ranges.erase( it );
+	}
+	else if( it->first == time )
+	{
+		it->first += it->step;
+	}
+	else if( it->last == time )
+	{
+		it->last -= it->step;
+	}
+	else
+	{
+		// split the range around the removed frame
+		const FrameRange after( time + it->step, it->last, it->step );
+		it->last = time - it->step;
+		ranges.insert( it + 1, after );
+	}
+	return true;
+}
 
-		res.push_back( newFrameRange );
+FrameRangesIndex::FrameRangesIndex( const std::vector<FrameRange>& ranges )
+	: _ranges( ranges )
+{
+	_nbFramesBefore.reserve( _ranges.size() + 1 );
+	_nbFramesBefore.push_back( 0 );
+	BOOST_FOREACH( const FrameRange& frameRange, _ranges )
+	{
+		_nbFramesBefore.push_back( _nbFramesBefore.back() + frameRange.getNbFrames() );
 	}
-	return res;
+}
+
+bool FrameRangesIndex::contains( const Time time ) const
+{
+	const std::vector<FrameRange>::const_iterator it = findFrameRange( _ranges, time );
+	return it != _ranges.end() && it->contains( time );
+}
+
+Time FrameRangesIndex::indexOf( const Time time ) const
+{
+	const std::vector<FrameRange>::const_iterator it = findFrameRange( _ranges, time );
+	if( it == _ranges.end() || ! it->contains( time ) )
+		return -1;
+	return _nbFramesBefore[it - _ranges.begin()] + ( time - it->first ) / it->step;
+}
+
+Time FrameRangesIndex::frameAt( const Time index ) const
+{
+	if( index < 0 || index >= size() )
+		throw std::out_of_range( "FrameRangesIndex::frameAt: index out of range" );
+	// the last range which starts at or before index
+	const std::vector<Time>::const_iterator it = boost::prior( std::upper_bound( _nbFramesBefore.begin(), _nbFramesBefore.end(), index ) );
+	const std::size_t rangeIndex = it - _nbFramesBefore.begin();
+	return _ranges[rangeIndex].atIndex( index - *it );
 }
 
 std::size_t FrameRangesView::size() const
@@ -153,21 +383,22 @@ std::size_t FrameRangesSubView::size() const
 
 FrameRangesSubView::EFrameStatus FrameRangesSubView::findGreaterOrEqualFrameRange( std::vector<FrameRange>::const_iterator& outIt, const Time time ) const
 {
-	outIt = _data.begin();
-	std::vector<FrameRange>::const_iterator itEnd = _data.end();
-	if( outIt == itEnd )
+	if( _data.empty() )
+	{
+		outIt = _data.begin();
 		return eFrameStatusNoFrameRange;
-	if( time < outIt->first )
-		return eFrameStatusBeforeAll;
-
-	for(; outIt != itEnd; ++outIt)
+	}
+	if( time < _data.front().first )
 	{
-		if( time < outIt->first )
-			return eFrameStatusBetweenRange;
-		if( time >= outIt->first && time <= outIt->last )
-			return eFrameStatusInRange;
+		outIt = _data.begin();
+		return eFrameStatusBeforeAll;
 	}
-	return eFrameStatusAfterAll;
+	outIt = findFrameRange( _data, time );
+	if( outIt == _data.end() )
+		return eFrameStatusAfterAll;
+	if( time < outIt->first )
+		return eFrameStatusBetweenRange;
+	return eFrameStatusInRange;
 }
 
 FrameRangesSubView::const_iterator FrameRangesSubView::begin() const
@@ -7,6 +7,7 @@
 #include <boost/assert.hpp>
 
 #include <vector>
+#include <stdexcept>
 #include <iostream>
 #include <cmath>
 
@@ -38,6 +39,11 @@ public:
 		BOOST_ASSERT( step >= 1 );
 		return ((last - first) / step) + 1;
 	}
+	/// @return if the time is one of the frames of the range
+	inline bool contains(Time time) const
+	{
+		return time >= first && time <= last && ((time - first) % step) == 0;
+	}
 	inline bool operator==( const FrameRange& other ) const
 	{
 		return (first == other.first) &&
@@ -167,9 +173,109 @@ public:
 };
 
 #ifndef SWIG
+/**
+ * @brief Build the ranges of sorted frames, one frame at a time, in a single pass.
+ * No container of frames is needed: the frames can be read from any structure.
+ * @see extractFrameRanges
+ */
+class FrameRangesBuilder
+{
+public:
+	/// @param[out] outRanges: the ranges to build, cleared
+	explicit FrameRangesBuilder( std::vector<FrameRange>& outRanges );
+
+	/// @brief Add a frame, after all the smaller frames.
+	void add( const Time time );
+
+	/// @brief To call after the last frame.
+	void finish();
+
+private:
+	void addToRanges( const Time time, const Time newStep );
+
+private:
+	std::vector<FrameRange>& _ranges;
+	std::size_t _nbFrames;
+	Time _previous;
+};
+
+/**
+ * @brief Extract the ranges of sorted frames.
+ * @see FrameRangesBuilder
+ */
 std::vector<FrameRange> extractFrameRanges( const std::vector<Time>& times );
+
+/**
+ * @brief Sort frames, before extracting their ranges.
+ * Nothing is done if the frames are already sorted,
+ * and a radix sort is used on a big number of frames.
+ */
+void sortFrames( std::vector<Time>& frames );
+
+/**
+ * @brief Extract the ranges of frames in any order, with duplicates.
+ * @param[in,out] frames: sorted and without duplicates at the end
+ */
+std::vector<FrameRange> extractFrameRangesFromUnsorted( std::vector<Time>& frames );
+
+/**
+ * @brief Write all the frames of the ranges in a contiguous buffer (like a numpy array).
+ * @param[out] outFrames: buffer of FrameRangesView( ranges ).size() frames
+ */
+void copyFrames( const std::vector<FrameRange>& ranges, long long* outFrames );
+
+/**
+ * @brief Find the first range which ends at or after the given time, with a binary search.
+ * @param[in] ranges: sorted ranges without overlap (like the ranges of a Sequence)
+ * @return ranges.end() if all the ranges end before the given time
+ */
+std::vector<FrameRange>::const_iterator findFrameRange( const std::vector<FrameRange>& ranges, const Time time );
+
+/**
+ * @brief Add a frame to sorted ranges, and keep them sorted and without overlap.
+ * The range is found with a binary search, then extended, merged with the next one, split or created.
+ * @return false if the frame is already in the ranges
+ */
+bool insertFrame( std::vector<FrameRange>& ranges, const Time time );
+
+/**
+ * @brief Remove a frame from sorted ranges, and keep them sorted and without overlap.
+ * The range is found with a binary search, then reduced, split or removed.
+ * @return false if the frame is not in the ranges
+ */
+bool eraseFrame( std::vector<FrameRange>& ranges, const Time time );
 #endif
 
+/**
+ * @brief Index on sorted frame ranges, to get the position of a frame and
+ * the frame at a position in O(log(number of ranges)).
+ * It keeps a copy of the ranges, so it stays valid if the source ranges change.
+ * Useful to do a lot of lookups on a sequence with holes.
+ */
+class FrameRangesIndex
+{
+public:
+	FrameRangesIndex( const std::vector<FrameRange>& ranges );
+
+	/// @return The number of frames.
+	Time size() const { return _nbFramesBefore.back(); }
+
+	bool contains( const Time time ) const;
+
+	/// @return The position of the frame in the ranges, or -1 if the frame is not in the ranges.
+	Time indexOf( const Time time ) const;
+
+	/**
+	 * @return The frame at the given position in the ranges.
+	 * @throw std::out_of_range if the index is not in [0, size()[
+	 */
+	Time frameAt( const Time index ) const;
+
+private:
+	std::vector<FrameRange> _ranges;
+	std::vector<Time> _nbFramesBefore; ///< cumulative number of frames before each range, with the total at the end
+};
+
 class FrameRangesView
 {
 public:
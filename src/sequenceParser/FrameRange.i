@@ -4,6 +4,161 @@
 #include "sequenceParser/FrameRange.hpp"
 %}
 
+#ifdef SWIGPYTHON
+%{
+#include <cstring>
+
+/**
+ * @brief Create a Python buffer of int64 values (a memoryview on a bytearray),
+ * usable without any copy by numpy (numpy.asarray) or by array.array.
+ * @param[in] nbColumns: 1 for a flat buffer, or the size of the second dimension
+ * @param[out] outValues: the values to fill
+ */
+PyObject* sequenceParser_newInt64Buffer( const std::size_t nbValues, const std::size_t nbColumns, long long*& outValues )
+{
+	PyObject* bytes = PyByteArray_FromStringAndSize( NULL, nbValues * sizeof( long long ) );
+	if( ! bytes )
+		throw std::bad_alloc();
+	outValues = reinterpret_cast<long long*>( PyByteArray_AS_STRING( bytes ) );
+#if PY_VERSION_HEX < 0x03030000
+	// no memoryview.cast: the raw bytes
+	return bytes;
+#else
+	PyObject* view = PyMemoryView_FromObject( bytes );
+	Py_DECREF( bytes ); // owned by the memoryview
+	if( ! view )
+		throw std::runtime_error( "can't create a memoryview" );
+	PyObject* int64View = ( nbColumns > 1 && nbValues > 0 ) ?
+		PyObject_CallMethod( view, const_cast<char*>( "cast" ), const_cast<char*>( "s(nn)" ), "q", Py_ssize_t( nbValues / nbColumns ), Py_ssize_t( nbColumns ) ) :
+		PyObject_CallMethod( view, const_cast<char*>( "cast" ), const_cast<char*>( "s" ), "q" );
+	Py_DECREF( view );
+	if( ! int64View )
+		throw std::runtime_error( "can't cast the memoryview to int64" );
+	return int64View;
+#endif
+}
+
+/**
+ * @brief The ranges can be modified from Python, where they are not checked.
+ * @throw std::invalid_argument if a range has a step less than 1, or is reversed (first > last)
+ */
+void sequenceParser_checkFrameRanges( const std::vector<sequenceParser::FrameRange>& ranges )
+{
+	BOOST_FOREACH( const sequenceParser::FrameRange& range, ranges )
+	{
+		if( range.step < 1 )
+			throw std::invalid_argument( "The step of a frame range must be at least 1." );
+		if( range.first > range.last )
+			throw std::invalid_argument( "The first frame of a frame range must not be after its last frame." );
+	}
+}
+
+/// @return a buffer of all the frames of the ranges
+PyObject* sequenceParser_getFramesBuffer( const std::vector<sequenceParser::FrameRange>& ranges )
+{
+	sequenceParser_checkFrameRanges( ranges );
+	long long* frames = NULL;
+	PyObject* buffer = sequenceParser_newInt64Buffer( sequenceParser::FrameRangesView( ranges ).size(), 1, frames );
+	sequenceParser::copyFrames( ranges, frames );
+	return buffer;
+}
+
+/// @return a buffer of the ranges, with 3 columns: first, last, step
+PyObject* sequenceParser_getRangesBuffer( const std::vector<sequenceParser::FrameRange>& ranges )
+{
+	sequenceParser_checkFrameRanges( ranges );
+	long long* values = NULL;
+	PyObject* buffer = sequenceParser_newInt64Buffer( ranges.size() * 3, 3, values );
+	BOOST_FOREACH( const sequenceParser::FrameRange& range, ranges )
+	{
+		*values++ = range.first;
+		*values++ = range.last;
+		*values++ = range.step;
+	}
+	return buffer;
+}
+
+/**
+ * @brief Read an integer of a contiguous buffer.
+ * @param[in] format: the format of the buffer, without byte order
+ */
+bool sequenceParser_readBufferInteger( const char* data, const char format, const Py_ssize_t itemSize, sequenceParser::Time& outValue )
+{
+	const bool isSigned = std::strchr( "bhilqn", format ) != NULL;
+	if( ! isSigned && ! std::strchr( "BHILQN", format ) )
+		return false;
+	switch( itemSize )
+	{
+		case 1: outValue = isSigned ? Py_ssize_t( *reinterpret_cast<const signed char*>( data ) ) : Py_ssize_t( *reinterpret_cast<const unsigned char*>( data ) ); return true;
+		case 2: { short s; std::memcpy( &s, data, 2 ); outValue = isSigned ? s : (unsigned short)s; return true; }
+		case 4: { int i; std::memcpy( &i, data, 4 ); outValue = isSigned ? i : (unsigned int)i; return true; }
+		case 8:
+		{
+			long long l;
+			std::memcpy( &l, data, 8 );
+			outValue = l;
+			// an unsigned value above the max Time
+			return isSigned || l >= 0;
+		}
+	}
+	return false;
+}
+
+/**
+ * @brief Get the frames of a Python object:
+ * a contiguous buffer of integers (like a numpy array), or any sequence of integers.
+ * @throw std::invalid_argument if the object doesn't contain integers (or if an unsigned integer is above the max int64)
+ */
+void sequenceParser_getFramesFromPython( PyObject* input, std::vector<sequenceParser::Time>& outFrames )
+{
+	if( PyObject_CheckBuffer( input ) )
+	{
+		Py_buffer view;
+		if( PyObject_GetBuffer( input, &view, PyBUF_FORMAT | PyBUF_C_CONTIGUOUS ) != 0 )
+		{
+			PyErr_Clear();
+			throw std::invalid_argument( "the buffer of frames should be contiguous" );
+		}
+		// native byte order only
+		const char* format = view.format ? view.format : "B";
+		static const unsigned short endianTest = 1;
+		const char nativeOrder = *reinterpret_cast<const char*>( &endianTest ) ? '<' : '>';
+		if( *format == '@' || *format == '=' || *format == nativeOrder )
+			++format;
+		const Py_ssize_t nbFrames = view.itemsize ? view.len / view.itemsize : 0;
+		outFrames.resize( nbFrames );
+		bool valid = ( std::strlen( format ) == 1 );
+		for( Py_ssize_t i = 0; valid && i < nbFrames; ++i )
+			valid = sequenceParser_readBufferInteger( static_cast<const char*>( view.buf ) + i * view.itemsize, *format, view.itemsize, outFrames[i] );
+		PyBuffer_Release( &view );
+		if( ! valid )
+			throw std::invalid_argument( "the buffer of frames should contain integers, in the range of int64" );
+		return;
+	}
+
+	PyObject* sequence = PySequence_Fast( input, "the frames should be a buffer or a sequence of integers" );
+	if( ! sequence )
+	{
+		PyErr_Clear();
+		throw std::invalid_argument( "the frames should be a buffer or a sequence of integers" );
+	}
+	const Py_ssize_t nbFrames = PySequence_Fast_GET_SIZE( sequence );
+	outFrames.resize( nbFrames );
+	for( Py_ssize_t i = 0; i < nbFrames; ++i )
+	{
+		outFrames[i] = PyLong_AsLongLong( PySequence_Fast_GET_ITEM( sequence, i ) );
+		if( outFrames[i] == -1 && PyErr_Occurred() )
+		{
+			PyErr_Clear();
+			Py_DECREF( sequence );
+			throw std::invalid_argument( "the frames should be integers" );
+		}
+	}
+	Py_DECREF( sequence );
+}
+%}
+#endif
+
 #ifdef SWIGJAVA
 
 %rename(toString) sequenceParser::FrameRange::string;
@@ -30,6 +185,17 @@
 
 #ifdef SWIGPYTHON
 
+%extend sequenceParser::FrameRangesView
+{
+	/**
+	 * @brief All the frames, in a contiguous int64 buffer (numpy.asarray gives an array without any copy).
+	 */
+	PyObject* getFramesBuffer() const
+	{
+		return sequenceParser_getFramesBuffer( $self->getFrameRanges() );
+	}
+}
+
 %pythoncode
 {
     class PyFrameRangesConstIterator:
@@ -1,4 +1,7 @@
 #include "Item.hpp"
+#include "SequenceFiles.hpp"
+
+#include "detail/syscalls.hpp"
 
 #include <boost/filesystem.hpp>
 
@@ -24,9 +27,10 @@ std::vector<Item> Item::explode() const{
 		return outItems;
 	}
 
-	const std::vector<boost::filesystem::path>& seqFilesPath = getSequence().getAbsoluteFilesPath(_path.parent_path());
-	BOOST_FOREACH(const boost::filesystem::path& filePath, seqFilesPath)
-		outItems.push_back(Item(getTypeFromPath(filePath), filePath));
+	const ExplodedItems items( *this, true );
+	outItems.reserve( items.size() );
+	BOOST_FOREACH( const Item& item, items )
+		outItems.push_back( item );
 	return outItems;
 }
 
@@ -39,15 +43,19 @@ std::string Item::getFirstFilename() const
 
 EType getTypeFromPath( const boost::filesystem::path& path )
 {
-	if( bfs::is_symlink( path ) )
+	// a single stat, which doesn't follow the links
+	boost::system::error_code errorCode;
+	detail::countStat();
+	const bfs::file_status status = bfs::symlink_status( path, errorCode );
+	if( bfs::is_symlink( status ) )
 	{
 		return eTypeLink;
 	}
-	if( bfs::is_regular_file( path ) )
+	if( bfs::is_regular_file( status ) )
 	{
 		return eTypeFile;
 	}
-	if( bfs::is_directory( path ) )
+	if( bfs::is_directory( status ) )
 	{
 		return eTypeFolder;
 	}
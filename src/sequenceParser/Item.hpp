@@ -63,6 +63,8 @@ public:
 	
 	/**
 	 * @brief Usefull for sequences items: explode sequence
+	 * @note The type of each file is checked with a stat.
+	 * @see ExplodedItems to iterate over the files without building the list of all the items.
 	 */
 	std::vector<Item> explode() const;
 
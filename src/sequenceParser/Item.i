@@ -17,3 +17,5 @@
 #endif
 
 %include "Item.hpp"
+
+%template(ItemVector) ::std::vector<sequenceParser::Item>;
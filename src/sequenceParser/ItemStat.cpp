@@ -1,11 +1,25 @@
 #include "ItemStat.hpp"
+#include "FilenameFormatter.hpp"
+
+#include "detail/syscalls.hpp"
+#include "detail/NameCache.hpp"
+#include "detail/ThreadPool.hpp"
+#include "detail/Profiler.hpp"
 
 #include <boost/filesystem/operations.hpp>
+#include <boost/bind.hpp>
+#include <boost/shared_ptr.hpp>
+#include <boost/make_shared.hpp>
+#include <boost/foreach.hpp>
+#include <boost/random/mersenne_twister.hpp>
+#include <boost/random/uniform_int_distribution.hpp>
+
+#include <algorithm>
+#include <cmath>
+#include <map>
 
 #ifdef __UNIX__
 #include <sys/stat.h>
-#include <pwd.h>
-#include <grp.h>
 #endif
 
 
@@ -13,7 +27,50 @@ namespace bfs = boost::filesystem;
 
 namespace sequenceParser {
 
-ItemStat::ItemStat( const Item& item, const bool approximative )
+namespace {
+
+/**
+ * @brief Choose the frames to stat in a sequence: the first one, the last one,
+ * and a random frame in each interval between them (stratified sampling).
+ * The random generator has a fixed seed, so the same frames are chosen for the same sequence.
+ * @param[in] frames: all the frames of the sequence
+ * @param[in] nbSamples: number of frames to choose, all the frames if 0 or if there are not enough frames
+ */
+std::vector<Time> sampleFrames( const FrameRangesIndex& frames, const std::size_t nbSamples )
+{
+	const Time nbFrames = frames.size();
+	std::vector<Time> sampledFrames;
+	if( nbSamples == 0 || nbFrames <= Time( nbSamples ) || nbFrames <= 2 )
+	{
+		sampledFrames.reserve( nbFrames );
+		for( Time i = 0; i < nbFrames; ++i )
+			sampledFrames.push_back( frames.frameAt( i ) );
+		return sampledFrames;
+	}
+
+	sampledFrames.reserve( nbSamples );
+	sampledFrames.push_back( frames.frameAt( 0 ) );
+	if( nbSamples > 1 )
+	{
+		boost::random::mt19937 generator;
+		// the frames between the first one and the last one are split in intervals
+		const Time nbIntervals = nbSamples - 2;
+		const Time nbInnerFrames = nbFrames - 2;
+		for( Time i = 0; i < nbIntervals; ++i )
+		{
+			const Time begin = 1 + ( i * nbInnerFrames ) / nbIntervals;
+			const Time end = 1 + ( ( i + 1 ) * nbInnerFrames ) / nbIntervals;
+			boost::random::uniform_int_distribution<Time> distribution( begin, end - 1 );
+			sampledFrames.push_back( frames.frameAt( distribution( generator ) ) );
+		}
+		sampledFrames.push_back( frames.frameAt( nbFrames - 1 ) );
+	}
+	return sampledFrames;
+}
+
+}
+
+ItemStat::ItemStat( const Item& item, const bool approximative, const std::size_t nbSamples, PerformanceReport* outReport )
 	: deviceId(0)
 	, inodeId(0)
 	, nbHardLinks(0)
@@ -27,6 +84,8 @@ ItemStat::ItemStat( const Item& item, const bool approximative )
 	, maxSize(0)
 	, realSize(0)
 	, sizeOnDisk(0)
+	, nbSampledFiles(1)
+	, sizeErrorBound(0)
 	, accessTime(-1)
 	, modificationTime(-1)
 	, lastChangeTime(-1)
@@ -39,7 +98,15 @@ ItemStat::ItemStat( const Item& item, const bool approximative )
 	, otherCanRead(false)
 	, otherCanWrite(false)
 	, otherCanExecute(false)
+	, _sumSquaredSizes(0)
 {
+	// an undefined item is not stat, it only gives an empty stat
+	if( item.getType() == eTypeUndefined )
+		return;
+	detail::OperationProfiler profiler( "ItemStat", item.getAbsoluteFilepath(), outReport );
+	detail::PhaseTimer timer( profiler.getReport(), &PerformanceReport::statTime );
+	if( profiler.getReport() )
+		profiler.getReport()->nbItems = 1;
 	switch(item.getType())
 	{
 		case eTypeFolder:
@@ -59,7 +126,7 @@ ItemStat::ItemStat( const Item& item, const bool approximative )
 		}
 		case eTypeSequence:
 		{
-			statSequence( item, approximative );
+			statSequence( item, approximative, nbSamples );
 			break;
 		}
 		default:
@@ -84,53 +151,102 @@ void ItemStat::setPermissions( const mode_t& protection )
 
 void ItemStat::setUserName()
 {
-    passwd* user = getpwuid(userId);
-    if(user && user->pw_name)
-        userName = std::string(user->pw_name);
+	std::string name;
+	if( detail::getUserName( userId, name ) )
+		userName = name;
 }
 
 void ItemStat::setGroupName()
 {
-    group* group = getgrgid(groupId);
-    if(group && group->gr_name)
-        groupName = std::string(group->gr_name);
+	std::string name;
+	if( detail::getGroupName( groupId, name ) )
+		groupName = name;
 }
 
 #endif
 
-void ItemStat::statLink( const boost::filesystem::path& path )
-{
-	boost::system::error_code errorCode;
-	const long long last_write_time = bfs::last_write_time(path, errorCode);
-	if(errorCode == boost::system::errc::success)
-	{
-		modificationTime = last_write_time;
-	}
-
 #ifdef __UNIX__
-	struct stat statInfos;
-	const int statStatus = lstat(path.c_str(), &statInfos);
-	if (statStatus == -1)
-		return;
 
-	fullNbHardLinks = nbHardLinks = statInfos.st_nlink;
+void ItemStat::fillFromStat( const struct stat& statInfos, const bool withNames )
+{
 	deviceId = statInfos.st_dev;
 	inodeId = statInfos.st_ino;
+	fullNbHardLinks = nbHardLinks = statInfos.st_nlink;
 	userId = statInfos.st_uid;
 	groupId = statInfos.st_gid;
 	accessTime = statInfos.st_atime;
+	modificationTime = statInfos.st_mtime;
 	lastChangeTime = statInfos.st_ctime;
 	size = statInfos.st_size;
 	minSize = size;
 	maxSize = size;
-	// size on hard-drive (takes hardlinks into account)
-	sizeOnDisk = (statInfos.st_blocks / nbHardLinks) * statInfos.st_blksize;
 	setPermissions(statInfos.st_mode);
-	setUserName();
-	setGroupName();
+
+	if( S_ISDIR( statInfos.st_mode ) )
+	{
+		sizeOnDisk = statInfos.st_blocks * statInfos.st_blksize;
+		// size (takes hardlinks into account)
+		realSize = size;
+	}
+	else
+	{
+		// size on hard-drive (takes hardlinks into account)
+		sizeOnDisk = (statInfos.st_blocks / nbHardLinks) * statInfos.st_blksize;
+		// size (takes hardlinks into account)
+		realSize = size / nbHardLinks;
+	}
+
+	if( withNames )
+	{
+		setUserName();
+		setGroupName();
+	}
+}
+
+void ItemStat::statPath( const boost::filesystem::path& path )
+{
+	// a single lstat gives all the informations
+	struct stat statInfos;
+	const int statStatus = detail::lstat(path.c_str(), &statInfos);
+	if (statStatus == -1)
+		return;
+	fillFromStat( statInfos, true );
+}
+
+void ItemStat::statEntry( const detail::OpenedDirectory& directory, const std::string& filename )
+{
+	struct stat statInfos;
+	if( directory.lstat( filename, &statInfos ) == -1 )
+		return;
+	fillFromStat( statInfos, true );
+}
+
+void ItemStat::statLink( const boost::filesystem::path& path )
+{
+	statPath( path );
+}
+
+void ItemStat::statFolder( const boost::filesystem::path& path )
+{
+	statPath( path );
+}
+
+void ItemStat::statFile( const boost::filesystem::path& path )
+{
+	statPath( path );
+}
+
 #else
+
+void ItemStat::statLink( const boost::filesystem::path& path )
+{
+	boost::system::error_code errorCode;
+	const long long last_write_time = bfs::last_write_time(path, errorCode);
+	if(errorCode == boost::system::errc::success)
+	{
+		modificationTime = last_write_time;
+	}
 	fullNbHardLinks = nbHardLinks = 1;
-#endif
 	realSize = size / nbHardLinks;
 }
 
@@ -143,28 +259,6 @@ void ItemStat::statFolder( const boost::filesystem::path& path )
 		fullNbHardLinks = nbHardLinks = hard_link_count;
 		modificationTime = bfs::last_write_time(path, errorCode);
 	}
-
-#ifdef __UNIX__
-	struct stat statInfos;
-	const int statStatus = lstat(path.c_str(), &statInfos);
-	if (statStatus == -1)
-		return;
-
-	deviceId = statInfos.st_dev;
-	inodeId = statInfos.st_ino;
-	userId = statInfos.st_uid;
-	groupId = statInfos.st_gid;
-	accessTime = statInfos.st_atime;
-	lastChangeTime = statInfos.st_ctime;
-	size = statInfos.st_size;
-	minSize = size;
-	maxSize = size;
-	sizeOnDisk = statInfos.st_blocks * statInfos.st_blksize;
-	setPermissions(statInfos.st_mode);
-	setUserName();
-	setGroupName();
-#endif
-
 	// size (takes hardlinks into account)
 	realSize = size;
 }
@@ -181,66 +275,68 @@ void ItemStat::statFile( const boost::filesystem::path& path )
 		maxSize = size;
 		modificationTime = bfs::last_write_time(path, errorCode);
 	}
-
-#ifdef __UNIX__
-	struct stat statInfos;
-	const int statStatus = lstat(path.c_str(), &statInfos);
-	if (statStatus == -1)
-		return;
-
-	deviceId = statInfos.st_dev;
-	inodeId = statInfos.st_ino;
-	userId = statInfos.st_uid;
-	groupId = statInfos.st_gid;
-	accessTime = statInfos.st_atime;
-	lastChangeTime = statInfos.st_ctime;
-	// size on hard-drive (takes hardlinks into account)
-	sizeOnDisk = (statInfos.st_blocks / nbHardLinks) * statInfos.st_blksize;
-	setPermissions(statInfos.st_mode);
-	setUserName();
-	setGroupName();
-#endif
-
 	// size (takes hardlinks into account)
 	realSize = size / nbHardLinks;
 }
 
-void ItemStat::statSequence( const Item& item, const bool approximative )
-{
-#ifdef __UNIX__
-	struct stat statInfos;
-	const int statStatus = lstat(item.getAbsoluteFirstFilename().c_str(), &statInfos);
-	if (statStatus == -1)
-		return;
-
-	deviceId = statInfos.st_dev;
-	inodeId = statInfos.st_ino;
-	userId = statInfos.st_uid;
-	groupId = statInfos.st_gid;
-	accessTime = statInfos.st_atime;
-	setPermissions(statInfos.st_mode);
-	setUserName();
-	setGroupName();
 #endif
 
-	modificationTime = 0;
-	fullNbHardLinks = 0;
-	size = 0;
-	minSize = 0;
-	maxSize = 0;
-	realSize = 0;
-	sizeOnDisk = 0;
-	lastChangeTime = 0;
-
-	const Sequence& seq = item.getSequence();
-
-	// if( ! approximative )
-	// else
-	//   TODO: stat on a subset of files
+bool ItemStat::statSequenceFrames( const Item& item, const Time* framesBegin, const Time* framesEnd, const bool isSequenceBegin, const detail::OpenedDirectory& directory )
+{
+	const FilenameFormatter formatter( item.getSequence() );
+	std::string filename; // reused for all the files
+	bool isFirstFile = true;
+	if( ! isSequenceBegin )
+		nbSampledFiles = 0; // nothing to merge if none of the files exist
 
-	BOOST_FOREACH(Item item, item.explode() )
+	for( const Time* frame = framesBegin; frame != framesEnd; ++frame )
 	{
-		const ItemStat fileStat(item);
+		formatter.format( *frame, filename );
+#ifdef __UNIX__
+		struct stat statInfos;
+		if( directory.lstat( filename, &statInfos ) == -1 )
+		{
+			if( isFirstFile && isSequenceBegin )
+				return false; // the sequence doesn't exist anymore
+			continue;
+		}
+		// empty stats, filled with the lstat result (the user and group names are the ones of the first file)
+		ItemStat fileStat( Item( eTypeUndefined, filename ) );
+		fileStat.fillFromStat( statInfos, false );
+#else
+		const ItemStat fileStat( Item( eTypeFile, directory.getPath() / filename ) );
+#endif
+
+		if( isFirstFile )
+		{
+			if( isSequenceBegin )
+			{
+				// the ids come from the first file
+				deviceId = fileStat.deviceId;
+				inodeId = fileStat.inodeId;
+				userId = fileStat.userId;
+				groupId = fileStat.groupId;
+				accessTime = fileStat.accessTime;
+#ifdef __UNIX__
+				setUserName();
+				setGroupName();
+#endif
+			}
+#ifdef __UNIX__
+			setPermissions( statInfos.st_mode );
+#endif
+			modificationTime = 0;
+			fullNbHardLinks = 0;
+			size = 0;
+			minSize = 0;
+			maxSize = 0;
+			realSize = 0;
+			sizeOnDisk = 0;
+			lastChangeTime = 0;
+			nbSampledFiles = 0;
+			_sumSquaredSizes = 0;
+			isFirstFile = false;
+		}
 
 		// use the most restrictive permissions in the sequence
 #ifdef __UNIX__
@@ -282,9 +378,248 @@ void ItemStat::statSequence( const Item& item, const bool approximative )
 			maxSize = fileStat.size;
 		realSize += fileStat.realSize;
 		sizeOnDisk += fileStat.sizeOnDisk;
+		_sumSquaredSizes += double( fileStat.size ) * fileStat.size;
+		++nbSampledFiles;
+	}
+	// an empty sequence doesn't exist
+	return ! ( isFirstFile && isSequenceBegin );
+}
+
+void ItemStat::mergeSequenceFrames( const ItemStat& other )
+{
+	if( other.nbSampledFiles == 0 )
+		return;
+
+	// use the most restrictive permissions in the sequence
+	ownerCanRead = ownerCanRead && other.ownerCanRead;
+	ownerCanWrite = ownerCanWrite && other.ownerCanWrite;
+	ownerCanExecute = ownerCanExecute && other.ownerCanExecute;
+	groupCanRead = groupCanRead && other.groupCanRead;
+	groupCanWrite = groupCanWrite && other.groupCanWrite;
+	groupCanExecute = groupCanExecute && other.groupCanExecute;
+	otherCanRead = otherCanRead && other.otherCanRead;
+	otherCanWrite = otherCanWrite && other.otherCanWrite;
+	otherCanExecute = otherCanExecute && other.otherCanExecute;
+
+	// use the latest modification date in the sequence
+	modificationTime = std::max( modificationTime, other.modificationTime );
+	lastChangeTime = std::max( lastChangeTime, other.lastChangeTime );
+
+	// compute sizes
+	fullNbHardLinks += other.fullNbHardLinks;
+	size += other.size;
+	if( minSize == 0 || minSize > other.minSize )
+		minSize = other.minSize;
+	if( maxSize < other.maxSize )
+		maxSize = other.maxSize;
+	realSize += other.realSize;
+	sizeOnDisk += other.sizeOnDisk;
+	_sumSquaredSizes += other._sumSquaredSizes;
+	nbSampledFiles += other.nbSampledFiles;
+}
+
+void ItemStat::finalizeSequence( const Sequence& sequence, const std::size_t nbStatFrames )
+{
+	const Time nbFiles = sequence.getNbFiles();
+	if( Time( nbStatFrames ) < nbFiles )
+	{
+		// extrapolate the sizes from the sampled files
+		const double nbSampled = nbSampledFiles;
+		if( nbSampledFiles > 1 )
+		{
+			const double meanSize = size / nbSampled;
+			const double variance = std::max( 0.0, _sumSquaredSizes / nbSampled - meanSize * meanSize ) * nbSampled / ( nbSampled - 1 );
+			// standard deviation of the estimated total size, with the finite population correction
+			const double standardDeviation = nbFiles * std::sqrt( variance / nbSampled * ( nbFiles - nbSampled ) / ( nbFiles - 1 ) );
+			sizeErrorBound = static_cast<long long>( std::ceil( 3 * standardDeviation ) );
+		}
+
+		const double scale = nbFiles / nbSampled;
+		fullNbHardLinks = static_cast<long long>( fullNbHardLinks * scale + 0.5 );
+		size = static_cast<long long>( size * scale + 0.5 );
+		realSize = static_cast<long long>( realSize * scale + 0.5 );
+		sizeOnDisk = static_cast<long long>( sizeOnDisk * scale + 0.5 );
 	}
 
-	nbHardLinks = fullNbHardLinks / (double)(seq.getLastTime() - seq.getFirstTime() + 1);
+	nbHardLinks = fullNbHardLinks / (double)(sequence.getLastTime() - sequence.getFirstTime() + 1);
+}
+
+void ItemStat::statSequence( const Item& item, const bool approximative, const std::size_t nbSamples )
+{
+	const FrameRangesIndex frames( item.getSequence().getFrameRanges() );
+	const std::vector<Time> sampledFrames = sampleFrames( frames, approximative ? nbSamples : 0 );
+	if( sampledFrames.empty() )
+		return; // empty sequence
+
+	// the files are stat relatively to their folder
+	const detail::OpenedDirectory directory( item.getFolderPath() );
+	const Time* framesBegin = &sampledFrames[0];
+	if( statSequenceFrames( item, framesBegin, framesBegin + sampledFrames.size(), true, directory ) )
+		finalizeSequence( item.getSequence(), sampledFrames.size() );
+}
+
+namespace detail {
+
+/**
+ * @brief The stats of a list of items, split in tasks for a thread pool.
+ * Each task stats a chunk of files, folders and links, or a chunk of frames of a sequence.
+ * The partial stats of the sequences are merged when all the tasks are done.
+ */
+class ItemStatBatch : boost::noncopyable
+{
+public:
+	/// Max number of files stat by a task
+	static const std::size_t nbFilesPerTask = 64;
+
+public:
+	ItemStatBatch( const std::vector<Item>& items, const bool approximative, const std::size_t nbSamples )
+		: _items( items )
+		, _approximative( approximative )
+		, _nbSamples( nbSamples )
+		, _results( items.size(), emptyStat() )
+	{}
+
+	/// @return the stats, in the same order as the items
+	std::vector<ItemStat> run( ThreadPool& pool );
+
+private:
+	/// @brief Stats of a sequence, accumulated by chunk of frames.
+	struct SequenceStat
+	{
+		std::size_t itemIndex;
+		std::vector<Time> frames; ///< sampled frames
+		std::vector<ItemStat> chunks; ///< accumulated stats of each chunk of frames
+		bool exists;
+	};
+
+	static ItemStat emptyStat()
+	{
+		return ItemStat( Item( eTypeUndefined, std::string() ) );
+	}
+
+	const OpenedDirectory& getDirectory( const bfs::path& path );
+
+	void statEntries( const std::size_t begin, const std::size_t end );
+	void statSequenceChunk( const std::size_t sequenceIndex, const std::size_t chunkIndex );
+
+private:
+	const std::vector<Item>& _items;
+	const bool _approximative;
+	const std::size_t _nbSamples;
+	std::vector<ItemStat> _results;
+
+	std::map<bfs::path, boost::shared_ptr<OpenedDirectory> > _directories;
+	std::vector<const OpenedDirectory*> _itemDirectories; ///< folder of each item
+	std::vector<std::size_t> _entries; ///< indexes of the files, folders and links
+	std::vector<SequenceStat> _sequences;
+};
+
+const std::size_t ItemStatBatch::nbFilesPerTask;
+
+const OpenedDirectory& ItemStatBatch::getDirectory( const bfs::path& path )
+{
+	boost::shared_ptr<OpenedDirectory>& directory = _directories[path];
+	if( ! directory )
+		directory = boost::make_shared<OpenedDirectory>( path );
+	return *directory;
+}
+
+std::vector<ItemStat> ItemStatBatch::run( ThreadPool& pool )
+{
+	// prepare all the tasks before posting them: the tasks share these structures
+	_itemDirectories.reserve( _items.size() );
+	for( std::size_t i = 0; i < _items.size(); ++i )
+	{
+		const Item& item = _items[i];
+		_itemDirectories.push_back( &getDirectory( item.getFolderPath() ) );
+		switch( item.getType() )
+		{
+			case eTypeFolder:
+			case eTypeFile:
+			case eTypeLink:
+			{
+				_entries.push_back( i );
+				break;
+			}
+			case eTypeSequence:
+			{
+				const FrameRangesIndex frames( item.getSequence().getFrameRanges() );
+				SequenceStat sequenceStat;
+				sequenceStat.itemIndex = i;
+				sequenceStat.frames = sampleFrames( frames, _approximative ? _nbSamples : 0 );
+				sequenceStat.exists = false;
+				if( sequenceStat.frames.empty() )
+					break; // empty sequence
+				const std::size_t nbChunks = ( sequenceStat.frames.size() + nbFilesPerTask - 1 ) / nbFilesPerTask;
+				sequenceStat.chunks.resize( nbChunks, emptyStat() );
+				_sequences.push_back( sequenceStat );
+				break;
+			}
+			default:
+				break;
+		}
+	}
+
+	for( std::size_t begin = 0; begin < _entries.size(); begin += nbFilesPerTask )
+	{
+		pool.post( boost::bind( &ItemStatBatch::statEntries, this, begin, std::min( begin + nbFilesPerTask, _entries.size() ) ) );
+	}
+	for( std::size_t i = 0; i < _sequences.size(); ++i )
+	{
+		for( std::size_t chunk = 0; chunk < _sequences[i].chunks.size(); ++chunk )
+			pool.post( boost::bind( &ItemStatBatch::statSequenceChunk, this, i, chunk ) );
+	}
+	pool.wait();
+
+	BOOST_FOREACH( const SequenceStat& sequenceStat, _sequences )
+	{
+		if( ! sequenceStat.exists )
+			continue;
+		ItemStat& result = _results[sequenceStat.itemIndex];
+		result = sequenceStat.chunks.front();
+		for( std::size_t chunk = 1; chunk < sequenceStat.chunks.size(); ++chunk )
+			result.mergeSequenceFrames( sequenceStat.chunks[chunk] );
+		result.finalizeSequence( _items[sequenceStat.itemIndex].getSequence(), sequenceStat.frames.size() );
+	}
+	return _results;
+}
+
+void ItemStatBatch::statEntries( const std::size_t begin, const std::size_t end )
+{
+	for( std::size_t i = begin; i < end; ++i )
+	{
+		const std::size_t itemIndex = _entries[i];
+#ifdef __UNIX__
+		_results[itemIndex].statEntry( *_itemDirectories[itemIndex], _items[itemIndex].getFilename() );
+#else
+		_results[itemIndex] = ItemStat( _items[itemIndex] );
+#endif
+	}
+}
+
+void ItemStatBatch::statSequenceChunk( const std::size_t sequenceIndex, const std::size_t chunkIndex )
+{
+	SequenceStat& sequenceStat = _sequences[sequenceIndex];
+	const std::size_t begin = chunkIndex * nbFilesPerTask;
+	const std::size_t end = std::min( begin + nbFilesPerTask, sequenceStat.frames.size() );
+	const Time* frames = &sequenceStat.frames[0];
+	const std::size_t itemIndex = sequenceStat.itemIndex;
+	const bool exists = sequenceStat.chunks[chunkIndex].statSequenceFrames( _items[itemIndex], frames + begin, frames + end, chunkIndex == 0, *_itemDirectories[itemIndex] );
+	if( chunkIndex == 0 )
+		sequenceStat.exists = exists;
+}
+
+}
+
+std::vector<ItemStat> statItems( const std::vector<Item>& items, const bool approximative, const std::size_t nbSamples, const std::size_t nbThreads, PerformanceReport* outReport )
+{
+	detail::OperationProfiler profiler( "statItems", std::string(), outReport );
+	detail::PhaseTimer timer( profiler.getReport(), &PerformanceReport::statTime );
+	if( profiler.getReport() )
+		profiler.getReport()->nbItems = items.size();
+	detail::ItemStatBatch batch( items, approximative, nbSamples );
+	detail::ThreadPool pool( nbThreads );
+	return batch.run( pool );
 }
 
 }
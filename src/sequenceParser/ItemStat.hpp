@@ -3,26 +3,65 @@
 
 #include "common.hpp"
 #include "Item.hpp"
+#include "PerformanceReport.hpp"
 #include "system.hpp"
 
+#include <vector>
+
 #ifdef __UNIX__
     #include <sys/types.h>
+    #include <sys/stat.h>
 #endif
 
 
 namespace sequenceParser {
 
+namespace detail {
+class OpenedDirectory;
+class ItemStatBatch;
+}
+
 class ItemStat
 {
 public:
-	ItemStat( const Item& item, const bool approximative=true );
+	/**
+	 * @param[in] item: the item to stat
+	 * @param[in] approximative: for sequences, stat only a subset of the files and extrapolate the sizes
+	 * @param[in] nbSamples: for approximative sequences, number of files to stat
+	 *            (the first one, the last one and random ones in between)
+	 * @param[out] outReport: if not NULL, filled with the time and the calls to the filesystem of the stat
+	 * @see nbSampledFiles
+	 * @see sizeErrorBound
+	 */
+	ItemStat( const Item& item, const bool approximative=true, const std::size_t nbSamples=32, PerformanceReport* outReport=NULL );
 
 private:
+#ifndef SWIG
+	friend class detail::ItemStatBatch;
+#endif
+
 	void statFolder( const boost::filesystem::path& path );
 	void statFile( const boost::filesystem::path& path );
-	void statSequence( const Item& item, const bool approximative );
+	void statSequence( const Item& item, const bool approximative, const std::size_t nbSamples );
 	void statLink( const boost::filesystem::path& path );
+	/**
+	 * @brief Stat some frames of a sequence, and accumulate their stats.
+	 * @param[in] isSequenceBegin: the ids, the names and the access time come from the first frame,
+	 *            if it doesn't exist the sequence is considered as missing.
+	 * @return false if the sequence doesn't exist
+	 */
+	bool statSequenceFrames( const Item& item, const Time* framesBegin, const Time* framesEnd, const bool isSequenceBegin, const detail::OpenedDirectory& directory );
+	/// @brief Add the accumulated stats of other frames of the same sequence.
+	void mergeSequenceFrames( const ItemStat& other );
+	/// @brief Extrapolate the accumulated stats of the sampled frames to the whole sequence.
+	void finalizeSequence( const Sequence& sequence, const std::size_t nbStatFrames );
 #ifdef __UNIX__
+	/// @brief Stat a file, a folder or a link with a single lstat.
+	void statPath( const boost::filesystem::path& path );
+	/// @brief Stat an entry of an opened directory with a single lstat.
+	void statEntry( const detail::OpenedDirectory& directory, const std::string& filename );
+	/// @brief Fill the stats from the result of a lstat.
+	void fillFromStat( const struct stat& statInfos, const bool withNames );
 	void setPermissions( const mode_t& protection );
 	void setUserName();
 	void setGroupName();
@@ -51,6 +90,19 @@ public:
 	long long realSize; /// size (takes hardlinks into account)
 	long long sizeOnDisk; /// size on hard-drive (takes hardlinks into account)
 
+	/**
+	 * @brief Number of files used to compute the stats of a sequence (otherwise 1)
+	 * @note If it's less than the number of files in the sequence, the sizes and the number of hard links
+	 * are extrapolated, and minSize, maxSize, modificationTime and lastChangeTime are computed only on these files.
+	 */
+	long long nbSampledFiles;
+	/**
+	 * @brief Estimated error on the extrapolated size of a sampled sequence (otherwise 0)
+	 * @note It's 3 standard deviations of the estimation: the real size is in [size - sizeErrorBound, size + sizeErrorBound]
+	 * with a probability of 99.7%, if the sizes of the files are not too far from a normal distribution.
+	 */
+	long long sizeErrorBound;
+
 	long long accessTime; /// time of last access
 	long long modificationTime; /// time of last modification
 	/**
@@ -70,8 +122,48 @@ public:
 	bool otherCanRead;
 	bool otherCanWrite;
 	bool otherCanExecute;
+
+private:
+	double _sumSquaredSizes; ///< sum of the square of the sizes of the sampled files of a sequence
 };
 
+/**
+ * @brief Stat a list of items in parallel.
+ * The stats of the files of big sequences are also split between the threads.
+ * The entries of a folder are stat relatively to this folder, opened only once.
+ * @param[in] items: the items to stat
+ * @param[in] approximative, nbSamples: the options of the stat of the sequences, see ItemStat
+ * @param[in] nbThreads: number of threads, if 0 use the number of hardware threads
+ * @param[out] outReport: if not NULL, filled with the time and the calls to the filesystem of the stats
+ * @return the stats, in the same order as the items
+ * @note With the python binding, the GIL is released during the stats.
+ */
+std::vector<ItemStat> statItems( const std::vector<Item>& items, const bool approximative=true, const std::size_t nbSamples=32, const std::size_t nbThreads=0, PerformanceReport* outReport=NULL );
+
+/**
+ * @brief Set the options of the cache of user and group names, shared by all the ItemStat of the process.
+ * The cache is cleared.
+ * @param[in] maxSize: max number of user names (and of group names) in the cache, 0 to disable the cache
+ * @param[in] timeToLive: number of seconds before resolving a name again, 0 to disable the cache
+ * @note By default, 1024 names during 300 seconds.
+ */
+void setNameCacheOptions( const std::size_t maxSize, const std::size_t timeToLive );
+
+/**
+ * @brief Remove all the user and group names from the cache (for example, after a change of the users database).
+ */
+void clearNameCache();
+
+/**
+ * @brief Choose if ItemStat resolves the user and group names.
+ * If not, userName and groupName contain the numeric ids, and no request is done to the users database
+ * (which can be slow with network accounts).
+ * @note Names are resolved by default.
+ */
+void setResolveNames( const bool resolve );
+
+bool getResolveNames();
+
 }
 
 #endif
@@ -4,6 +4,16 @@
 #include "sequenceParser/ItemStat.hpp"
 %}
 
+namespace std {
+// Allow vector of object with no default constructor
+%ignore vector< sequenceParser::ItemStat >::vector(size_type);
+%ignore vector< sequenceParser::ItemStat >::resize;
+}
+
+%template(ItemStatVector) ::std::vector<sequenceParser::ItemStat>;
+
+SEQUENCEPARSER_RELEASE_GIL(sequenceParser::statItems)
+
 %include "ItemStat.hpp"
 
 //%extend sequenceParser::ItemStat
@@ -0,0 +1,38 @@
+#include "ItemStream.hpp"
+
+#include "utils.hpp"
+
+#include "detail/analyze.hpp"
+#include "detail/DirectoryBrowser.hpp"
+#include "detail/FilenameFilters.hpp"
+
+
+namespace sequenceParser {
+
+namespace bfs = boost::filesystem;
+
+ItemStream::~ItemStream()
+{
+	delete _browser;
+}
+
+void ItemStream::init( const bfs::path& directory, const EDetection detectOptions, const std::vector<std::string>& filters )
+{
+	std::string tmpDir( directory.string() );
+	std::vector<std::string> tmpFilters( filters );
+	std::string filename;
+
+	if( ! detectDirectoryInResearch( tmpDir, tmpFilters, filename ) )
+		return;
+
+	_browser = new detail::DirectoryBrowser( bfs::path( tmpDir ), detail::getFilenameFilters( tmpFilters, detectOptions ), filename, detectOptions );
+}
+
+bool ItemStream::next( Item& outItem )
+{
+	if( ! _browser )
+		return false;
+	return _browser->next( outItem );
+}
+
+}
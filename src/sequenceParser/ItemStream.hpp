@@ -0,0 +1,90 @@
+#ifndef _SEQUENCE_PARSER_ITEM_STREAM_HPP_
+#define _SEQUENCE_PARSER_ITEM_STREAM_HPP_
+
+#include "common.hpp"
+#include "Item.hpp"
+
+#include <boost/filesystem/path.hpp>
+
+#include <vector>
+#include <string>
+
+
+namespace sequenceParser {
+
+#ifndef SWIG
+namespace detail {
+class DirectoryBrowser;
+}
+#endif
+
+/**
+ * @brief Browse the content of a directory, one item at a time.
+ * It gives the same items as browse, without waiting the end of the directory read:
+ * files and folders are given as soon as they are read,
+ * and sequences once all the files of the directory are read.
+ * Only the numbered filenames are kept in memory until the end of the read.
+ *
+ * In python, it's a generator:
+ * for item in ItemStream("/path/to/browse"):
+ *     print(item)
+ *
+ * @see browse
+ */
+class ItemStream
+{
+public:
+	/**
+	 * @param[in] directory: the input directory in which it will search.
+	 * @param[in] detectOptions: some options to choose how to consider sequences.
+	 * @param[in] filters: set filters to limit the search.
+	 * @throw boost::filesystem::filesystem_error if the directory can't be opened
+	 */
+	ItemStream(
+		const std::string& directory,
+		const EDetection detectOptions = eDetectionDefault,
+		const std::vector<std::string>& filters = std::vector<std::string>() )
+	: _browser( NULL )
+	{
+#ifdef SWIGJAVA
+		init( boost::filesystem::path(utf8_to_latin1(directory)), detectOptions, filters );
+#else
+		init( boost::filesystem::path(directory), detectOptions, filters );
+#endif
+	}
+
+#ifndef SWIG
+	ItemStream(
+		const boost::filesystem::path& directory,
+		const EDetection detectOptions = eDetectionDefault,
+		const std::vector<std::string>& filters = std::vector<std::string>() )
+	: _browser( NULL )
+	{
+		init( directory, detectOptions, filters );
+	}
+#endif
+
+	~ItemStream();
+
+	/**
+	 * @brief Get the next item of the directory.
+	 * @param[out] outItem: the next item
+	 * @return false if all the items have been given
+	 */
+	bool next( Item& outItem );
+
+private:
+	ItemStream( const ItemStream& );
+	ItemStream& operator=( const ItemStream& );
+
+	void init( const boost::filesystem::path& directory, const EDetection detectOptions, const std::vector<std::string>& filters );
+
+private:
+#ifndef SWIG
+	detail::DirectoryBrowser* _browser; ///< NULL if there is nothing to browse
+#endif
+};
+
+}
+
+#endif
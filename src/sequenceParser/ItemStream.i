@@ -0,0 +1,31 @@
+%include "common.i"
+
+%{
+#include "sequenceParser/ItemStream.hpp"
+%}
+
+#ifdef SWIGPYTHON
+
+// python iterator protocol: next is used by python 2
+%rename(nextItem) sequenceParser::ItemStream::next;
+
+%extend sequenceParser::ItemStream
+{
+	%pythoncode
+	{
+		def __iter__(self):
+			return self
+
+		def __next__(self):
+			item = Item()
+			if not self.nextItem(item):
+				raise StopIteration
+			return item
+
+		next = __next__
+	}
+}
+
+#endif
+
+%include "ItemStream.hpp"
@@ -0,0 +1,86 @@
+#ifndef _SEQUENCE_PARSER_PERFORMANCE_REPORT_HPP_
+#define _SEQUENCE_PARSER_PERFORMANCE_REPORT_HPP_
+
+#include "common.hpp"
+
+#include <string>
+
+
+namespace sequenceParser {
+
+/**
+ * @brief Where the time of an operation (browse, browseRecursive, browseSequence, ItemStat, statItems) went.
+ * Give a report to an operation to fill it, or register a callback to receive the reports of all the operations.
+ * The times are in seconds. With browseRecursive, the times of the phases
+ * are the sums of the times of the threads, so they can be more than the total time.
+ * @note Measuring the phases adds a small cost, only paid when a report is asked.
+ * @see setPerformanceReportCallback
+ */
+struct PerformanceReport
+{
+	PerformanceReport()
+		: totalTime( 0 )
+		, readDirectoryTime( 0 )
+		, filterTime( 0 )
+		, decomposeTime( 0 )
+		, buildSequencesTime( 0 )
+		, splitSequencesTime( 0 )
+		, statTime( 0 )
+		, nbDirectories( 0 )
+		, nbEntries( 0 )
+		, nbFilteredEntries( 0 )
+		, nbSequenceGroups( 0 )
+		, nbSequences( 0 )
+		, nbItems( 0 )
+		, groupedNumbersBytes( 0 )
+		, nbStat( 0 )
+		, nbOpenDirectory( 0 )
+		, nbReadDirectory( 0 )
+	{}
+
+	std::string operation; ///< name of the function, like "browse"
+	std::string path; ///< the browsed directory, the pattern of the sequence or the stat item
+
+	double totalTime; ///< time of the whole operation, in the calling thread
+	double readDirectoryTime; ///< read of the entries of the directories (with a stat for the type, if the filesystem doesn't give it)
+	double filterTime; ///< check of the filters on the entries
+	double decomposeTime; ///< decomposition of the filenames in strings and numbers, and grouping of the filenames with the same strings
+	double buildSequencesTime; ///< detection of the sequences in the groups of filenames, extraction of the frame ranges
+	double splitSequencesTime; ///< detection options applied on the sequences (single files, holes)
+	double statTime; ///< stat of the files (ItemStat, browseSequence with expected frames)
+
+	std::size_t nbDirectories; ///< directories read
+	std::size_t nbEntries; ///< entries read in the directories, or files checked
+	std::size_t nbFilteredEntries; ///< entries which don't respect the filters
+	std::size_t nbSequenceGroups; ///< groups of filenames with the same strings
+	std::size_t nbSequences; ///< sequences found
+	std::size_t nbItems; ///< items given to the caller
+	std::size_t groupedNumbersBytes; ///< memory allocated for the numbers of the grouped filenames (the main allocation of a detection)
+
+	/// @brief Calls to the filesystem during the operation (by all the threads of the process).
+	/// @see FilesystemCounters
+	std::size_t nbStat;
+	std::size_t nbOpenDirectory;
+	std::size_t nbReadDirectory;
+};
+
+#ifndef SWIG
+/**
+ * @brief Function called at the end of each operation.
+ * @param[in] report: the report of the operation
+ * @param[in] userData: the pointer given to setPerformanceReportCallback
+ * @note It can be called from several threads at the same time.
+ */
+typedef void (*PerformanceReportCallback)( const PerformanceReport& report, void* userData );
+
+/**
+ * @brief Register a function which receives the reports of all the operations.
+ * @param[in] callback: NULL to unregister the previous one
+ * @note With the python binding, use setPerformanceReportCallback(callable) (None to unregister).
+ */
+void setPerformanceReportCallback( PerformanceReportCallback callback, void* userData = NULL );
+#endif
+
+}
+
+#endif
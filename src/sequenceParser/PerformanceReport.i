@@ -0,0 +1,58 @@
+%include "common.i"
+
+%{
+#include "sequenceParser/PerformanceReport.hpp"
+%}
+
+%include "PerformanceReport.hpp"
+
+#ifdef SWIGPYTHON
+
+%{
+/// python callable which receives the reports, NULL if none (only used with the GIL)
+PyObject* sequenceParser_pythonReportCallback = NULL;
+
+/// @brief Give a report to the python callable, from any thread.
+void sequenceParser_callPythonReportCallback( const sequenceParser::PerformanceReport& report, void* )
+{
+	const PyGILState_STATE gilState = PyGILState_Ensure();
+	PyObject* callback = sequenceParser_pythonReportCallback;
+	if( callback )
+	{
+		// the callable can be replaced during the call
+		Py_INCREF( callback );
+		PyObject* pyReport = SWIG_NewPointerObj( new sequenceParser::PerformanceReport( report ), SWIGTYPE_p_sequenceParser__PerformanceReport, SWIG_POINTER_OWN );
+		PyObject* result = PyObject_CallFunctionObjArgs( callback, pyReport, NULL );
+		if( result )
+			Py_DECREF( result );
+		else
+			PyErr_WriteUnraisable( callback ); // the operation is not interrupted
+		Py_DECREF( pyReport );
+		Py_DECREF( callback );
+	}
+	PyGILState_Release( gilState );
+}
+%}
+
+%inline %{
+/**
+ * @brief Register a python callable which receives the PerformanceReport of all the operations.
+ * It can be called from any thread. Its exceptions are printed, and don't interrupt the operations.
+ * @param[in] callback: None to unregister the previous one
+ */
+void setPerformanceReportCallback( PyObject* callback )
+{
+	if( callback == Py_None )
+		callback = NULL;
+	else if( ! PyCallable_Check( callback ) )
+		throw std::invalid_argument( "the performance report callback is not callable" );
+
+	Py_XINCREF( callback );
+	PyObject* previous = sequenceParser_pythonReportCallback;
+	sequenceParser_pythonReportCallback = callback;
+	sequenceParser::setPerformanceReportCallback( callback ? &sequenceParser_callPythonReportCallback : NULL );
+	Py_XDECREF( previous );
+}
+%}
+
+#endif
@@ -1,4 +1,5 @@
 #include "Sequence.hpp"
+#include "FilenameFormatter.hpp"
 
 #include "detail/FileNumbers.hpp"
 
@@ -10,6 +11,7 @@
 #include <set>
 
 #include <ostream>
+#include <stdexcept>
 
 
 namespace sequenceParser {
@@ -57,33 +59,14 @@ static const boost::regex regexPatternFrameNeg( "(.*?" // anything but without p
 template<typename T>
 inline T greatestCommonDivisor( T a, T b )
 {
-	T r;
-	if( b == 0 )
-		return 0;
-	while( ( r = a % b ) != 0 )
+	// gcd(a, 0) == a: the first difference is the initial step
+	while( b != 0 )
 	{
+		const T r = a % b;
 		a = b;
 		b = r;
 	}
-	return b;
-}
-
-
-/**
- * @brief Find the biggest common step from a set of all steps.
- */
-std::size_t greatestCommonDivisor( const std::set<std::size_t>& steps )
-{
-	if( steps.size() == 1 )
-	{
-		return *steps.begin();
-	}
-	std::set<std::size_t> allSteps;
-	for( std::set<std::size_t>::const_iterator itA = steps.begin(), itB = ++steps.begin(), itEnd = steps.end(); itB != itEnd; ++itA, ++itB )
-	{
-		allSteps.insert( greatestCommonDivisor( *itB, *itA ) );
-	}
-	return greatestCommonDivisor( allSteps );
+	return a;
 }
 
 
@@ -92,16 +75,13 @@ std::size_t greatestCommonDivisor( const std::set<std::size_t>& steps )
  */
 std::size_t extractStep( const std::vector<Time>& times )
 {
-	if( times.size() <= 1 )
-	{
-		return 1;
-	}
-	std::set<std::size_t> allSteps;
-	for( std::vector<Time>::const_iterator itA = times.begin(), itB = ++times.begin(), itEnd = times.end(); itB != itEnd; ++itA, ++itB )
+	// greatest common divisor of all the differences, in a single pass
+	std::size_t step = 0;
+	for( std::size_t i = 1; i < times.size() && step != 1; ++i )
 	{
-		allSteps.insert( *itB - *itA );
+		step = greatestCommonDivisor( std::size_t( times[i] - times[i-1] ), step );
 	}
-	return greatestCommonDivisor( allSteps );
+	return step == 0 ? 1 : step;
 }
 
 
@@ -110,16 +90,14 @@ std::size_t extractStep( const std::vector<Time>& times )
  */
 std::size_t extractStep( const std::vector<detail::FileNumbers>::const_iterator& timesBegin, const std::vector<detail::FileNumbers>::const_iterator& timesEnd, const std::size_t i )
 {
-	if( std::distance( timesBegin, timesEnd ) <= 1 )
-	{
+	std::size_t step = 0;
+	if( timesBegin == timesEnd )
 		return 1;
-	}
-	std::set<std::size_t> allSteps;
-	for( std::vector<detail::FileNumbers>::const_iterator itA = timesBegin, itB = boost::next(timesBegin), itEnd = timesEnd; itB != itEnd; ++itA, ++itB )
+	for( std::vector<detail::FileNumbers>::const_iterator itA = timesBegin, itB = boost::next(timesBegin); itB != timesEnd && step != 1; ++itA, ++itB )
 	{
-		allSteps.insert( itB->getTime( i ) - itA->getTime( i ) );
+		step = greatestCommonDivisor( std::size_t( itB->getTime( i ) - itA->getTime( i ) ), step );
 	}
-	return greatestCommonDivisor( allSteps );
+	return step == 0 ? 1 : step;
 }
 
 
@@ -191,18 +169,15 @@ std::size_t extractPadding( const std::vector<detail::FileNumbers>::const_iterat
 
 std::string Sequence::getFilenameAt( const Time time ) const
 {
-	std::ostringstream o;
-	if( time >= 0 )
-	{
-		// "prefix.0001.jpg"
-		o << _prefix << std::setw( _fixedPadding ) << std::setfill( _fillCar ) << time << _suffix;
-	}
-	else
-	{
-		// "prefix.-0001.jpg" (and not "prefix.000-1.jpg")
-		o << _prefix << "-" << std::setw( _fixedPadding ) << std::setfill( _fillCar ) << std::abs( (int) time ) << _suffix;
-	}
-	return o.str();
+	// a single allocation: the number is written directly in the name
+	std::string name;
+	name.reserve( _prefix.size() + FilenameFormatter::getMaxNumberLength( _fixedPadding ) + _suffix.size() );
+	name.assign( _prefix );
+	const std::size_t length = name.size();
+	name.resize( length + FilenameFormatter::getMaxNumberLength( _fixedPadding ) );
+	name.resize( length + FilenameFormatter::formatNumber( time, _fixedPadding, &name[length] ) );
+	name.append( _suffix );
+	return name;
 }
 
 
@@ -226,7 +201,19 @@ Time Sequence::getNbFiles() const
 }
 
 
-bool Sequence::isIn( const std::string& filename, Time& time, std::string& timeStr )
+bool Sequence::isIn( const std::string& filename, Time& time, std::string& timeStr ) const
+{
+	if( matchFilename( filename, time, timeStr ) && contains( time ) )
+		return true;
+
+	// initialize the output arguments
+	time = 0;
+	timeStr = "";
+	return false;
+}
+
+
+bool Sequence::matchFilename( const std::string& filename, Time& time, std::string& timeStr ) const
 {
 	// initialize the output arguments
 	time = 0;
@@ -239,38 +226,65 @@ bool Sequence::isIn( const std::string& filename, Time& time, std::string& timeS
 		return false;
 
 	// different prefix or suffix
-	if( filename.substr( 0, _prefix.size() ) != _prefix || filename.substr( filename.size() - _suffix.size(), _suffix.size() ) != _suffix )
-		return false;
-
-	// not an existing time
-	std::istringstream iss( filename.substr( _prefix.size(), filename.size() - _prefix.size() - _suffix.size() ) );
-	size_t expectedTime;
-	iss >> expectedTime;
-	bool timeIsIn = false;
-	BOOST_FOREACH( Time t, getFramesIterable() )
-	{
-		if(expectedTime == t)
-		{
-			timeIsIn = true;
-			break;
-		}
-	}
-	if( ! timeIsIn )
+	if( filename.compare( 0, _prefix.size(), _prefix ) != 0 || filename.compare( filename.size() - _suffix.size(), _suffix.size(), _suffix ) != 0 )
 		return false;
 
+	const std::string number = filename.substr( _prefix.size(), filename.size() - min );
 	try
 	{
-		timeStr = filename.substr( _prefix.size(), filename.size() - _suffix.size() - _prefix.size() );
-		time = boost::lexical_cast<Time > ( timeStr );
+		time = boost::lexical_cast<Time>( number );
 	}
 	catch( ... )
 	{
+		time = 0;
 		return false;
 	}
+	timeStr = number;
 	return true;
 }
 
 
+bool Sequence::contains( const Time time ) const
+{
+	const std::vector<FrameRange>::const_iterator it = findFrameRange( _ranges, time );
+	return it != _ranges.end() && it->contains( time );
+}
+
+
+Time Sequence::indexOf( const Time time ) const
+{
+	Time index = 0;
+	BOOST_FOREACH( const FrameRange& frameRange, _ranges )
+	{
+		if( time <= frameRange.last )
+		{
+			if( ! frameRange.contains( time ) )
+				return -1;
+			return index + ( time - frameRange.first ) / frameRange.step;
+		}
+		index += frameRange.getNbFrames();
+	}
+	return -1;
+}
+
+
+Time Sequence::frameAt( const Time index ) const
+{
+	if( index >= 0 )
+	{
+		Time rangeIndex = index;
+		BOOST_FOREACH( const FrameRange& frameRange, _ranges )
+		{
+			const Time nbFrames = frameRange.getNbFrames();
+			if( rangeIndex < nbFrames )
+				return frameRange.atIndex( rangeIndex );
+			rangeIndex -= nbFrames;
+		}
+	}
+	throw std::out_of_range( "Sequence::frameAt: index out of range" );
+}
+
+
 EPattern Sequence::checkPattern( const std::string& pattern, const EDetection detectionOptions )
 {
 	if( regex_match( pattern.c_str(), regexPatternStandard ) )
@@ -352,22 +366,26 @@ void Sequence::init( const std::string& prefix, const std::size_t padding, const
 
 std::vector<std::string> Sequence::getFiles() const
 {
+	const FilenameFormatter formatter( *this );
 	std::vector<std::string> allPaths;
+	allPaths.reserve( getNbFiles() );
 	BOOST_FOREACH(const FrameRange& range, _ranges)
 	{
 		for( Time t = range.first; t <= range.last; t += range.step )
-			allPaths.push_back(getFilenameAt(t));
+			allPaths.push_back(formatter.getNameAt(t));
 	}
 
 	return allPaths;
 }
 
 std::vector<boost::filesystem::path> Sequence::getAbsoluteFilesPath(boost::filesystem::path const& parentPath) const{
+	const FilenameFormatter formatter( *this, parentPath );
 	std::vector<boost::filesystem::path> allPaths;
+	allPaths.reserve( getNbFiles() );
 	BOOST_FOREACH(const FrameRange& range, _ranges)
 	{
 		for( Time t = range.first; t <= range.last; t += range.step )
-			allPaths.push_back(parentPath / getFilenameAt(t));
+			allPaths.push_back(formatter.getNameAt(t));
 	}
 
 	return allPaths;
@@ -88,7 +88,10 @@ private:
 	void init( const std::string& prefix, const std::size_t padding, const size_t maxPadding, const std::string& suffix, const Time firstTime, const Time lastTime, const Time step = 1 );
 
 public:
-	/// @return A list of filenames contained in the sequence.
+	/**
+	 * @return A list of filenames contained in the sequence.
+	 * @see SequenceFiles to iterate over the filenames without building the list.
+	 */
 	std::vector<std::string> getFiles() const;
 
 	/**
@@ -174,8 +177,38 @@ public:
 	 * @param[out] time: the time extracted from the filename (only if contained in the sequence)
 	 * @param[out] timeStr: the time in string extracted from the filename (only if contained in the sequence)
 	 * @return if the filename is contained inside the sequence
+	 * @see matchFilename
+	 */
+	bool isIn( const std::string& filename, Time& timeOut, std::string& timeStrOut ) const;
+
+	/**
+	 * @brief Check if the filename corresponds to the sequence pattern (prefix, number and suffix),
+	 * without checking the frame ranges.
+	 * @param[in] filename: filename to check
+	 * @param[out] time: the time extracted from the filename (only if it corresponds to the pattern)
+	 * @param[out] timeStr: the time in string extracted from the filename (only if it corresponds to the pattern)
+	 * @return if the filename corresponds to the pattern
+	 */
+	bool matchFilename( const std::string& filename, Time& timeOut, std::string& timeStrOut ) const;
+
+	/**
+	 * @return If the time is one of the frames of the sequence.
+	 * @note Binary search on the frame ranges.
+	 */
+	bool contains( const Time time ) const;
+
+	/**
+	 * @return The position of the time in the frames of the sequence, or -1 if the time is not in the sequence.
+	 * @see FrameRangesIndex to do a lot of lookups
+	 */
+	Time indexOf( const Time time ) const;
+
+	/**
+	 * @return The frame at the given position in the frames of the sequence.
+	 * @throw std::out_of_range if the index is not in [0, getNbFiles()[
+	 * @see FrameRangesIndex to do a lot of lookups
 	 */
-	bool isIn( const std::string& filename, Time& timeOut, std::string& timeStrOut );
+	Time frameAt( const Time index ) const;
 
 	EPattern checkPattern( const std::string& pattern, const EDetection detectionOptions );
 
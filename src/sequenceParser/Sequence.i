@@ -40,6 +40,65 @@ namespace std {
 
 %include "Sequence.hpp"
 
+#ifdef SWIGPYTHON
+
+%extend std::vector< sequenceParser::FrameRange >
+{
+	/**
+	 * @brief All the frames of the ranges, in a contiguous int64 buffer.
+	 */
+	PyObject* getFramesBuffer() const
+	{
+		return sequenceParser_getFramesBuffer( *$self );
+	}
+
+	/**
+	 * @brief The ranges in a contiguous int64 buffer, with 3 columns: first, last, step.
+	 */
+	PyObject* getRangesBuffer() const
+	{
+		return sequenceParser_getRangesBuffer( *$self );
+	}
+}
+
+%extend sequenceParser::Sequence
+{
+	/**
+	 * @brief All the frames, in a contiguous int64 buffer.
+	 * numpy.asarray gives an array without any copy, instead of iterating on the frames.
+	 */
+	PyObject* getFramesBuffer() const
+	{
+		return sequenceParser_getFramesBuffer( $self->getFrameRanges() );
+	}
+
+	/**
+	 * @brief The frame ranges in a contiguous int64 buffer, with 3 columns: first, last, step.
+	 */
+	PyObject* getRangesBuffer() const
+	{
+		return sequenceParser_getRangesBuffer( $self->getFrameRanges() );
+	}
+
+	/**
+	 * @brief Create a sequence from a pattern and its frames.
+	 * @param[in] frames: a buffer of integers (like a numpy array) or a sequence of integers, in any order
+	 * @throw std::invalid_argument if the pattern is not recognized, or if the frames are not integers
+	 */
+	static sequenceParser::Sequence fromFrames( const std::string& pattern, PyObject* frames, const sequenceParser::EPattern accept = sequenceParser::ePatternDefault )
+	{
+		std::vector<sequenceParser::Time> times;
+		sequenceParser_getFramesFromPython( frames, times );
+		sequenceParser::Sequence sequence;
+		if( ! sequence.initFromPattern( pattern, accept ) )
+			throw std::invalid_argument( "not a sequence pattern: " + pattern );
+		sequence.getFrameRanges() = sequenceParser::extractFrameRangesFromUnsorted( times );
+		return sequence;
+	}
+}
+
+#endif
+
 // Remove all typemaps
 %clear sequenceParser::Time & timeOut;
 %clear std::string & timeStrOut;
@@ -0,0 +1,133 @@
+#include "SequenceFiles.hpp"
+
+
+namespace sequenceParser {
+
+SequenceFiles::const_iterator::const_iterator( const SequenceFiles& files, const std::size_t rangeIndex )
+	: _files( &files )
+	, _rangeIndex( rangeIndex )
+	, _frame( rangeIndex < files._ranges.size() ? files._ranges[rangeIndex].first : 0 )
+{
+}
+
+void SequenceFiles::const_iterator::increment()
+{
+	const FrameRange& range = _files->_ranges[_rangeIndex];
+	if( _frame + range.step <= range.last )
+	{
+		_frame += range.step;
+		return;
+	}
+	++_rangeIndex;
+	_frame = _rangeIndex < _files->_ranges.size() ? _files->_ranges[_rangeIndex].first : 0;
+}
+
+Time SequenceFiles::size() const
+{
+	Time nbFiles = 0;
+	BOOST_FOREACH( const FrameRange& range, _ranges )
+	{
+		nbFiles += range.getNbFrames();
+	}
+	return nbFiles;
+}
+
+std::string SequenceFiles::getPath( const Time frame ) const
+{
+	return _formatter.getNameAt( frame );
+}
+
+bool SequenceFiles::next( std::string& outPath )
+{
+	const_iterator cursor( *this, _nextRangeIndex, _nextFrame );
+	if( cursor == end() )
+		return false;
+	outPath = *cursor;
+	++cursor;
+	_nextRangeIndex = cursor.getRangeIndex();
+	_nextFrame = cursor.getFrame();
+	return true;
+}
+
+void SequenceFiles::rewind()
+{
+	const const_iterator cursor = begin();
+	_nextRangeIndex = cursor.getRangeIndex();
+	_nextFrame = cursor.getFrame();
+}
+
+
+ExplodedItems::ExplodedItems( const Item& item, const bool checkType )
+	: _item( item )
+	, _files( item.getType() == eTypeSequence ? item.getSequence() : Sequence(), item.getPath().parent_path() )
+	, _checkType( checkType )
+{
+	rewind();
+}
+
+ExplodedItems::const_iterator::const_iterator( const ExplodedItems& items, const bool isEnd )
+	: _items( &items )
+	, _isEnd( isEnd )
+{
+	if( items._item.getType() == eTypeSequence )
+	{
+		_file = isEnd ? items._files.end() : items._files.begin();
+		_isEnd = ( _file == items._files.end() );
+	}
+}
+
+Item ExplodedItems::const_iterator::dereference() const
+{
+	if( _items->_item.getType() != eTypeSequence )
+		return _items->_item;
+	return _items->getFileItem( *_file );
+}
+
+void ExplodedItems::const_iterator::increment()
+{
+	if( _items->_item.getType() != eTypeSequence )
+	{
+		_isEnd = true;
+		return;
+	}
+	++_file;
+	_isEnd = ( _file == _items->_files.end() );
+}
+
+Item ExplodedItems::getFileItem( const std::string& path ) const
+{
+	const boost::filesystem::path filePath( path );
+	return Item( _checkType ? getTypeFromPath( filePath ) : eTypeFile, filePath );
+}
+
+Time ExplodedItems::size() const
+{
+	if( _item.getType() != eTypeSequence )
+		return 1;
+	return _files.size();
+}
+
+bool ExplodedItems::next( Item& outItem )
+{
+	if( _item.getType() != eTypeSequence )
+	{
+		if( _itemGiven )
+			return false;
+		outItem = _item;
+		_itemGiven = true;
+		return true;
+	}
+	std::string path;
+	if( ! _files.next( path ) )
+		return false;
+	outItem = getFileItem( path );
+	return true;
+}
+
+void ExplodedItems::rewind()
+{
+	_files.rewind();
+	_itemGiven = false;
+}
+
+}
@@ -0,0 +1,201 @@
+#ifndef _SEQUENCE_PARSER_SEQUENCE_FILES_HPP_
+#define _SEQUENCE_PARSER_SEQUENCE_FILES_HPP_
+
+#include "common.hpp"
+#include "Item.hpp"
+#include "Sequence.hpp"
+#include "FilenameFormatter.hpp"
+
+#include <boost/filesystem/path.hpp>
+#ifndef SWIG
+#include <boost/iterator/iterator_facade.hpp>
+#endif
+
+#include <string>
+
+
+namespace sequenceParser {
+
+/**
+ * @brief Lazy list of the files of a sequence.
+ * The paths are built from the frame ranges when they are read,
+ * so iterating over a big sequence doesn't build the list of all its files.
+ *
+ * In C++, it's a range:
+ * BOOST_FOREACH( const std::string& path, SequenceFiles( sequence, folder ) )
+ *
+ * In python, it's an iterable:
+ * for path in SequenceFiles(sequence, folder):
+ *     print(path)
+ *
+ * @see Sequence::getFiles
+ */
+class SequenceFiles
+{
+public:
+#ifndef SWIG
+	class const_iterator : public boost::iterator_facade<const_iterator, const std::string, boost::forward_traversal_tag, std::string>
+	{
+	public:
+		const_iterator()
+			: _files( NULL )
+			, _rangeIndex( 0 )
+			, _frame( 0 )
+		{}
+		const_iterator( const SequenceFiles& files, const std::size_t rangeIndex );
+		const_iterator( const SequenceFiles& files, const std::size_t rangeIndex, const Time frame )
+			: _files( &files )
+			, _rangeIndex( rangeIndex )
+			, _frame( frame )
+		{}
+
+		std::size_t getRangeIndex() const { return _rangeIndex; }
+		Time getFrame() const { return _frame; }
+
+	private:
+		friend class boost::iterator_core_access;
+
+		std::string dereference() const { return _files->getPath( _frame ); }
+		bool equal( const const_iterator& other ) const
+		{
+			return _rangeIndex == other._rangeIndex && _frame == other._frame;
+		}
+		void increment();
+
+	private:
+		const SequenceFiles* _files;
+		std::size_t _rangeIndex;
+		Time _frame; ///< 0 at the end
+	};
+	friend class const_iterator;
+#endif
+
+public:
+	/**
+	 * @param[in] sequence: the sequence (a copy of its frame ranges is kept)
+	 * @param[in] folder: folder of the sequence, added before the filenames (nothing if empty)
+	 */
+	SequenceFiles( const Sequence& sequence, const std::string& folder = "" )
+	: _ranges( sequence.getFrameRanges() )
+	, _formatter( sequence, folder )
+	{
+		rewind();
+	}
+
+#ifndef SWIG
+	SequenceFiles( const Sequence& sequence, const boost::filesystem::path& folder )
+	: _ranges( sequence.getFrameRanges() )
+	, _formatter( sequence, folder )
+	{
+		rewind();
+	}
+
+	const_iterator begin() const { return const_iterator( *this, 0 ); }
+	const_iterator end() const { return const_iterator( *this, _ranges.size() ); }
+#endif
+
+	/// @return number of files
+	Time size() const;
+
+	/// @return the path of the file at the given frame (without any check)
+	std::string getPath( const Time frame ) const;
+
+	/**
+	 * @brief Get the files one by one (used by the python iterator).
+	 * @param[out] outPath: path of the next file
+	 * @return false if all the files have been given
+	 */
+	bool next( std::string& outPath );
+
+	/// @brief Restart next from the first file.
+	void rewind();
+
+private:
+	std::vector<FrameRange> _ranges;
+	FilenameFormatter _formatter; ///< paths of the files
+	// position of next
+	std::size_t _nextRangeIndex;
+	Time _nextFrame;
+};
+
+/**
+ * @brief Lazy list of the items of the files of an Item: the files of a sequence, or the item itself.
+ * Like Item::explode, without building the list of all the items.
+ * The type of each file is checked with a stat only if asked, otherwise the files of a sequence are considered as files.
+ *
+ * In python, it's an iterable:
+ * for fileItem in ExplodedItems(item):
+ *     print(fileItem.getAbsoluteFilepath())
+ *
+ * @see Item::explode
+ */
+class ExplodedItems
+{
+public:
+#ifndef SWIG
+	class const_iterator : public boost::iterator_facade<const_iterator, const Item, boost::forward_traversal_tag, Item>
+	{
+	public:
+		const_iterator()
+			: _items( NULL )
+			, _isEnd( true )
+		{}
+		const_iterator( const ExplodedItems& items, const bool isEnd );
+
+	private:
+		friend class boost::iterator_core_access;
+
+		Item dereference() const;
+		bool equal( const const_iterator& other ) const
+		{
+			return _isEnd == other._isEnd && ( _isEnd || _file == other._file );
+		}
+		void increment();
+
+	private:
+		const ExplodedItems* _items;
+		SequenceFiles::const_iterator _file;
+		bool _isEnd;
+	};
+	friend class const_iterator;
+#endif
+
+public:
+	/**
+	 * @param[in] item: the item to explode (a copy is kept)
+	 * @param[in] checkType: get the type of each file of a sequence with a stat
+	 */
+	ExplodedItems( const Item& item, const bool checkType = false );
+
+#ifndef SWIG
+	const_iterator begin() const { return const_iterator( *this, false ); }
+	const_iterator end() const { return const_iterator( *this, true ); }
+#endif
+
+	/// @return number of items
+	Time size() const;
+
+	/**
+	 * @brief Get the items one by one (used by the python iterator).
+	 * @param[out] outItem: the next item
+	 * @return false if all the items have been given
+	 */
+	bool next( Item& outItem );
+
+	/// @brief Restart next from the first item.
+	void rewind();
+
+private:
+	/// @return the item of a file of the sequence
+	Item getFileItem( const std::string& path ) const;
+
+private:
+	Item _item;
+	SequenceFiles _files; ///< files of the sequence, empty if the item is not a sequence
+	bool _checkType;
+	bool _itemGiven; ///< if next has given the item which is not a sequence
+};
+
+}
+
+#endif
@@ -0,0 +1,57 @@
+%include "common.i"
+
+%{
+#include "sequenceParser/SequenceFiles.hpp"
+%}
+
+#ifdef SWIGPYTHON
+
+%rename(nextPath) sequenceParser::SequenceFiles::next;
+%rename(nextItem) sequenceParser::ExplodedItems::next;
+%apply std::string& OUTPUT { std::string& outPath };
+
+// each python iterator uses a copy, with its own position of next
+%copyctor sequenceParser::SequenceFiles;
+%copyctor sequenceParser::ExplodedItems;
+
+%extend sequenceParser::SequenceFiles
+{
+	%pythoncode
+	{
+		def __iter__(self):
+			files = SequenceFiles(self)
+			files.rewind()
+			while True:
+				found, path = files.nextPath()
+				if not found:
+					return
+				yield path
+
+		def __len__(self):
+			return self.size()
+	}
+}
+
+%extend sequenceParser::ExplodedItems
+{
+	%pythoncode
+	{
+		def __iter__(self):
+			items = ExplodedItems(self)
+			items.rewind()
+			while True:
+				item = Item()
+				if not items.nextItem(item):
+					return
+				yield item
+
+		def __len__(self):
+			return self.size()
+	}
+}
+
+#endif
+
+%include "SequenceFiles.hpp"
+
+%clear std::string& outPath;
@@ -0,0 +1,194 @@
+#include "SequenceWatcher.hpp"
+
+#include "detail/syscalls.hpp"
+#include "detail/Profiler.hpp"
+
+#include <boost/filesystem/operations.hpp>
+#include <boost/thread/thread.hpp>
+
+#include <algorithm>
+#include <stdexcept>
+
+#ifdef __LINUX__
+#include <sys/inotify.h>
+#include <poll.h>
+#include <unistd.h>
+#include <cerrno>
+#endif
+
+
+namespace sequenceParser {
+
+namespace bfs = boost::filesystem;
+
+SequenceWatcher::SequenceWatcher( const std::string& pattern, const EPattern accept )
+	: _folder( bfs::path( pattern ).parent_path() )
+	, _notifyFd( -1 )
+	, _folderRemoved( false )
+{
+	if( ! _sequence.initFromPattern( bfs::path( pattern ).filename().string(), accept ) )
+		throw std::invalid_argument( "Not a sequence pattern: " + pattern );
+	init();
+}
+
+SequenceWatcher::SequenceWatcher( const Item& item )
+	: _folder( item.getFolderPath() )
+	, _notifyFd( -1 )
+	, _folderRemoved( false )
+{
+	if( item.getType() != eTypeSequence )
+		throw std::invalid_argument( "Not a sequence: " + item.getAbsoluteFilepath() );
+	_sequence = item.getSequence();
+	init();
+}
+
+SequenceWatcher::~SequenceWatcher()
+{
+#ifdef __LINUX__
+	if( _notifyFd != -1 )
+		::close( _notifyFd );
+#endif
+}
+
+void SequenceWatcher::init()
+{
+	if( _folder.empty() )
+		_folder = ".";
+#ifdef __LINUX__
+	// watch before the read: a file created during the read is not missed
+	_notifyFd = ::inotify_init1( IN_NONBLOCK | IN_CLOEXEC );
+	if( _notifyFd != -1 &&
+		::inotify_add_watch( _notifyFd, _folder.c_str(), IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR ) == -1 )
+	{
+		::close( _notifyFd );
+		_notifyFd = -1;
+	}
+#endif
+	readDirectory();
+}
+
+bool SequenceWatcher::readDirectory()
+{
+	std::vector<Time> times;
+	boost::system::error_code errorCode;
+	detail::countOpenDirectory();
+	bfs::directory_iterator it( _folder, errorCode );
+	if( errorCode )
+	{
+		// the folder doesn't exist anymore, nor its files
+		_folderRemoved = true;
+		if( _sequence._ranges.empty() )
+			return false;
+		_sequence._ranges.clear();
+		return true;
+	}
+	for( bfs::directory_iterator itEnd; it != itEnd; it.increment( errorCode ) )
+	{
+		detail::countReadDirectory();
+		Time time;
+		std::string timeStr;
+		if( _sequence.matchFilename( it->path().filename().string(), time, timeStr ) )
+			times.push_back( time );
+	}
+	const std::vector<FrameRange> ranges = extractFrameRangesFromUnsorted( times );
+	if( ranges == _sequence._ranges )
+		return false;
+	_sequence._ranges = ranges;
+	return true;
+}
+
+bool SequenceWatcher::readEvents()
+{
+	bool changed = false;
+#ifdef __LINUX__
+	// aligned buffer for the events
+	union
+	{
+		struct inotify_event event;
+		char data[4096];
+	} buffer;
+
+	for( ;; )
+	{
+		const ssize_t length = ::read( _notifyFd, buffer.data, sizeof( buffer.data ) );
+		if( length <= 0 )
+			break; // no more events (EAGAIN)
+
+		for( const char* ptr = buffer.data; ptr < buffer.data + length; )
+		{
+			const struct inotify_event* event = reinterpret_cast<const struct inotify_event*>( ptr );
+			ptr += sizeof( struct inotify_event ) + event->len;
+
+			if( event->mask & ( IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED ) )
+			{
+				// the watch is removed with the folder, no more events will come
+				_folderRemoved = true;
+				continue;
+			}
+			if( event->mask & IN_Q_OVERFLOW )
+			{
+				// some events are lost
+				changed = readDirectory() || changed;
+				continue;
+			}
+			if( event->len == 0 || ( event->mask & IN_ISDIR ) )
+				continue;
+
+			Time time;
+			std::string timeStr;
+			if( ! _sequence.matchFilename( event->name, time, timeStr ) )
+				continue;
+			if( event->mask & ( IN_CREATE | IN_MOVED_TO ) )
+				changed = insertFrame( _sequence._ranges, time ) || changed;
+			else if( event->mask & ( IN_DELETE | IN_MOVED_FROM ) )
+				changed = eraseFrame( _sequence._ranges, time ) || changed;
+		}
+	}
+#endif
+	return changed;
+}
+
+bool SequenceWatcher::update( const int timeout )
+{
+	if( _folderRemoved )
+		return false;
+
+	bool changed = false;
+#ifdef __LINUX__
+	if( _notifyFd != -1 )
+	{
+		struct pollfd pollInfos;
+		pollInfos.fd = _notifyFd;
+		pollInfos.events = POLLIN;
+		pollInfos.revents = 0;
+		if( ::poll( &pollInfos, 1, timeout ) > 0 )
+			changed = readEvents();
+	}
+	else
+#endif
+	{
+		// read the directory at regular intervals, until a change or the timeout
+		const double endTime = detail::getMonotonicTime() + timeout / 1000.0;
+		for( ;; )
+		{
+			changed = readDirectory();
+			if( changed || _folderRemoved || timeout == 0 )
+				break;
+			int sleepTime = pollInterval;
+			if( timeout > 0 )
+			{
+				const double remaining = endTime - detail::getMonotonicTime();
+				if( remaining <= 0 )
+					break;
+				sleepTime = std::min( sleepTime, int( remaining * 1000.0 ) + 1 );
+			}
+			boost::this_thread::sleep( boost::posix_time::milliseconds( sleepTime ) );
+		}
+	}
+
+	if( changed && _callback )
+		_callback( _sequence );
+	return changed;
+}
+
+}
@@ -0,0 +1,115 @@
+#ifndef _SEQUENCE_PARSER_SEQUENCE_WATCHER_HPP_
+#define _SEQUENCE_PARSER_SEQUENCE_WATCHER_HPP_
+
+#include "common.hpp"
+#include "Item.hpp"
+#include "Sequence.hpp"
+
+#include <boost/filesystem/path.hpp>
+#ifndef SWIG
+#include <boost/function.hpp>
+#endif
+
+#include <string>
+
+
+namespace sequenceParser {
+
+/**
+ * @brief Follow the files of a sequence while they are created (by a render for example).
+ * The directory is read once, then the frame ranges are updated from the events of the filesystem
+ * (inotify on Linux): each created, removed or renamed file updates the ranges in O(log(number of ranges)),
+ * without reading the directory again.
+ *
+ * In python, it's an endless generator, which gives the sequence after each change:
+ * for sequence in SequenceWatcher("/path/to/foo.####.exr"):
+ *     print(sequence.getFrameRanges())
+ *
+ * The generator ends when the folder is removed or moved.
+ *
+ * @note On the other systems (or if inotify is not available), the directory is read again
+ * every pollInterval milliseconds during an update.
+ */
+class SequenceWatcher
+{
+public:
+#ifndef SWIG
+	typedef boost::function<void( const Sequence& sequence )> ChangeCallback;
+#endif
+
+	/// @brief Time between two reads of the directory, when the events of the filesystem are not available (in milliseconds).
+	static const int pollInterval = 100;
+
+public:
+	/**
+	 * @param[in] pattern: path of the sequence, like "/tmp/foo.####.jpg"
+	 * @param[in] accept: patterns to accept in the detection
+	 * @throw std::invalid_argument if the filename is not a sequence pattern
+	 */
+	SequenceWatcher( const std::string& pattern, const EPattern accept = ePatternDefault );
+
+	/**
+	 * @param[in] item: a sequence found by a browse
+	 * @throw std::invalid_argument if the item is not a sequence
+	 */
+	explicit SequenceWatcher( const Item& item );
+
+	~SequenceWatcher();
+
+	/**
+	 * @brief Wait for the changes of the files of the sequence, and update its frame ranges.
+	 * @param[in] timeout: max time to wait for a change, in milliseconds (0 to check the changes without waiting, -1 to wait without limit)
+	 * @return if the frames of the sequence have changed
+	 * @note With the python binding, the GIL is released during the wait.
+	 * @note Once the folder is removed or moved, it returns without waiting.
+	 * @see isFolderRemoved
+	 */
+	bool update( const int timeout = 0 );
+
+	/// @return if the watched folder has been removed or moved (or can't be read), so the sequence can't change anymore
+	bool isFolderRemoved() const { return _folderRemoved; }
+
+	/// @return the sequence with its current frame ranges
+	const Sequence& getSequence() const { return _sequence; }
+
+	const boost::filesystem::path& getFolderPath() const { return _folder; }
+	std::string getFolder() const { return _folder.string(); }
+
+#ifndef SWIG
+	/**
+	 * @brief Set a function called by update after each change of the frame ranges.
+	 */
+	void setChangeCallback( const ChangeCallback& callback ) { _callback = callback; }
+#endif
+
+private:
+	SequenceWatcher( const SequenceWatcher& );
+	SequenceWatcher& operator=( const SequenceWatcher& );
+
+	void init();
+
+	/**
+	 * @brief Read the whole directory to get the frame ranges.
+	 * @return if the frame ranges have changed
+	 */
+	bool readDirectory();
+
+	/**
+	 * @brief Update the frame ranges from the waiting events of the filesystem.
+	 * @return if the frame ranges have changed
+	 */
+	bool readEvents();
+
+private:
+	Sequence _sequence;
+	boost::filesystem::path _folder;
+	int _notifyFd; ///< -1 if the events of the filesystem are not available
+	bool _folderRemoved;
+#ifndef SWIG
+	ChangeCallback _callback;
+#endif
+};
+
+}
+
+#endif
@@ -0,0 +1,30 @@
+%include "common.i"
+
+%{
+#include "sequenceParser/SequenceWatcher.hpp"
+%}
+
+SEQUENCEPARSER_RELEASE_GIL(sequenceParser::SequenceWatcher::update)
+
+#ifdef SWIGPYTHON
+
+%extend sequenceParser::SequenceWatcher
+{
+	%pythoncode
+	{
+		def __iter__(self):
+			return self
+
+		def __next__(self):
+			while not self.update(-1):
+				if self.isFolderRemoved():
+					raise StopIteration
+			return Sequence(self.getSequence())
+
+		next = __next__
+	}
+}
+
+#endif
+
+%include "SequenceWatcher.hpp"
@@ -0,0 +1,599 @@
+#include "TreeIndex.hpp"
+#include "filesystem.hpp"
+#include "ItemStat.hpp"
+
+#include "detail/DirectoryCache.hpp"
+#include "detail/ThreadPool.hpp"
+
+#include <boost/filesystem/operations.hpp>
+#include <boost/thread/mutex.hpp>
+#include <boost/bind.hpp>
+#include <boost/foreach.hpp>
+
+#include <fstream>
+#include <map>
+#include <stdexcept>
+#include <ctime>
+
+
+namespace sequenceParser {
+
+namespace bfs = boost::filesystem;
+
+namespace detail {
+
+/**
+ * @brief Browse result of a directory in a TreeIndex.
+ */
+struct IndexedDirectory
+{
+	IndexedDirectory()
+		: mayChange( false )
+		, hasStats( false )
+	{}
+
+	DirectoryVersion version; ///< version of the directory before its browse
+	bool mayChange; ///< modified during the clock tick of the browse: an other modification would not change the version
+	bool hasStats;
+	std::vector<Item> items;
+	std::vector<IndexedStat> stats; ///< stat of each item, if hasStats
+};
+
+/// Indexed directories, sorted by path
+typedef std::map<std::string, IndexedDirectory> IndexedDirectories;
+
+struct TreeIndexData
+{
+	TreeIndexData()
+		: detectOptions( eDetectionDefault )
+	{}
+
+	std::string root;
+	EDetection detectOptions;
+	IndexedDirectories directories;
+};
+
+}
+
+namespace {
+
+using detail::ThreadPool;
+using detail::IndexedDirectory;
+using detail::IndexedDirectories;
+
+/// First bytes of an index file
+const char indexMagic[4] = { 'S', 'P', 'T', 'I' };
+/// Version of the format of an index file
+const long long indexFormatVersion = 1;
+
+/**
+ * @brief Refresh the directories of a tree, each directory is refreshed in a task of the thread pool.
+ */
+class TreeRefresher
+{
+public:
+	TreeRefresher( ThreadPool& pool, const IndexedDirectories& previous, const EDetection detectOptions, const bool withStats )
+		: _pool( pool )
+		, _previous( previous )
+		, _detectOptions( detectOptions )
+		, _withStats( withStats )
+		, _nbBrowsedDirectories( 0 )
+	{}
+
+	void refreshFolder( const bfs::path& directory )
+	{
+		IndexedDirectory indexed;
+		if( ! detail::getDirectoryVersion( directory, indexed.version ) )
+			return; // removed, or not a directory anymore
+
+		const IndexedDirectories::const_iterator previous = _previous.find( directory.string() );
+		const bool unchanged = previous != _previous.end() &&
+			previous->second.version == indexed.version &&
+			! previous->second.mayChange &&
+			( previous->second.hasStats || ! _withStats );
+		if( unchanged )
+		{
+			indexed = previous->second;
+		}
+		else
+		{
+			try
+			{
+				indexed.items = browse( directory, _detectOptions );
+			}
+			catch( const bfs::filesystem_error& )
+			{
+				// can't read the directory (permissions, removed...), skip it
+				return;
+			}
+			indexed.mayChange = indexed.version.modificationTime >= std::time( NULL ) - 1;
+		}
+		addResult( directory, indexed, ! unchanged );
+	}
+
+	IndexedDirectories& getResults() { return _results; }
+	std::size_t getNbBrowsedDirectories() const { return _nbBrowsedDirectories; }
+
+private:
+	void addResult( const bfs::path& directory, IndexedDirectory& indexed, const bool browsed )
+	{
+		std::vector<bfs::path> subFolders;
+		BOOST_FOREACH( const Item& item, indexed.items )
+		{
+			if( item.getType() == eTypeFolder )
+				subFolders.push_back( item.getPath() );
+		}
+		{
+			boost::mutex::scoped_lock lock( _mutex );
+			std::swap( _results[directory.string()], indexed );
+			if( browsed )
+				++_nbBrowsedDirectories;
+		}
+		BOOST_FOREACH( const bfs::path& subFolder, subFolders )
+		{
+			_pool.post( boost::bind( &TreeRefresher::refreshFolder, this, subFolder ) );
+		}
+	}
+
+private:
+	ThreadPool& _pool;
+	const IndexedDirectories& _previous;
+	const EDetection _detectOptions;
+	const bool _withStats;
+
+	boost::mutex _mutex;
+	IndexedDirectories _results;
+	std::size_t _nbBrowsedDirectories;
+};
+
+/**
+ * @brief Stat the items of the directories without stats, in a single parallel pass.
+ */
+void statDirectories( IndexedDirectories& directories, const std::size_t nbThreads )
+{
+	std::vector<Item> items;
+	BOOST_FOREACH( IndexedDirectories::value_type& directory, directories )
+	{
+		if( ! directory.second.hasStats )
+			items.insert( items.end(), directory.second.items.begin(), directory.second.items.end() );
+	}
+	const std::vector<ItemStat> itemStats = statItems( items, true, 32, nbThreads );
+
+	std::vector<ItemStat>::const_iterator itemStat = itemStats.begin();
+	BOOST_FOREACH( IndexedDirectories::value_type& directory, directories )
+	{
+		IndexedDirectory& indexed = directory.second;
+		if( indexed.hasStats )
+			continue;
+		indexed.stats.resize( indexed.items.size() );
+		BOOST_FOREACH( IndexedStat& stat, indexed.stats )
+		{
+			stat.size = itemStat->size;
+			stat.realSize = itemStat->realSize;
+			stat.sizeOnDisk = itemStat->sizeOnDisk;
+			stat.modificationTime = itemStat->modificationTime;
+			++itemStat;
+		}
+		indexed.hasStats = true;
+	}
+}
+
+bool hasFrameInRange( const Sequence& sequence, const Time first, const Time last )
+{
+	const std::vector<FrameRange>& ranges = sequence.getFrameRanges();
+	const std::vector<FrameRange>::const_iterator range = findFrameRange( ranges, first );
+	if( range == ranges.end() )
+		return false;
+	// first frame of the range after the beginning of the interval
+	Time frame = range->first;
+	if( frame < first )
+		frame += ( ( first - frame + range->step - 1 ) / range->step ) * range->step;
+	return frame <= last;
+}
+
+bool endsWith( const std::string& str, const std::string& end )
+{
+	return str.size() >= end.size() && str.compare( str.size() - end.size(), end.size(), end ) == 0;
+}
+
+bool respectsQuery( const Item& item, const TreeIndexQuery& query )
+{
+	if( ! ( item.getType() & query.types ) )
+		return false;
+	const std::string filename = item.getFilename();
+	if( filename.compare( 0, query.prefix.size(), query.prefix ) != 0 )
+		return false;
+	if( ! endsWith( filename, query.suffix ) )
+		return false;
+	if( ! query.extension.empty() && ! endsWith( filename, "." + query.extension ) )
+		return false;
+	if( query.hasFrameRange )
+	{
+		return item.getType() == eTypeSequence &&
+			hasFrameInRange( item.getSequence(), query.firstFrame, query.lastFrame );
+	}
+	return true;
+}
+
+/**
+ * @return the path without its trailing '/', like the folders of the browsed items ("/" is kept)
+ */
+std::string removeTrailingSeparators( const std::string& path )
+{
+	std::string::size_type size = path.size();
+	while( size > 1 && path[size - 1] == '/' )
+		--size;
+	return path.substr( 0, size );
+}
+
+/**
+ * @brief Call a function on each indexed item which respects a query.
+ * @param[in] function: called with the item and its indexed stat (NULL if no stat)
+ */
+template<class Function>
+void forEachItem( const IndexedDirectories& directories, const TreeIndexQuery& query, Function& function )
+{
+	const std::string folder = removeTrailingSeparators( query.folder );
+	// the sub-folders of a folder are after it, in the sorted directories
+	IndexedDirectories::const_iterator it = folder.empty() ? directories.begin() : directories.lower_bound( folder );
+	for( ; it != directories.end(); ++it )
+	{
+		if( ! folder.empty() && it->first != folder &&
+			! ( it->first.compare( 0, folder.size(), folder ) == 0 &&
+				( folder[folder.size() - 1] == '/' || it->first[folder.size()] == '/' ) ) )
+		{
+			if( it->first.compare( 0, folder.size(), folder ) != 0 )
+				break; // after all the sub-folders
+			continue; // a folder with the same beginning, like "/foo2" for "/foo"
+		}
+		const IndexedDirectory& indexed = it->second;
+		for( std::size_t i = 0; i < indexed.items.size(); ++i )
+		{
+			if( respectsQuery( indexed.items[i], query ) )
+				function( indexed.items[i], indexed.hasStats ? &indexed.stats[i] : NULL );
+		}
+	}
+}
+
+struct ItemsCollector
+{
+	void operator()( const Item& item, const IndexedStat* )
+	{
+		items.push_back( item );
+	}
+	std::vector<Item> items;
+};
+
+struct ReportBuilder
+{
+	void operator()( const Item& item, const IndexedStat* stat )
+	{
+		++report.nbItems;
+		report.nbFiles += ( item.getType() == eTypeSequence ) ? item.getSequence().getNbFiles() : 1;
+		if( ! stat )
+		{
+			++report.nbItemsWithoutStat;
+			return;
+		}
+		report.size += stat->size;
+		report.realSize += stat->realSize;
+		report.sizeOnDisk += stat->sizeOnDisk;
+	}
+	TreeIndexReport report;
+};
+
+/// @brief Write a signed integer with a variable length (zigzag then 7 bits per byte).
+void writeInteger( std::ostream& stream, const long long value )
+{
+	unsigned long long encoded = ( static_cast<unsigned long long>( value ) << 1 ) ^ static_cast<unsigned long long>( value >> 63 );
+	while( encoded >= 0x80 )
+	{
+		stream.put( static_cast<char>( ( encoded & 0x7F ) | 0x80 ) );
+		encoded >>= 7;
+	}
+	stream.put( static_cast<char>( encoded ) );
+}
+
+void writeString( std::ostream& stream, const std::string& str )
+{
+	writeInteger( stream, str.size() );
+	stream.write( str.data(), str.size() );
+}
+
+/// @throw std::runtime_error if the stream ends before the integer
+long long readInteger( std::istream& stream )
+{
+	unsigned long long encoded = 0;
+	for( std::size_t shift = 0; shift < 64; shift += 7 )
+	{
+		const int byte = stream.get();
+		if( byte == std::char_traits<char>::eof() )
+			throw std::runtime_error( "truncated index" );
+		encoded |= static_cast<unsigned long long>( byte & 0x7F ) << shift;
+		if( ! ( byte & 0x80 ) )
+			return static_cast<long long>( encoded >> 1 ) ^ -static_cast<long long>( encoded & 1 );
+	}
+	throw std::runtime_error( "invalid integer in index" );
+}
+
+std::string readString( std::istream& stream )
+{
+	const long long size = readInteger( stream );
+	if( size < 0 || size > ( 1 << 20 ) )
+		throw std::runtime_error( "invalid string in index" );
+	std::string str( static_cast<std::size_t>( size ), '\0' );
+	if( ! stream.read( &str[0], size ) && size > 0 )
+		throw std::runtime_error( "truncated index" );
+	return str;
+}
+
+void writeDirectory( std::ostream& stream, const std::string& path, const IndexedDirectory& indexed )
+{
+	writeString( stream, path );
+	writeInteger( stream, indexed.version.deviceId );
+	writeInteger( stream, indexed.version.inodeId );
+	writeInteger( stream, indexed.version.modificationTime );
+	writeInteger( stream, indexed.version.modificationTimeNs );
+	writeInteger( stream, indexed.version.lastChangeTime );
+	writeInteger( stream, indexed.version.lastChangeTimeNs );
+	writeInteger( stream, indexed.mayChange );
+	writeInteger( stream, indexed.hasStats );
+	writeInteger( stream, indexed.items.size() );
+	for( std::size_t i = 0; i < indexed.items.size(); ++i )
+	{
+		const Item& item = indexed.items[i];
+		writeInteger( stream, item.getType() );
+		if( item.getType() != eTypeSequence )
+		{
+			writeString( stream, item.getFilename() );
+		}
+		else
+		{
+			const Sequence& sequence = item.getSequence();
+			writeString( stream, sequence.getPrefix() );
+			writeString( stream, sequence.getSuffix() );
+			writeInteger( stream, sequence.getFixedPadding() );
+			writeInteger( stream, sequence.getMaxPadding() );
+			writeInteger( stream, sequence.getFrameRanges().size() );
+			BOOST_FOREACH( const FrameRange& range, sequence.getFrameRanges() )
+			{
+				writeInteger( stream, range.first );
+				writeInteger( stream, range.last );
+				writeInteger( stream, range.step );
+			}
+		}
+		if( indexed.hasStats )
+		{
+			const IndexedStat& stat = indexed.stats[i];
+			writeInteger( stream, stat.size );
+			writeInteger( stream, stat.realSize );
+			writeInteger( stream, stat.sizeOnDisk );
+			writeInteger( stream, stat.modificationTime );
+		}
+	}
+}
+
+std::string readDirectory( std::istream& stream, IndexedDirectory& indexed )
+{
+	const std::string path = readString( stream );
+	const bfs::path folder( path );
+	indexed.version.deviceId = readInteger( stream );
+	indexed.version.inodeId = readInteger( stream );
+	indexed.version.modificationTime = readInteger( stream );
+	indexed.version.modificationTimeNs = readInteger( stream );
+	indexed.version.lastChangeTime = readInteger( stream );
+	indexed.version.lastChangeTimeNs = readInteger( stream );
+	indexed.mayChange = readInteger( stream ) != 0;
+	indexed.hasStats = readInteger( stream ) != 0;
+	const long long nbItems = readInteger( stream );
+	if( nbItems < 0 )
+		throw std::runtime_error( "invalid number of items in index" );
+	for( long long i = 0; i < nbItems; ++i )
+	{
+		const EType type = static_cast<EType>( readInteger( stream ) );
+		if( type != eTypeSequence )
+		{
+			indexed.items.push_back( Item( type, folder / readString( stream ) ) );
+		}
+		else
+		{
+			const std::string prefix = readString( stream );
+			const std::string suffix = readString( stream );
+			const std::size_t fixedPadding = readInteger( stream );
+			const std::size_t maxPadding = readInteger( stream );
+			Sequence sequence( prefix, fixedPadding, maxPadding, suffix, 0, 0 );
+			std::vector<FrameRange>& ranges = sequence.getFrameRanges();
+			ranges.clear();
+			const long long nbRanges = readInteger( stream );
+			for( long long r = 0; r < nbRanges; ++r )
+			{
+				const Time first = readInteger( stream );
+				const Time last = readInteger( stream );
+				const Time step = readInteger( stream );
+				if( step < 1 || last < first )
+					throw std::runtime_error( "invalid frame range in index" );
+				ranges.push_back( FrameRange( first, last, step ) );
+			}
+			indexed.items.push_back( Item( sequence, folder ) );
+		}
+		if( indexed.hasStats )
+		{
+			IndexedStat stat;
+			stat.size = readInteger( stream );
+			stat.realSize = readInteger( stream );
+			stat.sizeOnDisk = readInteger( stream );
+			stat.modificationTime = readInteger( stream );
+			indexed.stats.push_back( stat );
+		}
+	}
+	return path;
+}
+
+}
+
+TreeIndex::TreeIndex()
+	: _data( new detail::TreeIndexData() )
+{
+}
+
+TreeIndex::~TreeIndex()
+{
+	delete _data;
+}
+
+TreeIndexRefreshCounters TreeIndex::refresh(
+		const std::string& root,
+		const EDetection detectOptions,
+		const bool withStats,
+		const std::size_t nbThreads )
+{
+	const std::string rootString = removeTrailingSeparators( root );
+	const bfs::path rootPath( rootString );
+	boost::system::error_code errorCode;
+	if( ! bfs::is_directory( rootPath, errorCode ) )
+		throw std::invalid_argument( "not a directory: " + root );
+
+	// nothing can be reused from an other tree or other options
+	if( rootPath.string() != _data->root || detectOptions != _data->detectOptions )
+		clear();
+
+	TreeIndexRefreshCounters counters;
+	{
+		ThreadPool pool( nbThreads );
+		TreeRefresher refresher( pool, _data->directories, detectOptions, withStats );
+		pool.post( boost::bind( &TreeRefresher::refreshFolder, &refresher, rootPath ) );
+		pool.wait();
+
+		counters.nbBrowsedDirectories = refresher.getNbBrowsedDirectories();
+		BOOST_FOREACH( const IndexedDirectories::value_type& previous, _data->directories )
+		{
+			if( ! refresher.getResults().count( previous.first ) )
+				++counters.nbRemovedDirectories;
+		}
+		_data->directories.swap( refresher.getResults() );
+	}
+	if( withStats )
+		statDirectories( _data->directories, nbThreads );
+
+	_data->root = rootPath.string();
+	_data->detectOptions = detectOptions;
+	counters.nbDirectories = _data->directories.size();
+	return counters;
+}
+
+bool TreeIndex::save( const std::string& filepath ) const
+{
+	const std::string temporaryPath = filepath + ".tmp";
+	{
+		std::ofstream stream( temporaryPath.c_str(), std::ios::binary | std::ios::trunc );
+		if( ! stream )
+			return false;
+		stream.write( indexMagic, sizeof( indexMagic ) );
+		writeInteger( stream, indexFormatVersion );
+		writeString( stream, _data->root );
+		writeInteger( stream, _data->detectOptions );
+		writeInteger( stream, _data->directories.size() );
+		BOOST_FOREACH( const IndexedDirectories::value_type& directory, _data->directories )
+		{
+			writeDirectory( stream, directory.first, directory.second );
+		}
+		stream.flush();
+		if( ! stream )
+			return false;
+	}
+	boost::system::error_code errorCode;
+	bfs::rename( temporaryPath, filepath, errorCode );
+	return ! errorCode;
+}
+
+bool TreeIndex::load( const std::string& filepath )
+{
+	clear();
+	std::ifstream stream( filepath.c_str(), std::ios::binary );
+	if( ! stream )
+		return false;
+	try
+	{
+		char magic[sizeof( indexMagic )];
+		if( ! stream.read( magic, sizeof( magic ) ) || ! std::equal( magic, magic + sizeof( magic ), indexMagic ) )
+			return false;
+		if( readInteger( stream ) != indexFormatVersion )
+			return false;
+		detail::TreeIndexData data;
+		data.root = readString( stream );
+		data.detectOptions = static_cast<EDetection>( readInteger( stream ) );
+		const long long nbDirectories = readInteger( stream );
+		for( long long i = 0; i < nbDirectories; ++i )
+		{
+			IndexedDirectory indexed;
+			const std::string path = readDirectory( stream, indexed );
+			std::swap( data.directories[path], indexed );
+		}
+		std::swap( *_data, data );
+	}
+	catch( const std::exception& )
+	{
+		// not an index, or a truncated one
+		return false;
+	}
+	return true;
+}
+
+void TreeIndex::clear()
+{
+	*_data = detail::TreeIndexData();
+}
+
+std::string TreeIndex::getRoot() const
+{
+	return _data->root;
+}
+
+std::size_t TreeIndex::getNbDirectories() const
+{
+	return _data->directories.size();
+}
+
+std::size_t TreeIndex::size() const
+{
+	std::size_t nbItems = 0;
+	BOOST_FOREACH( const IndexedDirectories::value_type& directory, _data->directories )
+	{
+		nbItems += directory.second.items.size();
+	}
+	return nbItems;
+}
+
+std::vector<Item> TreeIndex::query( const TreeIndexQuery& query ) const
+{
+	ItemsCollector collector;
+	forEachItem( _data->directories, query, collector );
+	return collector.items;
+}
+
+TreeIndexReport TreeIndex::getReport( const TreeIndexQuery& query ) const
+{
+	ReportBuilder builder;
+	forEachItem( _data->directories, query, builder );
+	return builder.report;
+}
+
+bool TreeIndex::getStat( const Item& item, IndexedStat& outStat ) const
+{
+	const IndexedDirectories::const_iterator directory = _data->directories.find( item.getFolder() );
+	if( directory == _data->directories.end() || ! directory->second.hasStats )
+		return false;
+	const IndexedDirectory& indexed = directory->second;
+	const std::string filename = item.getFilename();
+	for( std::size_t i = 0; i < indexed.items.size(); ++i )
+	{
+		if( indexed.items[i].getFilename() == filename )
+		{
+			outStat = indexed.stats[i];
+			return true;
+		}
+	}
+	return false;
+}
+
+}
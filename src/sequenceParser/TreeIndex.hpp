@@ -0,0 +1,185 @@
+#ifndef _SEQUENCE_PARSER_TREE_INDEX_HPP_
+#define _SEQUENCE_PARSER_TREE_INDEX_HPP_
+
+#include "common.hpp"
+#include "Item.hpp"
+
+#include <vector>
+#include <string>
+
+
+namespace sequenceParser {
+
+#ifndef SWIG
+namespace detail {
+struct TreeIndexData;
+}
+#endif
+
+/**
+ * @brief Summary of the stat of an indexed item.
+ * @see ItemStat
+ */
+struct IndexedStat
+{
+	IndexedStat()
+		: size( 0 )
+		, realSize( 0 )
+		, sizeOnDisk( 0 )
+		, modificationTime( 0 )
+	{}
+
+	long long size;
+	long long realSize; ///< size (takes hardlinks into account)
+	long long sizeOnDisk; ///< size on hard-drive (takes hardlinks into account)
+	long long modificationTime; ///< time of last modification
+};
+
+/**
+ * @brief Items to select from a TreeIndex.
+ * An item is selected if it respects all the criteria.
+ */
+struct TreeIndexQuery
+{
+	TreeIndexQuery()
+		: types( eTypeAll )
+		, hasFrameRange( false )
+		, firstFrame( 0 )
+		, lastFrame( 0 )
+	{}
+
+	/// @brief Select the sequences with at least a frame between first and last (included).
+	void setFrameRange( const Time first, const Time last )
+	{
+		hasFrameRange = true;
+		firstFrame = first;
+		lastFrame = last;
+	}
+
+	std::string folder; ///< the items of this folder and of its sub-folders (all the folders if empty)
+	std::string prefix; ///< the filename begins with (the pattern of a sequence, like "foo.####.jpg")
+	std::string suffix; ///< the filename ends with
+	std::string extension; ///< the extension of the filename, without the dot (like "jpg")
+	EType types; ///< the types of the items
+	bool hasFrameRange; ///< only the sequences with a frame between firstFrame and lastFrame
+	Time firstFrame;
+	Time lastFrame;
+};
+
+/**
+ * @brief Totals of the items selected by a query.
+ */
+struct TreeIndexReport
+{
+	TreeIndexReport()
+		: nbItems( 0 )
+		, nbFiles( 0 )
+		, size( 0 )
+		, realSize( 0 )
+		, sizeOnDisk( 0 )
+		, nbItemsWithoutStat( 0 )
+	{}
+
+	std::size_t nbItems;
+	std::size_t nbFiles; ///< files of the sequences included
+	long long size;
+	long long realSize;
+	long long sizeOnDisk;
+	std::size_t nbItemsWithoutStat; ///< items indexed without stat (not included in the sizes)
+};
+
+/**
+ * @brief What a refresh of a TreeIndex has done.
+ */
+struct TreeIndexRefreshCounters
+{
+	TreeIndexRefreshCounters()
+		: nbDirectories( 0 )
+		, nbBrowsedDirectories( 0 )
+		, nbRemovedDirectories( 0 )
+	{}
+
+	std::size_t nbDirectories; ///< directories in the index
+	std::size_t nbBrowsedDirectories; ///< directories read again (new or modified)
+	std::size_t nbRemovedDirectories; ///< directories which don't exist anymore
+};
+
+/**
+ * @brief Index of the browse results of a tree of directories, saved in a local file.
+ * A refresh only browses again the directories which have changed since the previous refresh
+ * (a single stat for each unchanged directory), and the queries never access the filesystem.
+ *
+ * @note A directory changes when an entry is added, removed or renamed,
+ * not when a file is modified: the stats of an unchanged directory are not updated.
+ * @note The queries can be done from several threads, but not during a refresh.
+ * @see browseRecursive, BrowseCache
+ */
+class TreeIndex
+{
+public:
+	TreeIndex();
+	~TreeIndex();
+
+	/**
+	 * @brief Update the index from the filesystem.
+	 * The directories with the same modification time as in the index are not browsed again.
+	 * Everything is browsed again if the root or the options are not the ones of the index.
+	 * @param[in] root: the root directory of the tree
+	 * @param[in] detectOptions: some options to choose how to consider sequences
+	 * @param[in] withStats: also index a summary of the stat of the items
+	 * @param[in] nbThreads: number of threads, if 0 use the number of hardware threads
+	 * @note With the python binding, the GIL is released during the refresh.
+	 */
+	TreeIndexRefreshCounters refresh(
+		const std::string& root,
+		const EDetection detectOptions = eDetectionDefault,
+		const bool withStats = false,
+		const std::size_t nbThreads = 0 );
+
+	/**
+	 * @brief Save the index in a file (written in a temporary file, then renamed).
+	 * @return false if the file can't be written
+	 */
+	bool save( const std::string& filepath ) const;
+
+	/**
+	 * @brief Replace the index by the content of a file.
+	 * @return false if the file can't be read or is not an index (then the index is empty)
+	 */
+	bool load( const std::string& filepath );
+
+	void clear();
+
+	/// @return the root directory of the index
+	std::string getRoot() const;
+
+	std::size_t getNbDirectories() const;
+
+	/// @return number of items in the index
+	std::size_t size() const;
+
+	/// @return the indexed items which respect the query, sorted by folder
+	std::vector<Item> query( const TreeIndexQuery& query ) const;
+
+	/// @return the totals of the indexed items which respect the query
+	TreeIndexReport getReport( const TreeIndexQuery& query ) const;
+
+	/**
+	 * @brief Get the indexed stat of an item.
+	 * @return false if the item is not in the index, or if it has been indexed without stat
+	 */
+	bool getStat( const Item& item, IndexedStat& outStat ) const;
+
+private:
+	TreeIndex( const TreeIndex& );
+	TreeIndex& operator=( const TreeIndex& );
+
+private:
+#ifndef SWIG
+	detail::TreeIndexData* _data;
+#endif
+};
+
+}
+
+#endif
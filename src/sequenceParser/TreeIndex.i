@@ -0,0 +1,9 @@
+%include "common.i"
+
+%{
+#include "sequenceParser/TreeIndex.hpp"
+%}
+
+SEQUENCEPARSER_RELEASE_GIL(sequenceParser::TreeIndex::refresh)
+
+%include "TreeIndex.hpp"
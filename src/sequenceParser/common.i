@@ -18,11 +18,7 @@ namespace sequenceParser {
 typedef long int Time;
 }
 
-%exception {
-try
-{
-	$action
-}
+%define SEQUENCEPARSER_CATCH_EXCEPTIONS
 catch (boost::filesystem::filesystem_error& e)
 {
 	std::string message;
@@ -34,6 +30,14 @@ catch (boost::filesystem::filesystem_error& e)
         message += " " + e.path2().string();
 	SWIG_exception( SWIG_IOError, message.c_str() );	
 }
+catch (std::out_of_range& e)
+{
+	SWIG_exception( SWIG_IndexError, e.what() );
+}
+catch (std::invalid_argument& e)
+{
+	SWIG_exception( SWIG_ValueError, e.what() );
+}
 catch (std::exception& e)
 {
 	SWIG_exception( SWIG_RuntimeError, e.what() );	
@@ -43,9 +47,61 @@ catch( ... )
 	// Add the C++ backtrace into the exception log.
 	SWIG_exception( SWIG_RuntimeError, "[sequence parser] unknown error" );
 }
+%enddef
 
+%exception {
+try
+{
+	$action
+}
+SEQUENCEPARSER_CATCH_EXCEPTIONS
 }
 
+#ifdef SWIGPYTHON
+%{
+/**
+ * @brief Release the Python GIL during the lifetime of the object.
+ */
+class ScopedReleaseGIL
+{
+public:
+	ScopedReleaseGIL()
+		: _state( PyEval_SaveThread() )
+	{}
+	~ScopedReleaseGIL()
+	{
+		PyEval_RestoreThread( _state );
+	}
+private:
+	PyThreadState* _state;
+};
+%}
+
+%init %{
+#if PY_VERSION_HEX < 0x03070000
+	PyEval_InitThreads();
+#endif
+%}
+#endif
+
+/**
+ * Release the Python GIL while calling FUNCTION,
+ * so other Python threads can run during long operations (the GIL is taken back before the conversion of the result).
+ * FUNCTION should not use any Python object.
+ */
+%define SEQUENCEPARSER_RELEASE_GIL(FUNCTION)
+#ifdef SWIGPYTHON
+%exception FUNCTION {
+try
+{
+	ScopedReleaseGIL releaseGIL;
+	$action
+}
+SEQUENCEPARSER_CATCH_EXCEPTIONS
+}
+#endif
+%enddef
+
 #ifdef SWIGJAVA
 // Define some typemaps to be applied to std::string& arguments
 %typemap(jstype) std::string& OUTPUT "String[]"
@@ -0,0 +1,142 @@
+#include "DirectoryBrowser.hpp"
+#include "Profiler.hpp"
+
+#include <boost/foreach.hpp>
+
+
+namespace sequenceParser {
+namespace detail {
+
+namespace bfs = boost::filesystem;
+
+DirectoryBrowser::DirectoryBrowser(
+		const bfs::path& directory,
+		const boost::shared_ptr<const FilenameFilters>& filters,
+		const std::string& filename,
+		const EDetection detectOptions,
+		std::vector<bfs::path>* outSubFolders,
+		PerformanceReport* report )
+	: _directory( directory )
+	, _filters( filters )
+	, _filename( filename )
+	, _detectOptions( detectOptions )
+	, _outSubFolders( outSubFolders )
+	, _report( report )
+	, _reader( directory )
+	, _endOfDirectory( false )
+	, _grouper( detectOptions )
+	, _nextSequence( 0 )
+{
+	if( _report )
+		++_report->nbDirectories;
+}
+
+bool DirectoryBrowser::next( Item& outItem )
+{
+	if( ! _endOfDirectory )
+	{
+		if( readEntry( outItem ) )
+			return true;
+		_endOfDirectory = true;
+		if( _report )
+		{
+			_report->nbSequenceGroups += _grouper.getNbGroups();
+			_report->groupedNumbersBytes += _grouper.getMemorySize();
+		}
+		PhaseTimer timer( _report, &PerformanceReport::buildSequencesTime );
+		_sequences = _grouper.buildSequences();
+	}
+
+	while( _pendingItems.empty() )
+	{
+		if( _nextSequence == _sequences.size() )
+			return false;
+		popSequence();
+	}
+	outItem = _pendingItems.front();
+	_pendingItems.pop_front();
+	return true;
+}
+
+bool DirectoryBrowser::readEntry( Item& outItem )
+{
+	std::string entryFilename;
+	EType entryType;
+	while( readNextEntry( entryFilename, entryType ) )
+	{
+		const bfs::path entryPath = _directory / entryFilename;
+		if( _outSubFolders && entryType == eTypeFolder &&
+			! ( ( _detectOptions & eDetectionIgnoreDotFile ) && ( entryFilename[0] == '.' ) ) )
+		{
+			_outSubFolders->push_back( entryPath );
+		}
+
+		if( ! respectsFilters( entryFilename, entryPath ) )
+			continue;
+
+		// folders are never considered as a sequence
+		// and if no number detected, it's not part of a sequence
+		if( entryType == eTypeFolder || ! addToGroups( entryFilename ) )
+		{
+			outItem = Item( entryType, entryPath );
+			return true;
+		}
+		if( entryType != eTypeFile )
+		{
+			_otherTypes[entryFilename] = entryType;
+		}
+	}
+	return false;
+}
+
+bool DirectoryBrowser::readNextEntry( std::string& outFilename, EType& outType )
+{
+	PhaseTimer timer( _report, &PerformanceReport::readDirectoryTime );
+	if( ! _reader.next( outFilename, outType ) )
+		return false;
+	if( _report )
+		++_report->nbEntries;
+	return true;
+}
+
+bool DirectoryBrowser::respectsFilters( const std::string& entryFilename, const bfs::path& entryPath )
+{
+	PhaseTimer timer( _report, &PerformanceReport::filterTime );
+	if( entryRespectsAllFilters( entryFilename, entryPath, *_filters, _filename, _detectOptions ) )
+		return true;
+	if( _report )
+		++_report->nbFilteredEntries;
+	return false;
+}
+
+bool DirectoryBrowser::addToGroups( const std::string& entryFilename )
+{
+	PhaseTimer timer( _report, &PerformanceReport::decomposeTime );
+	return _grouper.add( entryFilename );
+}
+
+void DirectoryBrowser::popSequence()
+{
+	PhaseTimer timer( _report, &PerformanceReport::splitSequencesTime );
+	std::vector<Sequence> sequences;
+	std::vector<std::string> singleFilenames;
+	splitSequence( _sequences[_nextSequence], _detectOptions, sequences, singleFilenames );
+	// release the memory of the detected sequence
+	_sequences[_nextSequence++] = Sequence();
+	if( _report )
+		_report->nbSequences += sequences.size();
+
+	BOOST_FOREACH( const Sequence& sequence, sequences )
+	{
+		_pendingItems.push_back( Item( Sequence( _directory, sequence ), _directory ) );
+	}
+	BOOST_FOREACH( const std::string& singleFilename, singleFilenames )
+	{
+		const boost::unordered_map<std::string, EType>::const_iterator itType = _otherTypes.find( singleFilename );
+		const EType type = ( itType == _otherTypes.end() ) ? eTypeFile : itType->second;
+		_pendingItems.push_back( Item( type, _directory / singleFilename ) );
+	}
+}
+
+}
+}
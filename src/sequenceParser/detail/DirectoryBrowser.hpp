@@ -0,0 +1,94 @@
+#ifndef _SEQUENCE_PARSER_DIRECTORY_BROWSER_HPP_
+#define _SEQUENCE_PARSER_DIRECTORY_BROWSER_HPP_
+
+#include "DirectoryReader.hpp"
+#include "SequenceGrouper.hpp"
+#include "FilenameFilters.hpp"
+
+#include <sequenceParser/common.hpp>
+#include <sequenceParser/Item.hpp>
+#include <sequenceParser/PerformanceReport.hpp>
+
+#include <boost/filesystem/path.hpp>
+#include <boost/shared_ptr.hpp>
+#include <boost/unordered_map.hpp>
+#include <boost/noncopyable.hpp>
+
+#include <deque>
+#include <vector>
+#include <string>
+
+namespace sequenceParser {
+namespace detail {
+
+/**
+ * @brief Browse the content of an existing directory, one item at a time.
+ * Files and folders which can't be part of a sequence are given as soon as
+ * they are read. The sequences are given once the whole directory is read.
+ */
+class DirectoryBrowser : boost::noncopyable
+{
+public:
+	/**
+	 * @param[in] directory: an existing directory
+	 * @param[in] filters: the items have to respect these filters
+	 * @param[in] filename: the items have to respect this filename (if not empty)
+	 * @param[in] detectOptions: some options to choose how to consider sequences
+	 * @param[out] outSubFolders: if not NULL, all the folders inside the directory
+	 *             are added (even if they don't respect the filters)
+	 * @param[out] report: if not NULL, the times and the counts of the browse are added
+	 * @throw boost::filesystem::filesystem_error if the directory can't be opened
+	 */
+	DirectoryBrowser(
+		const boost::filesystem::path& directory,
+		const boost::shared_ptr<const FilenameFilters>& filters,
+		const std::string& filename,
+		const EDetection detectOptions,
+		std::vector<boost::filesystem::path>* outSubFolders = NULL,
+		PerformanceReport* report = NULL );
+
+	/**
+	 * @brief Get the next item of the directory.
+	 * @return false if there is no more item
+	 */
+	bool next( Item& outItem );
+
+private:
+	/// @return false if there is no more entry in the directory
+	bool readEntry( Item& outItem );
+
+	/// @return false if there is no more entry in the directory
+	bool readNextEntry( std::string& outFilename, EType& outType );
+
+	bool respectsFilters( const std::string& entryFilename, const boost::filesystem::path& entryPath );
+
+	/// @return false if the entry is not part of a sequence
+	bool addToGroups( const std::string& entryFilename );
+
+	/// @brief Add the items of the next detected sequence in the pending items.
+	void popSequence();
+
+private:
+	const boost::filesystem::path _directory;
+	const boost::shared_ptr<const FilenameFilters> _filters;
+	const std::string _filename;
+	const EDetection _detectOptions;
+	std::vector<boost::filesystem::path>* _outSubFolders;
+	PerformanceReport* _report;
+
+	DirectoryReader _reader;
+	bool _endOfDirectory;
+
+	SequenceGrouper _grouper;
+	/// type of the elements in sequences which are not files (links...)
+	boost::unordered_map<std::string, EType> _otherTypes;
+
+	std::vector<Sequence> _sequences; ///< detected sequences, once the directory is read
+	std::size_t _nextSequence;
+	std::deque<Item> _pendingItems; ///< items of the current sequence
+};
+
+}
+}
+
+#endif
@@ -0,0 +1,158 @@
+#include "DirectoryCache.hpp"
+#include "syscalls.hpp"
+
+#include <boost/filesystem/operations.hpp>
+
+#include <ctime>
+
+namespace sequenceParser {
+namespace detail {
+
+bool DirectoryVersion::operator==( const DirectoryVersion& other ) const
+{
+	return deviceId == other.deviceId &&
+		inodeId == other.inodeId &&
+		modificationTime == other.modificationTime &&
+		modificationTimeNs == other.modificationTimeNs &&
+		lastChangeTime == other.lastChangeTime &&
+		lastChangeTimeNs == other.lastChangeTimeNs;
+}
+
+bool getDirectoryVersion( const boost::filesystem::path& directory, DirectoryVersion& outVersion )
+{
+#ifdef __UNIX__
+	struct stat statInfos;
+	if( detail::stat( directory.c_str(), &statInfos ) == -1 || ! S_ISDIR( statInfos.st_mode ) )
+		return false;
+	outVersion.deviceId = statInfos.st_dev;
+	outVersion.inodeId = statInfos.st_ino;
+	outVersion.modificationTime = statInfos.st_mtime;
+	outVersion.lastChangeTime = statInfos.st_ctime;
+#if defined( __LINUX__ )
+	outVersion.modificationTimeNs = statInfos.st_mtim.tv_nsec;
+	outVersion.lastChangeTimeNs = statInfos.st_ctim.tv_nsec;
+#elif defined( __MACOS__ )
+	outVersion.modificationTimeNs = statInfos.st_mtimespec.tv_nsec;
+	outVersion.lastChangeTimeNs = statInfos.st_ctimespec.tv_nsec;
+#endif
+	return true;
+#else
+	boost::system::error_code errorCode;
+	countStat();
+	if( ! boost::filesystem::is_directory( directory, errorCode ) )
+		return false;
+	outVersion.modificationTime = boost::filesystem::last_write_time( directory, errorCode );
+	return ! errorCode;
+#endif
+}
+
+DirectoryCache::DirectoryCache( const std::size_t maxSize )
+	: _maxSize( maxSize )
+{
+	resetCounters();
+}
+
+DirectoryCache::ItemsPtr DirectoryCache::get( const std::string& key, const DirectoryVersion& version )
+{
+	boost::mutex::scoped_lock lock( _mutex );
+	EntryMap::iterator it = _entries.find( key );
+	if( it == _entries.end() )
+	{
+		++_counters.nbMisses;
+		return ItemsPtr();
+	}
+	if( ! ( it->second.version == version ) )
+	{
+		// the directory has changed
+		_keys.erase( it->second.position );
+		_entries.erase( it );
+		++_counters.nbMisses;
+		return ItemsPtr();
+	}
+	// most recently used
+	_keys.splice( _keys.begin(), _keys, it->second.position );
+	++_counters.nbHits;
+	return it->second.items;
+}
+
+void DirectoryCache::put( const std::string& key, const DirectoryVersion& version, const ItemsPtr& items )
+{
+	if( version.modificationTime >= std::time( NULL ) - 1 )
+		return; // the directory may change again without any change of its version
+
+	boost::mutex::scoped_lock lock( _mutex );
+	if( _maxSize == 0 )
+		return;
+	EntryMap::iterator it = _entries.find( key );
+	if( it != _entries.end() )
+	{
+		// browsed by an other thread in the meantime
+		_keys.erase( it->second.position );
+		_entries.erase( it );
+	}
+	_keys.push_front( key );
+	Entry& entry = _entries[key];
+	entry.version = version;
+	entry.items = items;
+	entry.position = _keys.begin();
+	evict();
+}
+
+void DirectoryCache::addMiss()
+{
+	boost::mutex::scoped_lock lock( _mutex );
+	++_counters.nbMisses;
+}
+
+void DirectoryCache::evict()
+{
+	while( _entries.size() > _maxSize )
+	{
+		_entries.erase( _keys.back() );
+		_keys.pop_back();
+		++_counters.nbEvictions;
+	}
+}
+
+void DirectoryCache::clear()
+{
+	boost::mutex::scoped_lock lock( _mutex );
+	_entries.clear();
+	_keys.clear();
+}
+
+void DirectoryCache::setMaxSize( const std::size_t maxSize )
+{
+	boost::mutex::scoped_lock lock( _mutex );
+	_maxSize = maxSize;
+	evict();
+}
+
+std::size_t DirectoryCache::getMaxSize() const
+{
+	boost::mutex::scoped_lock lock( _mutex );
+	return _maxSize;
+}
+
+std::size_t DirectoryCache::size() const
+{
+	boost::mutex::scoped_lock lock( _mutex );
+	return _entries.size();
+}
+
+BrowseCacheCounters DirectoryCache::getCounters() const
+{
+	boost::mutex::scoped_lock lock( _mutex );
+	return _counters;
+}
+
+void DirectoryCache::resetCounters()
+{
+	boost::mutex::scoped_lock lock( _mutex );
+	_counters.nbHits = 0;
+	_counters.nbMisses = 0;
+	_counters.nbEvictions = 0;
+}
+
+}
+}
@@ -0,0 +1,112 @@
+#ifndef _SEQUENCE_PARSER_DIRECTORY_CACHE_HPP_
+#define _SEQUENCE_PARSER_DIRECTORY_CACHE_HPP_
+
+#include <sequenceParser/BrowseCache.hpp>
+#include <sequenceParser/Item.hpp>
+
+#include <boost/noncopyable.hpp>
+#include <boost/shared_ptr.hpp>
+#include <boost/thread/mutex.hpp>
+#include <boost/unordered_map.hpp>
+#include <boost/filesystem/path.hpp>
+
+#include <list>
+#include <string>
+#include <vector>
+
+namespace sequenceParser {
+namespace detail {
+
+/**
+ * @brief State of a directory: if the content of the directory changes, its version changes.
+ * Adding, removing or renaming an entry updates the modification time of the directory.
+ */
+struct DirectoryVersion
+{
+	DirectoryVersion()
+		: deviceId( 0 )
+		, inodeId( 0 )
+		, modificationTime( 0 )
+		, modificationTimeNs( 0 )
+		, lastChangeTime( 0 )
+		, lastChangeTimeNs( 0 )
+	{}
+
+	bool operator==( const DirectoryVersion& other ) const;
+
+	long long deviceId;
+	long long inodeId;
+	long long modificationTime;
+	long long modificationTimeNs; ///< nanoseconds of the modification time, if available
+	long long lastChangeTime;
+	long long lastChangeTimeNs; ///< nanoseconds of the last change time, if available
+};
+
+/**
+ * @brief Get the version of a directory with a single stat, counted in the filesystem counters.
+ * @return false if the path is not an existing directory
+ */
+bool getDirectoryVersion( const boost::filesystem::path& directory, DirectoryVersion& outVersion );
+
+/**
+ * @brief Thread-safe LRU cache of browse results, with the version of the browsed directory.
+ */
+class DirectoryCache : boost::noncopyable
+{
+public:
+	typedef boost::shared_ptr<const std::vector<Item> > ItemsPtr;
+
+public:
+	explicit DirectoryCache( const std::size_t maxSize );
+
+	/**
+	 * @brief Get the items of a browse, if the directory has not changed.
+	 * Counts a hit or a miss.
+	 * @return NULL if the items are not in the cache or if they are outdated
+	 */
+	ItemsPtr get( const std::string& key, const DirectoryVersion& version );
+
+	/**
+	 * @brief Store the items of a browse, for the version of the directory before the browse.
+	 * The items are not stored if the directory has just been modified: an other modification
+	 * during the same clock tick would not change the version.
+	 */
+	void put( const std::string& key, const DirectoryVersion& version, const ItemsPtr& items );
+
+	/// @brief Count a browse which can't use the cache.
+	void addMiss();
+
+	void clear();
+
+	void setMaxSize( const std::size_t maxSize );
+	std::size_t getMaxSize() const;
+	std::size_t size() const;
+
+	BrowseCacheCounters getCounters() const;
+	void resetCounters();
+
+private:
+	typedef std::list<std::string> KeyList;
+	struct Entry
+	{
+		DirectoryVersion version;
+		ItemsPtr items;
+		KeyList::iterator position; ///< position in the list of the least recently used keys
+	};
+	typedef boost::unordered_map<std::string, Entry> EntryMap;
+
+	/// @brief Remove the least recently used entries to respect the max size.
+	void evict();
+
+private:
+	mutable boost::mutex _mutex;
+	std::size_t _maxSize;
+	EntryMap _entries;
+	KeyList _keys; ///< the most recently used key first
+	BrowseCacheCounters _counters;
+};
+
+}
+}
+
+#endif
@@ -0,0 +1,127 @@
+#include "DirectoryReader.hpp"
+#include "syscalls.hpp"
+
+#include <cerrno>
+
+
+namespace sequenceParser {
+namespace detail {
+
+namespace bfs = boost::filesystem;
+
+#ifdef __UNIX__
+
+namespace {
+
+#if defined( _DIRENT_HAVE_D_TYPE ) || defined( __MACOS__ )
+/**
+ * @return false if the filesystem doesn't give the type
+ */
+bool getTypeFromDirentType( const unsigned char direntType, EType& outType )
+{
+	switch( direntType )
+	{
+		case DT_UNKNOWN:
+			return false;
+		case DT_LNK:
+			outType = eTypeLink;
+			break;
+		case DT_REG:
+			outType = eTypeFile;
+			break;
+		case DT_DIR:
+			outType = eTypeFolder;
+			break;
+		default:
+			// fifo, socket, device...
+			outType = eTypeUndefined;
+			break;
+	}
+	return true;
+}
+#endif
+
+}
+
+DirectoryReader::DirectoryReader( const bfs::path& directory )
+	: _directory( directory )
+	, _dir( NULL )
+{
+	countOpenDirectory();
+	_dir = opendir( _directory.c_str() );
+	if( ! _dir )
+	{
+		throw bfs::filesystem_error( "can't open directory", _directory, boost::system::error_code( errno, boost::system::system_category() ) );
+	}
+}
+
+DirectoryReader::~DirectoryReader()
+{
+	if( _dir )
+		closedir( _dir );
+}
+
+bool DirectoryReader::next( std::string& outFilename, EType& outType )
+{
+	for( const struct dirent* entry = readdir( _dir ); entry != NULL; entry = readdir( _dir ) )
+	{
+		countReadDirectory();
+		const char* name = entry->d_name;
+		if( name[0] == '.' && ( name[1] == '\0' || ( name[1] == '.' && name[2] == '\0' ) ) )
+			continue; // skip "." and ".."
+
+		outFilename.assign( name );
+#if defined( _DIRENT_HAVE_D_TYPE ) || defined( __MACOS__ )
+		if( getTypeFromDirentType( entry->d_type, outType ) )
+			return true;
+#endif
+		// the filesystem doesn't give the type, so we need a stat
+		outType = eTypeUndefined;
+		struct stat statInfos;
+		if( detail::lstat( ( _directory / outFilename ).c_str(), &statInfos ) == 0 )
+			outType = getTypeFromMode( statInfos.st_mode );
+		return true;
+	}
+	return false;
+}
+
+#else
+
+DirectoryReader::DirectoryReader( const bfs::path& directory )
+	: _directory( directory )
+	, _iterator( directory )
+{
+	countOpenDirectory();
+}
+
+DirectoryReader::~DirectoryReader()
+{
+}
+
+bool DirectoryReader::next( std::string& outFilename, EType& outType )
+{
+	static const bfs::directory_iterator itEnd;
+	if( _iterator == itEnd )
+		return false;
+
+	countReadDirectory();
+	outFilename = _iterator->path().filename().string();
+	boost::system::error_code errorCode;
+	countStat();
+	const bfs::file_status status = _iterator->symlink_status( errorCode );
+	if( bfs::is_symlink( status ) )
+		outType = eTypeLink;
+	else if( bfs::is_regular_file( status ) )
+		outType = eTypeFile;
+	else if( bfs::is_directory( status ) )
+		outType = eTypeFolder;
+	else
+		outType = eTypeUndefined;
+	++_iterator;
+	return true;
+}
+
+#endif
+
+}
+}
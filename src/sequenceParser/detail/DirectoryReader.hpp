@@ -0,0 +1,57 @@
+#ifndef _SEQUENCE_PARSER_DIRECTORY_READER_HPP_
+#define _SEQUENCE_PARSER_DIRECTORY_READER_HPP_
+
+#include <sequenceParser/common.hpp>
+#include <sequenceParser/system.hpp>
+
+#include <boost/filesystem/path.hpp>
+#include <boost/filesystem/operations.hpp>
+#include <boost/noncopyable.hpp>
+
+#ifdef __UNIX__
+#include <dirent.h>
+#endif
+
+#include <string>
+
+namespace sequenceParser {
+namespace detail {
+
+/**
+ * @brief Read the entries of a directory with their type.
+ * The type comes from the directory read itself when the filesystem
+ * provides it (d_type on UNIX), so there is no stat per entry.
+ * A single lstat is done only when the type is unknown.
+ */
+class DirectoryReader : boost::noncopyable
+{
+public:
+	/**
+	 * @throw boost::filesystem::filesystem_error if the directory can't be opened
+	 */
+	explicit DirectoryReader( const boost::filesystem::path& directory );
+	~DirectoryReader();
+
+	/**
+	 * @brief Read the next entry ("." and ".." are skipped).
+	 * @param[out] outFilename: filename of the entry
+	 * @param[out] outType: type of the entry (link, file, folder or undefined)
+	 * @return false if there is no more entry
+	 */
+	bool next( std::string& outFilename, EType& outType );
+
+	const boost::filesystem::path& getDirectory() const { return _directory; }
+
+private:
+	boost::filesystem::path _directory;
+#ifdef __UNIX__
+	DIR* _dir;
+#else
+	boost::filesystem::directory_iterator _iterator;
+#endif
+};
+
+}
+}
+
+#endif
@@ -1,19 +1,40 @@
 #include "FileNumbers.hpp"
 
+#include <boost/lexical_cast.hpp>
+
+#include <algorithm>
+
 namespace sequenceParser {
 namespace detail {
 
 
+std::string FileNumber::getString() const
+{
+	// absolute value, without overflow on the minimum value
+	const unsigned long long absValue = value < 0 ? ( 0ull - static_cast<unsigned long long>( value ) ) : static_cast<unsigned long long>( value );
+	const std::string digits = boost::lexical_cast<std::string>( absValue );
+	std::string s;
+	s.reserve( nbDigits + 1 );
+	if( sign )
+		s += sign;
+	s.append( nbDigits - std::min<std::size_t>( digits.size(), nbDigits ), '0' );
+	s += digits;
+	return s;
+}
+
+
 bool FileNumbers::SortByNumber::operator()( const FileNumbers& a, const FileNumbers& b ) const
 {
 	// can't have multiple size, if multiple size they must have a
 	// different SeqId
-	BOOST_ASSERT( a._numbers.size() == b._numbers.size() );
-	for( FileNumbers::Vec::const_iterator i = a._numbers.begin(), iEnd = a._numbers.end(), vi = b._numbers.begin(); i != iEnd; ++i, ++vi )
+	BOOST_ASSERT( a._size == b._size );
+	for( std::size_t i = 0; i < a._size; ++i )
 	{
-		if( i->first < vi->first )
+		const Time aValue = a._numbers[i].value;
+		const Time bValue = b._numbers[i].value;
+		if( aValue < bValue )
 			return true;
-		else if( i->first > vi->first )
+		else if( aValue > bValue )
 			return false;
 	}
 	return false; // equals
@@ -23,19 +44,19 @@ bool FileNumbers::SortByPadding::operator()( const FileNumbers& a, const FileNum
 {
 	// can't have multiple size, if multiple size they must have a
 	// different SeqId
-	BOOST_ASSERT( a._numbers.size() == b._numbers.size() );
-	for( FileNumbers::Vec::const_iterator i = a._numbers.begin(), iEnd = a._numbers.end(), vi = b._numbers.begin(); i != iEnd; ++i, ++vi )
+	BOOST_ASSERT( a._size == b._size );
+	for( std::size_t i = 0; i < a._size; ++i )
 	{
-		const std::size_t iPadding = extractPadding( i->second );
-		const std::size_t viPadding = extractPadding( vi->second );
-		if( iPadding < viPadding )
+		const FileNumber& aNumber = a._numbers[i];
+		const FileNumber& bNumber = b._numbers[i];
+		if( aNumber.fixedPadding < bNumber.fixedPadding )
 			return true;
-		else if( iPadding > viPadding )
+		else if( aNumber.fixedPadding > bNumber.fixedPadding )
 			return false;
 
-		if( i->first < vi->first )
+		if( aNumber.value < bNumber.value )
 			return true;
-		else if( i->first > vi->first )
+		else if( aNumber.value > bNumber.value )
 			return false;
 	}
 	return false; // equals
@@ -45,19 +66,19 @@ bool FileNumbers::SortByDigit::operator()( const FileNumbers& a, const FileNumbe
 {
 	// can't have multiple size, if multiple size they must have a
 	// different SeqId
-	BOOST_ASSERT( a._numbers.size() == b._numbers.size() );
-	for( FileNumbers::Vec::const_iterator i = a._numbers.begin(), iEnd = a._numbers.end(), vi = b._numbers.begin(); i != iEnd; ++i, ++vi )
+	BOOST_ASSERT( a._size == b._size );
+	for( std::size_t i = 0; i < a._size; ++i )
 	{
-		const std::size_t iMaxPadding = extractMaxPadding( i->second );
-		const std::size_t viMaxPadding = extractMaxPadding( vi->second );
-		if( iMaxPadding < viMaxPadding )
+		const FileNumber& aNumber = a._numbers[i];
+		const FileNumber& bNumber = b._numbers[i];
+		if( aNumber.nbDigits < bNumber.nbDigits )
 			return true;
-		else if( iMaxPadding > viMaxPadding )
+		else if( aNumber.nbDigits > bNumber.nbDigits )
 			return false;
 
-		if( i->first < vi->first )
+		if( aNumber.value < bNumber.value )
 			return true;
-		else if( i->first > vi->first )
+		else if( aNumber.value > bNumber.value )
 			return false;
 	}
 	return false; // equals
@@ -66,13 +87,25 @@ bool FileNumbers::SortByDigit::operator()( const FileNumbers& a, const FileNumbe
 std::ostream& operator<<(std::ostream& os, const FileNumbers& p)
 {
     os << "[";
-    BOOST_FOREACH( const FileNumbers::Vec::value_type & v, p._numbers )
+    for( std::size_t i = 0; i < p.size(); ++i )
 		{
-		    os << v.second << ",";
+		    os << p.getString( i ) << ",";
 		}
     os << "]";
     return os;
 }
 
+
+std::vector<FileNumbers> FileNumbersGroup::getFileNumbers() const
+{
+	std::vector<FileNumbers> views;
+	views.reserve( getNbFiles() );
+	for( std::size_t i = 0; i < _numbers.size(); i += _nbNumbersPerFile )
+	{
+		views.push_back( FileNumbers( &_numbers[i], _nbNumbersPerFile ) );
+	}
+	return views;
+}
+
 }
 }
@@ -3,102 +3,111 @@
 
 #include <sequenceParser/common.hpp>
 
-#include <boost/regex.hpp>
-#include <boost/unordered_map.hpp>
-#include <boost/lambda/lambda.hpp>
-#include <boost/foreach.hpp>
-#include <boost/lexical_cast.hpp>
+#include <boost/assert.hpp>
 
-#include <set>
+#include <vector>
+#include <string>
+#include <ostream>
 
 namespace sequenceParser {
 namespace detail {
 
+/**
+ * @brief A number inside a filename, without any memory allocation.
+ * The number as written in the filename (with its sign and padding)
+ * can be rebuilt from the value, the number of digits and the sign.
+ */
+struct FileNumber
+{
+	FileNumber()
+		: value( 0 )
+		, nbDigits( 0 )
+		, fixedPadding( 0 )
+		, sign( 0 )
+	{}
+
+	/**
+	 * @param[in] t the number value
+	 * @param[in] begin,end the number as written in the filename (with its sign and padding)
+	 */
+	FileNumber( const Time t, const char* begin, const char* end )
+		: value( t )
+		, sign( ( *begin == '-' || *begin == '+' ) ? *begin : 0 )
+	{
+		nbDigits = static_cast<unsigned char>( end - begin - ( sign != 0 ) );
+		// "0" has no padding, "00", "-0" and "0001" have a padding
+		fixedPadding = ( ( end - begin ) > 1 && begin[sign != 0] == '0' ) ? nbDigits : 0;
+	}
+
+	/// @return the number as written in the filename
+	std::string getString() const;
+
+	bool operator==( const FileNumber& other ) const
+	{
+		return value == other.value && nbDigits == other.nbDigits && sign == other.sign;
+	}
+	bool operator!=( const FileNumber& other ) const
+	{
+		return ! operator==( other );
+	}
+
+	Time value;
+	unsigned char nbDigits; ///< number of digits without the sign, it's the max padding
+	unsigned char fixedPadding; ///< number of digits if the number begins with 0, else 0
+	char sign; ///< '-', '+' or 0 if there is no sign
+};
+
 /**
  * @brief Numbers inside a filename.
  * Each number can be a time inside a sequence.
- * Internal structures to detect sequence inside a directory
+ * Internal structures to detect sequence inside a directory.
+ *
+ * It's a view on numbers stored in a FileNumbersGroup,
+ * so it's cheap to copy and to sort.
  */
 class FileNumbers
 {
 
 public:
 	typedef FileNumbers This;
-	typedef std::pair<Time, std::string> Pair;
-	typedef std::vector<Pair> Vec;
 
 public:
 
-	FileNumbers()
-	{
-		// we preverse reserve and take memory,
-		// that realloc and takes time.
-		_numbers.reserve( 10 );
-	}
+	FileNumbers( const FileNumber* numbers, const std::size_t size )
+		: _numbers( numbers )
+		, _size( size )
+	{}
 
 public:
 
-	void push_back( const std::string& s )
-	{
-		Time t;
-		try
-		{
-			t = boost::lexical_cast<Time > ( s );
-			_numbers.push_back( Pair( t, s ) );
-		}
-		catch( ... )
-		{
-			// can't retrieve the number,
-			// the number inside the string is probably
-			// ouf of range for Time type.
-			t = 0;
-		}
-	}
-
-	void clear()
+	const FileNumber& getNumber( const std::size_t i ) const
 	{
-		_numbers.clear();
+		return _numbers[i];
 	}
 
-	const std::string& getString( const std::size_t& i ) const
+	std::string getString( const std::size_t i ) const
 	{
-		return _numbers[i].second;
+		return _numbers[i].getString();
 	}
 
-	
-	static bool hasSign( const std::string& s ) { return ( ( s[0] == '-' ) || ( s[0] == '+' ) ); }
-	
-	static std::size_t extractPadding( const std::string& str )
+	std::size_t getMaxPadding( const std::size_t i ) const
 	{
-		if( str.size() == 1 )
-			return 0;
-		const bool withSign = hasSign(str);
-		return str[withSign] == '0' ? str.size()-withSign : 0;
+		return _numbers[i].nbDigits;
 	}
 	
-	static std::size_t extractMaxPadding( const std::string& s )
+	std::size_t getFixedPadding( const std::size_t i ) const
 	{
-		return s.size() - hasSign( s );
-	}
-	
-	std::size_t getMaxPadding( const std::size_t& i ) const
-	{
-		return extractMaxPadding( _numbers[i].second );
-	}
-	
-	std::size_t getFixedPadding( const std::size_t& i ) const
-	{
-		return extractPadding( _numbers[i].second );
+		return _numbers[i].fixedPadding;
 	}
 
-	Time getTime( const std::size_t& i ) const
+	Time getTime( const std::size_t i ) const
 	{
-		return _numbers[i].first;
+		return _numbers[i].value;
 	}
 
 	std::size_t size() const
 	{
-		return _numbers.size();
+		return _size;
 	}
 
 	struct SortByNumber
@@ -124,11 +133,8 @@ public:
 	{
 		for( std::size_t i = begin; i < end; ++i )
 		{
-			const Pair& me = this->_numbers[i];
-			const Pair& other = v._numbers[i];
-
-			//me.second.size() != other.second.size() ) // we don't check the padding...
-			if( me.first != other.first )
+			//we don't check the padding...
+			if( _numbers[i].value != v._numbers[i].value )
 				return false;
 		}
 		return true;
@@ -137,7 +143,48 @@ public:
 	friend std::ostream& operator<<( std::ostream& os, const This& p );
 
 private:
-	Vec _numbers;
+	const FileNumber* _numbers;
+	std::size_t _size;
+};
+
+/**
+ * @brief Numbers of all the filenames with the same string parts (so the same number of numbers).
+ * All the numbers are stored in a single flat buffer, without any allocation per filename.
+ */
+class FileNumbersGroup
+{
+public:
+	explicit FileNumbersGroup( const std::size_t nbNumbersPerFile )
+		: _nbNumbersPerFile( nbNumbersPerFile )
+	{}
+
+	/// @brief Add the numbers of a filename.
+	void push_back( const std::vector<FileNumber>& fileNumbers )
+	{
+		BOOST_ASSERT( fileNumbers.size() == _nbNumbersPerFile );
+		_numbers.insert( _numbers.end(), fileNumbers.begin(), fileNumbers.end() );
+	}
+
+	std::size_t getNbFiles() const
+	{
+		return _numbers.size() / _nbNumbersPerFile;
+	}
+
+	/// @return number of bytes allocated for the numbers
+	std::size_t getMemorySize() const
+	{
+		return _numbers.capacity() * sizeof( FileNumber );
+	}
+
+	/**
+	 * @return views on the numbers of each filename
+	 * @warning the views are invalidated by push_back
+	 */
+	std::vector<FileNumbers> getFileNumbers() const;
+
+private:
+	std::size_t _nbNumbersPerFile;
+	std::vector<FileNumber> _numbers;
 };
 
 }
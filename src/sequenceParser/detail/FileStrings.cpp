@@ -5,22 +5,21 @@
 namespace sequenceParser {
 namespace detail {
 
-std::size_t FileStrings::getHash() const
+void FileStrings::updateHash( const char* begin, const char* end )
 {
-	std::size_t seed = 0;
-
-	BOOST_FOREACH( const Vec::value_type & i, _id )
-	{
-		boost::hash_combine( seed, i );
-		boost::hash_combine( seed, 1 ); // not like the hash of the concatenation of _id
-	}
-	return seed;
+	boost::hash_range( _hash, begin, end );
+	// the fragments boundaries are part of the id:
+	// not like the hash of the concatenation of the fragments
+	boost::hash_combine( _hash, _buffer.size() );
 }
 
 std::ostream& operator<<( std::ostream& os, const FileStrings& p )
 {
 	os << "[";
-	std::for_each( p._id.begin(), p._id.end(), os << boost::lambda::_1 << "," );
+	for( std::size_t i = 0; i < p.size(); ++i )
+	{
+		os << p[i] << ",";
+	}
 	os << "]";
 	return os;
 }
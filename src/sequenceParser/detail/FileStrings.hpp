@@ -13,58 +13,86 @@ namespace detail {
 /**
  * @brief Unique identification for a sequence.
  * Internal structures to detect sequence inside a directory.
+ *
+ * All the string fragments are stored in a single buffer,
+ * so that clear() keeps the allocated memory and a FileStrings
+ * can be reused from one filename to the next without any allocation.
+ * The hash is updated when a fragment is added, so it is computed only once
+ * per filename, and the comparison of two different ids is usually decided by their hashes.
+ *
+ * @note The fragments are not interned in a shared pool: a key is copied only once
+ * per group of filenames (the FileStrings of the scanned filename is reused),
+ * whereas interning would add a lookup in the pool for each fragment of each filename.
  */
 class FileStrings
 {
 
 public:
 	typedef FileStrings This;
-	typedef std::vector<std::string> Vec;
+	typedef std::vector<std::size_t> Vec;
 
 public:
 
-	Vec& getId()
+	FileStrings()
+		: _hash( 0 )
 	{
-		return _id;
+		// we preverse reserve and take memory,
+		// that realloc and takes time.
+		_buffer.reserve( 64 );
+		_ends.reserve( 10 );
 	}
 
-	const Vec& getId() const
+public:
+
+	void push_back( const char* begin, const char* end )
+	{
+		_buffer.append( begin, end );
+		_ends.push_back( _buffer.size() );
+		updateHash( begin, end );
+	}
+
+	void push_back( const std::string& s )
 	{
-		return _id;
+		push_back( s.data(), s.data() + s.size() );
 	}
 
 	void clear()
 	{
-		_id.clear();
+		_buffer.clear();
+		_ends.clear();
+		_hash = 0;
+	}
+
+	std::size_t size() const
+	{
+		return _ends.size();
 	}
 
 	bool operator==( const This& v ) const
 	{
-		if( _id.size() != v._id.size() )
-		{
-			return false;
-		}
-		for( Vec::const_iterator i = _id.begin(), iEnd = _id.end(), vi = v._id.begin(); i != iEnd; ++i, ++vi )
-		{
-			if( *i != *vi )
-			{
-				return false;
-			}
-		}
-		return true;
+		return _hash == v._hash && _ends == v._ends && _buffer == v._buffer;
 	}
 
-	const std::string& operator[]( const std::size_t i ) const
+	std::string operator[]( const std::size_t i ) const
 	{
-		return _id[i];
+		const std::size_t begin = ( i == 0 ) ? 0 : _ends[i-1];
+		return _buffer.substr( begin, _ends[i] - begin );
 	}
 
-	std::size_t getHash() const;
+	std::size_t getHash() const
+	{
+		return _hash;
+	}
 
 	friend std::ostream& operator<<( std::ostream& os, const This& p );
 
 private:
-	Vec _id;
+	void updateHash( const char* begin, const char* end );
+
+private:
+	std::string _buffer; ///< all string fragments concatenated
+	Vec _ends; ///< end position of each fragment inside _buffer
+	std::size_t _hash; ///< hash of the fragments
 };
 
 // NOTE How we can replace this with a wrapper?
@@ -0,0 +1,367 @@
+#include "FilenameFilters.hpp"
+
+#include <boost/make_shared.hpp>
+#include <boost/lexical_cast.hpp>
+#include <boost/thread/mutex.hpp>
+#include <boost/foreach.hpp>
+
+#include <algorithm>
+#include <cstring>
+
+
+namespace sequenceParser {
+namespace detail {
+
+namespace {
+
+/// Characters with a meaning in a regex, which are not wildcards of the filters
+const char* const regexSyntax = "\\^$|+()[]{}";
+
+/// Max number of compiled filters in the cache
+const std::size_t filtersCacheSize = 64;
+
+inline bool isDigit( const char c )
+{
+	return c >= '0' && c <= '9';
+}
+
+inline bool isSign( const char c )
+{
+	return c == '-' || c == '+';
+}
+
+}
+
+std::string expandPrintfPattern( const std::string& filter )
+{
+	// the width comes from the last pattern with 2 digits, like: %04d
+	int patternWidth = -1;
+	for( std::size_t pos = filter.find( '%' ); pos != std::string::npos; pos = filter.find( '%', pos + 1 ) )
+	{
+		if( pos + 3 < filter.size() && isDigit( filter[pos+1] ) && isDigit( filter[pos+2] ) && filter[pos+3] == 'd' )
+			patternWidth = ( filter[pos+1] - '0' ) * 10 + ( filter[pos+2] - '0' );
+	}
+	if( patternWidth < 0 )
+		return filter;
+
+	// replace all the patterns with 1 or 2 digits
+	std::string expanded;
+	expanded.reserve( filter.size() + patternWidth );
+	for( std::size_t i = 0; i < filter.size(); ++i )
+	{
+		if( filter[i] == '%' && i + 2 < filter.size() && isDigit( filter[i+1] ) )
+		{
+			const std::size_t nbDigits = isDigit( filter[i+2] ) ? 2 : 1;
+			if( i + nbDigits + 1 < filter.size() && filter[i+nbDigits+1] == 'd' )
+			{
+				expanded.append( patternWidth, '#' );
+				i += nbDigits + 1;
+				continue;
+			}
+		}
+		expanded += filter[i];
+	}
+	return expanded;
+}
+
+std::string convertFilterToRegexString( const std::string& filter, const EDetection detectOptions )
+{
+	const std::string expanded = expandPrintfPattern( filter );
+	const char* const sign = ( detectOptions & eDetectionNegative ) ? "[\\-\\+]?" : "";
+
+	std::string regex;
+	regex.reserve( expanded.size() * 2 );
+	for( std::size_t i = 0; i < expanded.size(); ++i )
+	{
+		const char c = expanded[i];
+		// an escaped character keeps its regex meaning, like \. or \d
+		if( c == '\\' && i + 1 < expanded.size() )
+		{
+			regex += c;
+			regex += expanded[++i];
+			continue;
+		}
+		// for detect sequence based on a single file
+		if( ( detectOptions & eDetectionSequenceFromFilename ) && isDigit( c ) )
+		{
+			regex += "[0-9]";
+			continue;
+		}
+		switch( c )
+		{
+			case '*':
+				regex += "(.*)";
+				break;
+			case '?':
+				regex += "(.)";
+				break;
+			case '@':
+				// one @ correspond to one or more digits
+				regex += sign;
+				regex += "[0-9]+";
+				break;
+			case '#':
+				// each # in pattern correspond to a digit
+				regex += sign;
+				regex += "[0-9]";
+				break;
+			case '.':
+				regex += "\\.";
+				break;
+			default:
+				regex += c;
+		}
+	}
+	return regex;
+}
+
+FilenameFilters::FilenameFilters( const std::vector<std::string>& filters, const EDetection detectOptions )
+	: _empty( filters.empty() )
+{
+	Tokens tokens;
+	BOOST_FOREACH( const std::string& filter, filters )
+	{
+		if( tokenize( filter, detectOptions, tokens ) )
+			addTokens( tokens );
+		else
+			_regexFilters.push_back( boost::regex( convertFilterToRegexString( filter, detectOptions ) ) );
+	}
+	std::sort( _suffixSizes.begin(), _suffixSizes.end() );
+	_suffixSizes.erase( std::unique( _suffixSizes.begin(), _suffixSizes.end() ), _suffixSizes.end() );
+}
+
+bool FilenameFilters::tokenize( const std::string& filter, const EDetection detectOptions, Tokens& outTokens )
+{
+	outTokens.clear();
+	const std::string expanded = expandPrintfPattern( filter );
+	BOOST_FOREACH( const char c, expanded )
+	{
+		if( c != '\0' && std::strchr( regexSyntax, c ) )
+			return false;
+
+		Token token;
+		token.kind = Token::eKindLiteral;
+		token.character = c;
+		token.acceptSign = false;
+		if( ( detectOptions & eDetectionSequenceFromFilename ) && isDigit( c ) )
+		{
+			token.kind = Token::eKindDigit;
+		}
+		else
+		{
+			switch( c )
+			{
+				case '*':
+					token.kind = Token::eKindAnyString;
+					break;
+				case '?':
+					token.kind = Token::eKindAnyChar;
+					break;
+				case '@':
+					token.kind = Token::eKindDigits;
+					token.acceptSign = ( detectOptions & eDetectionNegative );
+					break;
+				case '#':
+					token.kind = Token::eKindDigit;
+					token.acceptSign = ( detectOptions & eDetectionNegative );
+					break;
+			}
+		}
+		outTokens.push_back( token );
+	}
+	return true;
+}
+
+void FilenameFilters::addTokens( const Tokens& tokens )
+{
+	std::size_t nbAnyString = 0;
+	std::size_t nbOtherWildcards = 0;
+	std::size_t anyStringIndex = 0;
+	std::string literals;
+	for( std::size_t i = 0; i < tokens.size(); ++i )
+	{
+		switch( tokens[i].kind )
+		{
+			case Token::eKindLiteral:
+				literals += tokens[i].character;
+				break;
+			case Token::eKindAnyString:
+				++nbAnyString;
+				anyStringIndex = literals.size();
+				break;
+			default:
+				++nbOtherWildcards;
+		}
+	}
+
+	if( nbOtherWildcards == 0 && nbAnyString == 0 )
+	{
+		_filenames.insert( literals );
+	}
+	else if( nbOtherWildcards == 0 && nbAnyString == 1 )
+	{
+		const std::string suffix = literals.substr( anyStringIndex );
+		_prefixesBySuffix[suffix].push_back( literals.substr( 0, anyStringIndex ) );
+		_suffixSizes.push_back( suffix.size() );
+	}
+	else
+	{
+		_wildcardFilters.push_back( tokens );
+	}
+}
+
+bool FilenameFilters::match( const std::string& filename ) const
+{
+	// If there is no filter, it means that it respects filters...
+	if( _empty )
+		return true;
+
+	// no hash of the filename if there is no filter without wildcard
+	if( ! _filenames.empty() && _filenames.find( filename ) != _filenames.end() )
+		return true;
+
+	BOOST_FOREACH( const std::size_t suffixSize, _suffixSizes )
+	{
+		if( suffixSize > filename.size() )
+			break;
+		const std::size_t suffixBegin = filename.size() - suffixSize;
+		const boost::unordered_map<std::string, std::vector<std::string> >::const_iterator it =
+			_prefixesBySuffix.find( filename.substr( suffixBegin ) );
+		if( it == _prefixesBySuffix.end() )
+			continue;
+		BOOST_FOREACH( const std::string& prefix, it->second )
+		{
+			if( prefix.size() <= suffixBegin && filename.compare( 0, prefix.size(), prefix ) == 0 )
+				return true;
+		}
+	}
+
+	const char* const str = filename.c_str();
+	BOOST_FOREACH( const Tokens& tokens, _wildcardFilters )
+	{
+		if( matchTokens( &tokens[0], &tokens[0] + tokens.size(), str, str + filename.size() ) )
+			return true;
+	}
+
+	BOOST_FOREACH( const boost::regex& filter, _regexFilters )
+	{
+		if( boost::regex_match( filename, filter ) )
+			return true;
+	}
+	return false;
+}
+
+bool FilenameFilters::matchTokens( const Token* token, const Token* tokenEnd, const char* str, const char* strEnd )
+{
+	for( ; token != tokenEnd; ++token )
+	{
+		switch( token->kind )
+		{
+			case Token::eKindLiteral:
+				if( str == strEnd || *str != token->character )
+					return false;
+				++str;
+				break;
+			case Token::eKindAnyChar:
+				if( str == strEnd )
+					return false;
+				++str;
+				break;
+			case Token::eKindAnyString:
+				// try the longest string first, like the regex
+				for( const char* end = strEnd; end > str; --end )
+				{
+					if( matchTokens( token + 1, tokenEnd, end, strEnd ) )
+						return true;
+				}
+				return matchTokens( token + 1, tokenEnd, str, strEnd );
+			case Token::eKindDigit:
+			case Token::eKindDigits:
+				if( token->acceptSign && str != strEnd && isSign( *str ) &&
+					matchDigits( token, tokenEnd, str + 1, strEnd ) )
+					return true;
+				return matchDigits( token, tokenEnd, str, strEnd );
+		}
+	}
+	return str == strEnd;
+}
+
+bool FilenameFilters::matchDigits( const Token* token, const Token* tokenEnd, const char* str, const char* strEnd )
+{
+	const char* digitsEnd = str;
+	while( digitsEnd != strEnd && isDigit( *digitsEnd ) )
+		++digitsEnd;
+	if( digitsEnd == str )
+		return false;
+	if( token->kind == Token::eKindDigit )
+		return matchTokens( token + 1, tokenEnd, str + 1, strEnd );
+
+	for( ; digitsEnd > str; --digitsEnd )
+	{
+		if( matchTokens( token + 1, tokenEnd, digitsEnd, strEnd ) )
+			return true;
+	}
+	return false;
+}
+
+namespace {
+
+typedef boost::unordered_map<std::string, boost::shared_ptr<const FilenameFilters> > FiltersCache;
+
+boost::mutex filtersCacheMutex;
+FiltersCache filtersCache;
+
+}
+
+boost::shared_ptr<const FilenameFilters> getFilenameFilters( const std::vector<std::string>& filters, const EDetection detectOptions )
+{
+	std::string key = boost::lexical_cast<std::string>( static_cast<int>( detectOptions ) );
+	BOOST_FOREACH( const std::string& filter, filters )
+	{
+		key += '\0';
+		key += filter;
+	}
+
+	{
+		boost::mutex::scoped_lock lock( filtersCacheMutex );
+		const FiltersCache::const_iterator it = filtersCache.find( key );
+		if( it != filtersCache.end() )
+			return it->second;
+	}
+
+	// compile the filters without locking the cache
+	const boost::shared_ptr<const FilenameFilters> compiled = boost::make_shared<FilenameFilters>( filters, detectOptions );
+
+	boost::mutex::scoped_lock lock( filtersCacheMutex );
+	if( filtersCache.size() >= filtersCacheSize )
+		filtersCache.clear();
+	filtersCache[key] = compiled;
+	return compiled;
+}
+
+bool entryRespectsAllFilters(
+		const std::string& entryFilename,
+		const boost::filesystem::path& entryPath,
+		const FilenameFilters& filters,
+		const std::string& filename,
+		const EDetection detectOptions )
+{
+	if( entryFilename.empty() )
+		return false; // no sense...
+
+	// hidden files
+	if( ( detectOptions & eDetectionIgnoreDotFile ) && ( entryFilename[0] == '.' ) )
+		return false;
+
+	// filtering of entries with filters strings
+	if( ! filters.match( entryFilename ) )
+		return false;
+
+	if( filename.empty() )
+		return true;
+
+	return filename == entryPath.string();
+}
+
+}
+}
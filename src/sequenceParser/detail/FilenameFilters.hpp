@@ -0,0 +1,111 @@
+#ifndef _SEQUENCE_PARSER_FILENAME_FILTERS_HPP_
+#define _SEQUENCE_PARSER_FILENAME_FILTERS_HPP_
+
+#include <sequenceParser/common.hpp>
+
+#include <boost/filesystem/path.hpp>
+#include <boost/regex.hpp>
+#include <boost/shared_ptr.hpp>
+#include <boost/unordered_map.hpp>
+#include <boost/unordered_set.hpp>
+
+#include <vector>
+#include <string>
+
+namespace sequenceParser {
+namespace detail {
+
+/**
+ * @brief Replace the printf patterns of a user filter ("%04d") by the same number of '#'.
+ */
+std::string expandPrintfPattern( const std::string& filter );
+
+/**
+ * @brief Convert a user filter into a regex string, in a single pass.
+ * '*', '?', '#' and '@' are the wildcards, '.' is a dot.
+ * The other characters are kept as they are, so a filter can use the regex syntax,
+ * and an escaped character keeps its regex meaning (\. is a dot, \d a digit).
+ */
+std::string convertFilterToRegexString( const std::string& filter, const EDetection detectOptions );
+
+/**
+ * @brief Compiled user filters, to check a lot of filenames.
+ * The simple filters (without any regex syntax) are checked without any regex:
+ * - the filters without wildcard ("foo.0001.exr") in a set of filenames,
+ * - the filters like "prefix*suffix" ("*.exr", "foo*") in an index of suffixes,
+ * - the filters with '?', '#' or '@' ("foo.####.dpx") with a small wildcard matcher.
+ * Only the other filters are checked with a regex.
+ */
+class FilenameFilters
+{
+public:
+	FilenameFilters( const std::vector<std::string>& filters, const EDetection detectOptions );
+
+	/**
+	 * @return true if the filename respects one of the filters (or if there is no filter)
+	 */
+	bool match( const std::string& filename ) const;
+
+	std::size_t getNbRegexFilters() const { return _regexFilters.size(); }
+
+private:
+	struct Token
+	{
+		enum EKind
+		{
+			eKindLiteral = 0, ///< the character
+			eKindAnyChar, ///< '?'
+			eKindAnyString, ///< '*'
+			eKindDigit, ///< '#'
+			eKindDigits ///< '@'
+		};
+		EKind kind;
+		char character; ///< only for eKindLiteral
+		bool acceptSign; ///< only for eKindDigit and eKindDigits: a '-' or '+' can be before the digits
+	};
+	typedef std::vector<Token> Tokens;
+
+	/// @return false if the filter needs a regex
+	static bool tokenize( const std::string& filter, const EDetection detectOptions, Tokens& outTokens );
+
+	void addTokens( const Tokens& tokens );
+
+	static bool matchTokens( const Token* token, const Token* tokenEnd, const char* str, const char* strEnd );
+	static bool matchDigits( const Token* token, const Token* tokenEnd, const char* str, const char* strEnd );
+
+private:
+	bool _empty;
+	/// filters without wildcard
+	boost::unordered_set<std::string> _filenames;
+	/// prefixes of the "prefix*suffix" filters, by suffix
+	boost::unordered_map<std::string, std::vector<std::string> > _prefixesBySuffix;
+	/// all the sizes of the suffixes of _prefixesBySuffix
+	std::vector<std::size_t> _suffixSizes;
+	/// filters with other wildcards
+	std::vector<Tokens> _wildcardFilters;
+	/// filters with a regex syntax
+	std::vector<boost::regex> _regexFilters;
+};
+
+/**
+ * @brief Get compiled filters, from a cache shared by all the browses.
+ * The same filters are compiled only once, for all the directories and all the browses.
+ */
+boost::shared_ptr<const FilenameFilters> getFilenameFilters( const std::vector<std::string>& filters, const EDetection detectOptions );
+
+/**
+ * @brief Check if an entry of a directory respects the filters of a browse.
+ * @param[in] filename: the entry has to be this file (if not empty)
+ * @see filepathRespectsAllFilters
+ */
+bool entryRespectsAllFilters(
+		const std::string& entryFilename,
+		const boost::filesystem::path& entryPath,
+		const FilenameFilters& filters,
+		const std::string& filename,
+		const EDetection detectOptions );
+
+}
+}
+
+#endif
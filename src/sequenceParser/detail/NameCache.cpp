@@ -0,0 +1,202 @@
+#include "NameCache.hpp"
+
+#include <sequenceParser/ItemStat.hpp>
+
+#include <boost/atomic.hpp>
+#include <boost/lexical_cast.hpp>
+
+#ifdef __UNIX__
+#include <unistd.h>
+#include <pwd.h>
+#include <grp.h>
+#include <cerrno>
+#include <vector>
+#endif
+
+
+namespace sequenceParser {
+namespace detail {
+
+NameCache::NameCache( const Resolver& resolver, const std::size_t maxSize, const std::time_t timeToLive )
+	: _resolver( resolver )
+	, _maxSize( maxSize )
+	, _timeToLive( timeToLive )
+{}
+
+bool NameCache::getName( const long long id, std::string& outName )
+{
+	const std::time_t now = std::time( NULL );
+	{
+		boost::mutex::scoped_lock lock( _mutex );
+		const EntryMap::const_iterator it = _entries.find( id );
+		if( it != _entries.end() && it->second.expiration > now )
+		{
+			outName = it->second.name;
+			return it->second.found;
+		}
+	}
+
+	// resolve the name without locking the cache, it can be a network request
+	Entry entry;
+	entry.found = _resolver( id, entry.name );
+
+	boost::mutex::scoped_lock lock( _mutex );
+	entry.expiration = now + _timeToLive;
+	if( _entries.size() >= _maxSize && _entries.find( id ) == _entries.end() )
+	{
+		// the cache is full: remove the expired names, or all the names
+		for( EntryMap::iterator it = _entries.begin(); it != _entries.end(); )
+		{
+			if( it->second.expiration <= now )
+				it = _entries.erase( it );
+			else
+				++it;
+		}
+		if( _entries.size() >= _maxSize )
+			_entries.clear();
+	}
+	if( _maxSize > 0 && _timeToLive > 0 )
+		_entries[id] = entry;
+
+	outName = entry.name;
+	return entry.found;
+}
+
+void NameCache::clear()
+{
+	boost::mutex::scoped_lock lock( _mutex );
+	_entries.clear();
+}
+
+void NameCache::setOptions( const std::size_t maxSize, const std::time_t timeToLive )
+{
+	boost::mutex::scoped_lock lock( _mutex );
+	_maxSize = maxSize;
+	_timeToLive = timeToLive;
+	_entries.clear();
+}
+
+#ifdef __UNIX__
+
+namespace {
+
+const std::size_t defaultCacheSize = 1024;
+const std::time_t defaultTimeToLive = 300;
+
+boost::atomic<bool> resolveNames( true );
+
+std::size_t getBufferSize( const int name )
+{
+	const long size = sysconf( name );
+	return size > 0 ? size : 16384;
+}
+
+bool resolveUserName( const long long userId, std::string& outName )
+{
+	std::vector<char> buffer( getBufferSize( _SC_GETPW_R_SIZE_MAX ) );
+	passwd user;
+	passwd* result = NULL;
+	int error;
+	while( ( error = getpwuid_r( userId, &user, &buffer[0], buffer.size(), &result ) ) == ERANGE )
+		buffer.resize( buffer.size() * 2 );
+	if( error || ! result || ! result->pw_name )
+		return false;
+	outName = result->pw_name;
+	return true;
+}
+
+bool resolveGroupName( const long long groupId, std::string& outName )
+{
+	std::vector<char> buffer( getBufferSize( _SC_GETGR_R_SIZE_MAX ) );
+	group grp;
+	group* result = NULL;
+	int error;
+	while( ( error = getgrgid_r( groupId, &grp, &buffer[0], buffer.size(), &result ) ) == ERANGE )
+		buffer.resize( buffer.size() * 2 );
+	if( error || ! result || ! result->gr_name )
+		return false;
+	outName = result->gr_name;
+	return true;
+}
+
+NameCache& getUserNameCache()
+{
+	static NameCache cache( resolveUserName, defaultCacheSize, defaultTimeToLive );
+	return cache;
+}
+
+NameCache& getGroupNameCache()
+{
+	static NameCache cache( resolveGroupName, defaultCacheSize, defaultTimeToLive );
+	return cache;
+}
+
+// create the caches before any thread could use them
+struct CachesInitializer
+{
+	CachesInitializer()
+	{
+		getUserNameCache();
+		getGroupNameCache();
+	}
+} cachesInitializer;
+
+}
+
+bool getUserName( const long long userId, std::string& outName )
+{
+	if( ! resolveNames )
+	{
+		outName = boost::lexical_cast<std::string>( userId );
+		return true;
+	}
+	return getUserNameCache().getName( userId, outName );
+}
+
+bool getGroupName( const long long groupId, std::string& outName )
+{
+	if( ! resolveNames )
+	{
+		outName = boost::lexical_cast<std::string>( groupId );
+		return true;
+	}
+	return getGroupNameCache().getName( groupId, outName );
+}
+
+#endif
+
+}
+
+void setNameCacheOptions( const std::size_t maxSize, const std::size_t timeToLive )
+{
+#ifdef __UNIX__
+	detail::getUserNameCache().setOptions( maxSize, timeToLive );
+	detail::getGroupNameCache().setOptions( maxSize, timeToLive );
+#endif
+}
+
+void clearNameCache()
+{
+#ifdef __UNIX__
+	detail::getUserNameCache().clear();
+	detail::getGroupNameCache().clear();
+#endif
+}
+
+void setResolveNames( const bool resolve )
+{
+#ifdef __UNIX__
+	detail::resolveNames = resolve;
+#endif
+}
+
+bool getResolveNames()
+{
+#ifdef __UNIX__
+	return detail::resolveNames;
+#else
+	return false;
+#endif
+}
+
+}
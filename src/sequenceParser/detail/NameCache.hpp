@@ -0,0 +1,75 @@
+#ifndef _SEQUENCE_PARSER_NAME_CACHE_HPP_
+#define _SEQUENCE_PARSER_NAME_CACHE_HPP_
+
+#include <boost/function.hpp>
+#include <boost/noncopyable.hpp>
+#include <boost/thread/mutex.hpp>
+#include <boost/unordered_map.hpp>
+
+#include <ctime>
+#include <string>
+
+namespace sequenceParser {
+namespace detail {
+
+/**
+ * @brief Thread-safe cache of names from numeric ids (user or group names).
+ * The cache is bounded, and each name is resolved again after a time to live.
+ */
+class NameCache : boost::noncopyable
+{
+public:
+	/**
+	 * @brief Get the name of an id from the system.
+	 * @return false if there is no name for this id
+	 */
+	typedef boost::function<bool( const long long id, std::string& outName )> Resolver;
+
+public:
+	/**
+	 * @param[in] resolver: function to get the name from the system
+	 * @param[in] maxSize: max number of names in the cache
+	 * @param[in] timeToLive: number of seconds before resolving a name again
+	 */
+	NameCache( const Resolver& resolver, const std::size_t maxSize, const std::time_t timeToLive );
+
+	/**
+	 * @brief Get the name of an id, from the cache or from the system.
+	 * @return false if there is no name for this id
+	 */
+	bool getName( const long long id, std::string& outName );
+
+	void clear();
+
+	void setOptions( const std::size_t maxSize, const std::time_t timeToLive );
+
+private:
+	struct Entry
+	{
+		bool found;
+		std::string name;
+		std::time_t expiration;
+	};
+	typedef boost::unordered_map<long long, Entry> EntryMap;
+
+	const Resolver _resolver;
+	boost::mutex _mutex;
+	std::size_t _maxSize;
+	std::time_t _timeToLive;
+	EntryMap _entries;
+};
+
+#ifdef __UNIX__
+/**
+ * @brief Get the name of a user or of a group, with a cache shared by the whole process.
+ * @return false if there is no name for this id
+ * @see setNameCacheOptions
+ */
+bool getUserName( const long long userId, std::string& outName );
+bool getGroupName( const long long groupId, std::string& outName );
+#endif
+
+}
+}
+
+#endif
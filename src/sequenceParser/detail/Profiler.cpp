@@ -0,0 +1,110 @@
+#include "Profiler.hpp"
+
+#include <sequenceParser/system.hpp>
+
+#include <boost/thread/mutex.hpp>
+#include <boost/date_time/posix_time/posix_time_types.hpp>
+
+#include <exception>
+
+#ifdef __UNIX__
+#include <time.h>
+#endif
+
+
+namespace sequenceParser {
+
+namespace {
+
+boost::mutex callbackMutex;
+PerformanceReportCallback reportCallback = NULL;
+void* reportCallbackUserData = NULL;
+
+/// @return the number of exceptions being thrown in the current thread (std::uncaught_exception is deprecated since C++17)
+int getNbUncaughtExceptions()
+{
+#if __cplusplus >= 201703L
+	return std::uncaught_exceptions();
+#else
+	return std::uncaught_exception() ? 1 : 0;
+#endif
+}
+
+}
+
+void setPerformanceReportCallback( PerformanceReportCallback callback, void* userData )
+{
+	boost::mutex::scoped_lock lock( callbackMutex );
+	reportCallback = callback;
+	reportCallbackUserData = userData;
+}
+
+namespace detail {
+
+double getMonotonicTime()
+{
+#if defined( __UNIX__ ) && defined( CLOCK_MONOTONIC )
+	struct timespec now;
+	clock_gettime( CLOCK_MONOTONIC, &now );
+	return now.tv_sec + now.tv_nsec * 1e-9;
+#else
+	static const boost::posix_time::ptime epoch( boost::gregorian::date( 1970, 1, 1 ) );
+	return ( boost::posix_time::microsec_clock::universal_time() - epoch ).total_microseconds() * 1e-6;
+#endif
+}
+
+void mergePerformanceReports( PerformanceReport& report, const PerformanceReport& other )
+{
+	report.readDirectoryTime += other.readDirectoryTime;
+	report.filterTime += other.filterTime;
+	report.decomposeTime += other.decomposeTime;
+	report.buildSequencesTime += other.buildSequencesTime;
+	report.splitSequencesTime += other.splitSequencesTime;
+	report.statTime += other.statTime;
+	report.nbDirectories += other.nbDirectories;
+	report.nbEntries += other.nbEntries;
+	report.nbFilteredEntries += other.nbFilteredEntries;
+	report.nbSequenceGroups += other.nbSequenceGroups;
+	report.nbSequences += other.nbSequences;
+	report.nbItems += other.nbItems;
+	report.groupedNumbersBytes += other.groupedNumbersBytes;
+}
+
+OperationProfiler::OperationProfiler( const char* operation, const std::string& path, PerformanceReport* outReport )
+	: _outReport( outReport )
+	, _startTime( 0 )
+	, _nbUncaughtExceptions( getNbUncaughtExceptions() )
+{
+	{
+		boost::mutex::scoped_lock lock( callbackMutex );
+		_callback = reportCallback;
+		_userData = reportCallbackUserData;
+	}
+	_enabled = _outReport || _callback;
+	if( ! _enabled )
+		return;
+	_report.operation = operation;
+	_report.path = path;
+	_startCounters = getFilesystemCounters();
+	_startTime = getMonotonicTime();
+}
+
+OperationProfiler::~OperationProfiler()
+{
+	// the operation ends with an exception
+	if( ! _enabled || getNbUncaughtExceptions() > _nbUncaughtExceptions )
+		return;
+	_report.totalTime = getMonotonicTime() - _startTime;
+	const FilesystemCounters counters = getFilesystemCounters();
+	_report.nbStat = counters.nbStat - _startCounters.nbStat;
+	_report.nbOpenDirectory = counters.nbOpenDirectory - _startCounters.nbOpenDirectory;
+	_report.nbReadDirectory = counters.nbReadDirectory - _startCounters.nbReadDirectory;
+
+	if( _outReport )
+		*_outReport = _report;
+	if( _callback )
+		_callback( _report, _userData );
+}
+
+}
+}
@@ -0,0 +1,82 @@
+#ifndef _SEQUENCE_PARSER_DETAIL_PROFILER_HPP_
+#define _SEQUENCE_PARSER_DETAIL_PROFILER_HPP_
+
+#include <sequenceParser/PerformanceReport.hpp>
+#include <sequenceParser/filesystem.hpp>
+
+#include <boost/noncopyable.hpp>
+
+#include <string>
+
+namespace sequenceParser {
+namespace detail {
+
+/**
+ * @return a monotonic time, in seconds
+ */
+double getMonotonicTime();
+
+/**
+ * @brief Add the times and the counts of a report to an other one (not the operation, the path and the filesystem counters).
+ */
+void mergePerformanceReports( PerformanceReport& report, const PerformanceReport& other );
+
+/**
+ * @brief Measure an operation, if a report is asked by the caller or by the registered callback.
+ * At the end of the operation (destruction), the total time and the filesystem counters are set,
+ * the report is copied to the caller, and given to the callback.
+ * If the operation ends with an exception, nothing is reported.
+ */
+class OperationProfiler : boost::noncopyable
+{
+public:
+	/**
+	 * @param[in] operation: name of the operation
+	 * @param[in] path: browsed path
+	 * @param[out] outReport: report asked by the caller, can be NULL
+	 */
+	OperationProfiler( const char* operation, const std::string& path, PerformanceReport* outReport );
+	~OperationProfiler();
+
+	/// @return the report to fill during the operation, NULL if no report is asked (then nothing has to be measured)
+	PerformanceReport* getReport() { return _enabled ? &_report : NULL; }
+
+private:
+	PerformanceReport* _outReport;
+	PerformanceReportCallback _callback;
+	void* _userData;
+	bool _enabled;
+	PerformanceReport _report;
+	double _startTime;
+	FilesystemCounters _startCounters;
+	int _nbUncaughtExceptions; ///< exceptions already being thrown at the beginning of the operation
+};
+
+/**
+ * @brief Add the time of a scope to a phase of a report, if the report is not NULL.
+ */
+class PhaseTimer : boost::noncopyable
+{
+public:
+	PhaseTimer( PerformanceReport* report, double PerformanceReport::* phase )
+		: _report( report )
+		, _phase( phase )
+		, _startTime( report ? getMonotonicTime() : 0 )
+	{}
+
+	~PhaseTimer()
+	{
+		if( _report )
+			_report->*_phase += getMonotonicTime() - _startTime;
+	}
+
+private:
+	PerformanceReport* _report;
+	double PerformanceReport::* _phase;
+	double _startTime;
+};
+
+}
+}
+
+#endif
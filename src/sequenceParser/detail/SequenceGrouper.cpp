@@ -0,0 +1,101 @@
+#include "SequenceGrouper.hpp"
+#include "analyze.hpp"
+
+#include <boost/foreach.hpp>
+
+
+namespace sequenceParser {
+namespace detail {
+
+SequenceGrouper::SequenceGrouper( const EDetection detectOptions )
+	: _detectOptions( detectOptions )
+{
+	// we preverse reserve and take memory,
+	// that realloc and takes time.
+	_tmpNumberParts.reserve( 10 );
+}
+
+bool SequenceGrouper::add( const std::string& filename )
+{
+	// clear previous infos
+	_tmpStringParts.clear();
+	_tmpNumberParts.clear(); // (clear but don't realloc the vector inside)
+
+	// if no number detected
+	if( ! decomposeFilename( filename, _tmpStringParts, _tmpNumberParts, _detectOptions ) )
+		return false;
+
+	// the hash of the string parts is already computed, so the lookup doesn't hash the filename again
+	SeqIdMap::iterator it( _sequences.find( _tmpStringParts ) );
+	if( it == _sequences.end() )
+	{
+		// create an empty entry in the map, the numbers are added directly inside
+		it = _sequences.insert( SeqIdMap::value_type( _tmpStringParts, FileNumbersGroup( _tmpNumberParts.size() ) ) ).first;
+	}
+	// append the numbers
+	it->second.push_back( _tmpNumberParts );
+	return true;
+}
+
+std::size_t SequenceGrouper::getMemorySize() const
+{
+	std::size_t memorySize = 0;
+	BOOST_FOREACH( const SeqIdMap::value_type& p, _sequences )
+	{
+		memorySize += p.second.getMemorySize();
+	}
+	return memorySize;
+}
+
+std::vector<Sequence> SequenceGrouper::buildSequences()
+{
+	std::vector<Sequence> output;
+	BOOST_FOREACH( SeqIdMap::value_type & p, _sequences )
+	{
+		std::vector<FileNumbers> numberParts = p.second.getFileNumbers();
+		const std::vector<Sequence> ss = sequenceParser::buildSequences( p.first, numberParts, _detectOptions );
+		output.insert( output.end(), ss.begin(), ss.end() );
+	}
+	_sequences.clear();
+	return output;
+}
+
+namespace {
+
+bool isConsideredAsSingleFile( const Sequence& s, const EDetection detectOptions )
+{
+	return (detectOptions & eDetectionSequenceNeedAtLeastTwoFiles) && (s.getNbFiles() == 1);
+}
+
+}
+
+void splitSequence( const Sequence& s, const EDetection detectOptions, std::vector<Sequence>& outSequences, std::vector<std::string>& outFilenames )
+{
+	// if it's a sequence of 1 file, it could be considered as a sequence or as a single file
+	if( isConsideredAsSingleFile( s, detectOptions ) )
+	{
+		outFilenames.push_back( s.getFirstFilename() );
+		return;
+	}
+	// if it's a sequence with holes, it could be split in several sequences depending on the detect options
+	if( (detectOptions & eDetectionSequenceWithoutHoles) && (s.getFrameRanges().size() > 1) )
+	{
+		BOOST_FOREACH( const FrameRange& f, s.getFrameRanges() )
+		{
+			const Sequence sequenceWithoutHoles( s.getPrefix(), s.getFixedPadding(), s.getMaxPadding(), s.getSuffix(), f.first, f.last, f.step );
+			if( isConsideredAsSingleFile( sequenceWithoutHoles, detectOptions ) )
+			{
+				outFilenames.push_back( sequenceWithoutHoles.getFirstFilename() );
+			}
+			else
+			{
+				outSequences.push_back( sequenceWithoutHoles );
+			}
+		}
+		return;
+	}
+	outSequences.push_back( s );
+}
+
+}
+}
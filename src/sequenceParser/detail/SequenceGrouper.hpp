@@ -0,0 +1,71 @@
+#ifndef _SEQUENCE_PARSER_SEQUENCE_GROUPER_HPP_
+#define _SEQUENCE_PARSER_SEQUENCE_GROUPER_HPP_
+
+#include "FileNumbers.hpp"
+#include "FileStrings.hpp"
+
+#include <sequenceParser/common.hpp>
+#include <sequenceParser/Sequence.hpp>
+
+#include <boost/unordered_map.hpp>
+
+#include <vector>
+#include <string>
+
+namespace sequenceParser {
+namespace detail {
+
+/**
+ * @brief Group filenames by their string parts to detect sequences.
+ * Internal structure to detect sequences from filenames,
+ * without any access to the filesystem.
+ */
+class SequenceGrouper
+{
+public:
+	typedef boost::unordered_map<FileStrings, FileNumbersGroup, SeqIdHash> SeqIdMap;
+
+public:
+	explicit SequenceGrouper( const EDetection detectOptions );
+
+	/**
+	 * @brief Add a filename in the group of files with the same string parts.
+	 * @return false if there is no number in the filename, so it is not added.
+	 */
+	bool add( const std::string& filename );
+
+	/**
+	 * @brief Build the sequences from all the groups, and clear the groups.
+	 * @note A sequence can contain only one file.
+	 * @see splitSequence
+	 */
+	std::vector<Sequence> buildSequences();
+
+	/// @return The number of groups of files with the same string parts.
+	std::size_t getNbGroups() const { return _sequences.size(); }
+
+	/// @return The number of bytes allocated for the numbers of the grouped filenames.
+	std::size_t getMemorySize() const;
+
+private:
+	EDetection _detectOptions;
+	SeqIdMap _sequences;
+	FileStrings _tmpStringParts; ///< an object uniquely identify a sequence
+	std::vector<FileNumber> _tmpNumberParts; ///< the vector of numbers inside one filename
+};
+
+/**
+ * @brief Apply the detection options on a detected sequence.
+ * A sequence of one file could be considered as a single file,
+ * and a sequence with holes could be split in several sequences.
+ * @param[in] sequence: detected sequence
+ * @param[in] detectOptions: detection flags
+ * @param[out] outSequences: sequences to keep
+ * @param[out] outFilenames: filenames to consider as single files
+ */
+void splitSequence( const Sequence& sequence, const EDetection detectOptions, std::vector<Sequence>& outSequences, std::vector<std::string>& outFilenames );
+
+}
+}
+
+#endif
@@ -0,0 +1,82 @@
+#include "ThreadPool.hpp"
+
+#include <boost/bind.hpp>
+
+#include <algorithm>
+
+
+namespace sequenceParser {
+namespace detail {
+
+ThreadPool::ThreadPool( const std::size_t nbThreads )
+	: _nbThreads( nbThreads )
+	, _nbPendingTasks( 0 )
+	, _stop( false )
+{
+	if( _nbThreads == 0 )
+		_nbThreads = std::max( 1u, boost::thread::hardware_concurrency() );
+
+	for( std::size_t i = 0; i < _nbThreads; ++i )
+		_threads.create_thread( boost::bind( &ThreadPool::run, this ) );
+}
+
+ThreadPool::~ThreadPool()
+{
+	wait();
+	{
+		boost::mutex::scoped_lock lock( _mutex );
+		_stop = true;
+	}
+	_taskAvailable.notify_all();
+	_threads.join_all();
+}
+
+void ThreadPool::post( const Task& task )
+{
+	{
+		boost::mutex::scoped_lock lock( _mutex );
+		_tasks.push_back( task );
+		++_nbPendingTasks;
+	}
+	_taskAvailable.notify_one();
+}
+
+void ThreadPool::wait()
+{
+	boost::mutex::scoped_lock lock( _mutex );
+	while( _nbPendingTasks != 0 )
+		_allDone.wait( lock );
+}
+
+void ThreadPool::run()
+{
+	for( ;; )
+	{
+		Task task;
+		{
+			boost::mutex::scoped_lock lock( _mutex );
+			while( _tasks.empty() && ! _stop )
+				_taskAvailable.wait( lock );
+			if( _tasks.empty() )
+				return; // stopped
+			task.swap( _tasks.front() );
+			_tasks.pop_front();
+		}
+
+		try
+		{
+			task();
+		}
+		catch( ... )
+		{
+			// the tasks should handle their errors
+		}
+
+		boost::mutex::scoped_lock lock( _mutex );
+		if( --_nbPendingTasks == 0 )
+			_allDone.notify_all();
+	}
+}
+
+}
+}
@@ -0,0 +1,59 @@
+#ifndef _SEQUENCE_PARSER_THREAD_POOL_HPP_
+#define _SEQUENCE_PARSER_THREAD_POOL_HPP_
+
+#include <boost/function.hpp>
+#include <boost/noncopyable.hpp>
+#include <boost/thread/thread.hpp>
+#include <boost/thread/mutex.hpp>
+#include <boost/thread/condition_variable.hpp>
+
+#include <deque>
+
+namespace sequenceParser {
+namespace detail {
+
+/**
+ * @brief A fixed set of threads which execute the posted tasks.
+ * A task can post other tasks (to browse sub-directories for example).
+ * @warning The tasks should handle their errors: an exception thrown by
+ * a task is ignored.
+ */
+class ThreadPool : boost::noncopyable
+{
+public:
+	typedef boost::function<void()> Task;
+
+public:
+	/**
+	 * @param[in] nbThreads: number of threads, if 0 use the number of hardware threads
+	 */
+	explicit ThreadPool( const std::size_t nbThreads = 0 );
+
+	/// @brief Wait for all the tasks, and stop the threads.
+	~ThreadPool();
+
+	void post( const Task& task );
+
+	/// @brief Wait until all the posted tasks are done (including the tasks posted by the tasks).
+	void wait();
+
+	std::size_t getNbThreads() const { return _nbThreads; }
+
+private:
+	void run();
+
+private:
+	std::size_t _nbThreads;
+	boost::mutex _mutex;
+	boost::condition_variable _taskAvailable;
+	boost::condition_variable _allDone;
+	std::deque<Task> _tasks;
+	std::size_t _nbPendingTasks; ///< tasks waiting or running
+	bool _stop;
+	boost::thread_group _threads;
+};
+
+}
+}
+
+#endif
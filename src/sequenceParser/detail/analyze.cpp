@@ -2,26 +2,35 @@
 
 #include "FileNumbers.hpp"
 #include "FileStrings.hpp"
+#include "syscalls.hpp"
 
-#include <boost/regex.hpp>
 #include <boost/unordered_map.hpp>
+#include <boost/functional/hash.hpp>
+#include <boost/next_prior.hpp>
 #include <boost/lambda/lambda.hpp>
 #include <boost/foreach.hpp>
 
+#include <algorithm>
+#include <map>
 #include <set>
+#include <limits>
 
 
 namespace sequenceParser {
 
 using detail::FileNumbers;
 using detail::FileStrings;
+using detail::countStat;
 namespace bfs = boost::filesystem;
 
 bool detectDirectoryInResearch( std::string& researchPath, std::vector<std::string>& filters, std::string& filename )
 {
-	if( bfs::exists( researchPath ) )
+	boost::system::error_code errorCode;
+	countStat();
+	const bfs::file_status researchStatus = bfs::status( researchPath, errorCode );
+	if( bfs::exists( researchStatus ) )
 	{
-		if( !bfs::is_directory( researchPath ) )
+		if( !bfs::is_directory( researchStatus ) )
 		{
 			// the researchPath is an existing file, we search into the parent directory with filtering these filename
 			// warning: can find a sequence based on a filename
@@ -46,7 +55,8 @@ bool detectDirectoryInResearch( std::string& researchPath, std::vector<std::stri
 			return true;
 		}
 		bfs::path parentPath( tmpPath.parent_path() );
-		if( !bfs::exists( parentPath ) )
+		countStat();
+		if( !bfs::exists( bfs::status( parentPath, errorCode ) ) )
 		{
 			// researchPath and it parent don't exists, could not find file/sequence/folder
 			return false;
@@ -87,40 +97,34 @@ Sequence privateBuildSequence(
 	}
 	sequence._suffix += stringParts[len];
 
-	std::vector<FileNumbers>::const_iterator numberPartsLast = numberPartsEnd;
-	--numberPartsLast;
-
 	// standard case, one sequence detected
-	std::vector<Time> times;
-	times.reserve(std::distance( numberPartsBegin, numberPartsEnd ));
+	// the ranges are built directly from the sorted numbers, without any copy of the times
+	FrameRangesBuilder rangesBuilder( sequence._ranges );
 	for( std::vector<FileNumbers>::const_iterator it = numberPartsBegin; it != numberPartsEnd; ++it )
 	{
-		times.push_back(it->getTime(index));
+		rangesBuilder.add( it->getTime( index ) );
 	}
-	sequence._ranges = extractFrameRanges(times);
+	rangesBuilder.finish();
 	sequence._fixedPadding = padding;
 	sequence._maxPadding = maxPadding;
 
 	return sequence;
 }
 
+namespace {
+
 /**
- *
- * @param result
- * @param numberPartsBegin
- * @param numberPartsEnd
- * @param index
+ * @brief Get the paddings of a number of some filenames.
+ * @param[out] paddings: the fixed paddings
+ * @param[out] ambiguousMaxPaddings: the number of digits of the numbers without fixed padding
  */
-void privateBuildSequencesAccordingToPadding(
-	std::vector<Sequence>& result,
-	const Sequence& defaultSeq,
-	const FileStrings& stringParts,
-	const std::vector<FileNumbers>::iterator& numberPartsBegin,
-	const std::vector<FileNumbers>::iterator numberPartsEnd,
-	const int index )
+void getPaddings(
+	const std::vector<FileNumbers>::const_iterator& numberPartsBegin,
+	const std::vector<FileNumbers>::const_iterator& numberPartsEnd,
+	const std::size_t index,
+	std::set<std::size_t>& paddings,
+	std::set<std::size_t>& ambiguousMaxPaddings )
 {
-	std::set<std::size_t> paddings;
-	std::set<std::size_t> ambiguousMaxPaddings;
 	for( std::vector<FileNumbers>::const_iterator it = numberPartsBegin;
 	     it != numberPartsEnd;
 		 ++it )
@@ -135,25 +139,20 @@ void privateBuildSequencesAccordingToPadding(
 			ambiguousMaxPaddings.insert( maxPadding );
 		}
 	}
+}
 
-	if( paddings.size() == 1 )
-	{
-		// standard case: only one padding used in the sequence!
-		const std::size_t padding = *paddings.begin();
-		const std::size_t maxPadding = ( padding == 0 ? *ambiguousMaxPaddings.begin() : padding );
-		// simple sort
-		std::sort( numberPartsBegin, numberPartsEnd, FileNumbers::SortByNumber() );
-		result.push_back( privateBuildSequence( defaultSeq, stringParts, numberPartsBegin, numberPartsEnd, index, padding, maxPadding ) );
-		return;
-	}
-
-	bool onlyConsiderPadding = false;
+/**
+ * @brief Choose how to split a sequence with several paddings.
+ * @return true to split by padding, false to split by number of digits
+ */
+bool isSplitByPadding( const std::set<std::size_t>& paddings, const std::set<std::size_t>& ambiguousMaxPaddings )
+{
 	if( paddings.find( 0 ) == paddings.end() )
 	{
 		// No element without padding.
 		// All parts are prefixed by 0, only strict padding,
 		// so we can sort by padding without ambiguity
-		onlyConsiderPadding = true;
+		return true;
 	}
 	else
 	{
@@ -187,18 +186,52 @@ void privateBuildSequencesAccordingToPadding(
 		//	--------------------------------------------------------------------------------
 		//	|          YES             |   NO : sort by digits   |  NO : sort by padding   |
 		//	--------------------------------------------------------------------------------
-		onlyConsiderPadding = false;
 		BOOST_FOREACH( const std::size_t maxPadding, ambiguousMaxPaddings )
 		{
 			if( paddings.find( maxPadding ) == paddings.end() )
 			{
 				// if one digits from ambiguous digits doesn't correspond to
 				// a padding... we keep the whole sequence without padding.
-				onlyConsiderPadding = true;
-				break;
+				return true;
 			}
 		}
 	}
+	return false;
+}
+
+}
+
+/**
+ *
+ * @param result
+ * @param numberPartsBegin
+ * @param numberPartsEnd
+ * @param index
+ */
+void privateBuildSequencesAccordingToPadding(
+	std::vector<Sequence>& result,
+	const Sequence& defaultSeq,
+	const FileStrings& stringParts,
+	const std::vector<FileNumbers>::iterator& numberPartsBegin,
+	const std::vector<FileNumbers>::iterator numberPartsEnd,
+	const int index )
+{
+	std::set<std::size_t> paddings;
+	std::set<std::size_t> ambiguousMaxPaddings;
+	getPaddings( numberPartsBegin, numberPartsEnd, index, paddings, ambiguousMaxPaddings );
+
+	if( paddings.size() == 1 )
+	{
+		// standard case: only one padding used in the sequence!
+		const std::size_t padding = *paddings.begin();
+		const std::size_t maxPadding = ( padding == 0 ? *ambiguousMaxPaddings.begin() : padding );
+		// simple sort
+		std::sort( numberPartsBegin, numberPartsEnd, FileNumbers::SortByNumber() );
+		result.push_back( privateBuildSequence( defaultSeq, stringParts, numberPartsBegin, numberPartsEnd, index, padding, maxPadding ) );
+		return;
+	}
+
+	const bool onlyConsiderPadding = isSplitByPadding( paddings, ambiguousMaxPaddings );
 
 	if( onlyConsiderPadding )
 	{
@@ -245,29 +278,292 @@ void privateBuildSequencesAccordingToPadding(
 }
 
 
-bool getVaryingNumber( std::ssize_t& index, const FileNumbers& a, const FileNumbers& b )
+namespace {
+
+/**
+ * @brief The numbers of a filename, except the varying number of a sequence.
+ * The filenames of a sequence have the same fixed numbers.
+ */
+struct FixedNumbers
+{
+	FixedNumbers( const FileNumbers& numbers, const std::size_t varyingIndex )
+		: numbers( &numbers )
+		, varyingIndex( varyingIndex )
+	{}
+
+	bool operator==( const FixedNumbers& other ) const
+	{
+		for( std::size_t i = 0; i < numbers->size(); ++i )
+		{
+			if( i != varyingIndex && numbers->getNumber( i ) != other.numbers->getNumber( i ) )
+				return false;
+		}
+		return true;
+	}
+
+	const FileNumbers* numbers;
+	std::size_t varyingIndex;
+};
+
+std::size_t hash_value( const FixedNumbers& fixedNumbers )
+{
+	std::size_t seed = 0;
+	for( std::size_t i = 0; i < fixedNumbers.numbers->size(); ++i )
+	{
+		if( i == fixedNumbers.varyingIndex )
+			continue;
+		const detail::FileNumber& number = fixedNumbers.numbers->getNumber( i );
+		boost::hash_combine( seed, number.value );
+		boost::hash_combine( seed, number.nbDigits );
+		boost::hash_combine( seed, number.sign );
+	}
+	return seed;
+}
+
+/**
+ * @brief Group the filenames which differ only by one number, in linear time.
+ * @param[in] varyingIndex: index of the number which can be different in a group
+ * @param[out] outGroups: index of the group of each filename
+ * @return number of groups
+ */
+std::size_t groupByFixedNumbers( const std::vector<FileNumbers>& numberParts, const std::size_t varyingIndex, std::vector<std::size_t>& outGroups )
+{
+	typedef boost::unordered_map<FixedNumbers, std::size_t> GroupIndices;
+	GroupIndices groupIndices( numberParts.size() );
+	outGroups.resize( numberParts.size() );
+	for( std::size_t i = 0; i < numberParts.size(); ++i )
+	{
+		const std::size_t newGroup = groupIndices.size();
+		outGroups[i] = groupIndices.insert( GroupIndices::value_type( FixedNumbers( numberParts[i], varyingIndex ), newGroup ) ).first->second;
+	}
+	return groupIndices.size();
+}
+
+/**
+ * @return the indexes of the numbers which are not the same in all the filenames
+ */
+std::vector<std::size_t> getVaryingIndexes( const std::vector<FileNumbers>& numberParts )
 {
-	BOOST_ASSERT( a.size() == b.size() );
-	bool foundOne = false;
-	for( std::size_t i = 0; i < a.size(); ++i )
+	std::vector<std::size_t> varyingIndexes;
+	for( std::size_t i = 0; i < numberParts.front().size(); ++i )
 	{
-		if( a.getString(i) != b.getString(i) )
+		const detail::FileNumber& t = numberParts.front().getNumber( i );
+		BOOST_FOREACH( const FileNumbers& sn, numberParts )
 		{
-			if( foundOne )
+			if( sn.getNumber( i ) != t )
 			{
-				index = -1;
-				return false; // more than one element founded
+				varyingIndexes.push_back( i );
+				break;
 			}
-			foundOne = true;
-			index = i;
 		}
 	}
-	if( !foundOne )
-		index = -1;
-	return foundOne; // we found one varying index
+	return varyingIndexes;
 }
 
-std::vector<Sequence> buildSequences( const boost::filesystem::path& directory, const FileStrings& stringParts, std::vector<FileNumbers>& numberParts, const EDetection detectOptions )
+/**
+ * @brief Find the sequences of a group of filenames, like privateBuildSequencesAccordingToPadding,
+ * without sorting the filenames nor building the sequences.
+ * @param[out] outSequences: for each filename, an identifier of its sequence in the group
+ */
+void getSequencesAccordingToPadding(
+	const std::vector<FileNumbers>::const_iterator& numberPartsBegin,
+	const std::vector<FileNumbers>::const_iterator& numberPartsEnd,
+	const std::size_t index,
+	std::vector<std::size_t>& outSequences )
+{
+	std::set<std::size_t> paddings;
+	std::set<std::size_t> ambiguousMaxPaddings;
+	getPaddings( numberPartsBegin, numberPartsEnd, index, paddings, ambiguousMaxPaddings );
+	const bool onePadding = paddings.size() == 1;
+	const bool splitByPadding = ! onePadding && isSplitByPadding( paddings, ambiguousMaxPaddings );
+
+	outSequences.clear();
+	for( std::vector<FileNumbers>::const_iterator it = numberPartsBegin; it != numberPartsEnd; ++it )
+	{
+		if( onePadding )
+			outSequences.push_back( 0 );
+		else
+			outSequences.push_back( splitByPadding ? it->getFixedPadding( index ) : it->getMaxPadding( index ) );
+	}
+}
+
+/**
+ * @brief The filenames of a remaining set, grouped by their fixed numbers for a varying number.
+ */
+struct FixedNumbersGroups
+{
+	FixedNumbersGroups()
+		: varyingIndex( 0 )
+		, nbFilesInSequences( 0 )
+		, nbSequences( 0 )
+	{}
+
+	std::size_t varyingIndex;
+	std::vector<FileNumbers> grouped; ///< the filenames, grouped
+	std::vector<std::size_t> groupBegins; ///< beginning of each group in grouped (and the end of the last one)
+	std::size_t nbFilesInSequences; ///< filenames which are part of a sequence of several files
+	std::size_t nbSequences; ///< sequences of several files
+};
+
+/**
+ * @brief Group the filenames with the same numbers except the varying one,
+ * and count the sequences of several files which would be built from these groups.
+ */
+void getFixedNumbersGroups( const std::vector<FileNumbers>& numberParts, const std::size_t varyingIndex, FixedNumbersGroups& outGroups )
+{
+	std::vector<std::size_t> groupOfFile;
+	const std::size_t nbGroups = groupByFixedNumbers( numberParts, varyingIndex, groupOfFile );
+
+	// gather the filenames of each group (counting sort, which keeps the order inside a group)
+	std::vector<std::size_t>& groupBegins = outGroups.groupBegins;
+	groupBegins.assign( nbGroups + 1, 0 );
+	BOOST_FOREACH( const std::size_t group, groupOfFile )
+	{
+		++groupBegins[group + 1];
+	}
+	for( std::size_t group = 1; group <= nbGroups; ++group )
+	{
+		groupBegins[group] += groupBegins[group - 1];
+	}
+	std::vector<std::size_t> positions( groupBegins.begin(), groupBegins.end() - 1 );
+	outGroups.grouped.assign( numberParts.begin(), numberParts.end() );
+	for( std::size_t i = 0; i < numberParts.size(); ++i )
+	{
+		outGroups.grouped[positions[groupOfFile[i]]++] = numberParts[i];
+	}
+
+	outGroups.varyingIndex = varyingIndex;
+	outGroups.nbFilesInSequences = 0;
+	outGroups.nbSequences = 0;
+	std::vector<std::size_t> sequenceOfFile;
+	std::map<std::size_t, std::size_t> sequenceSizes;
+	for( std::size_t group = 0; group < nbGroups; ++group )
+	{
+		if( groupBegins[group + 1] - groupBegins[group] < 2 )
+			continue;
+		getSequencesAccordingToPadding( outGroups.grouped.begin() + groupBegins[group], outGroups.grouped.begin() + groupBegins[group + 1], varyingIndex, sequenceOfFile );
+		sequenceSizes.clear();
+		BOOST_FOREACH( const std::size_t sequence, sequenceOfFile )
+		{
+			++sequenceSizes[sequence];
+		}
+		for( std::map<std::size_t, std::size_t>::const_iterator sequenceSize = sequenceSizes.begin(); sequenceSize != sequenceSizes.end(); ++sequenceSize )
+		{
+			if( sequenceSize->second < 2 )
+				continue;
+			outGroups.nbFilesInSequences += sequenceSize->second;
+			++outGroups.nbSequences;
+		}
+	}
+}
+
+/**
+ * @brief Sequences built from a group of filenames, with the first filename of the group.
+ */
+struct SequencesGroup
+{
+	explicit SequencesGroup( const FileNumbers& first )
+		: first( first )
+	{}
+
+	FileNumbers first;
+	std::vector<Sequence> sequences;
+};
+
+struct SortGroupsByFirstFilename
+{
+	bool operator()( const SequencesGroup& a, const SequencesGroup& b ) const
+	{
+		return FileNumbers::SortByPadding()( a.first, b.first );
+	}
+};
+
+/**
+ * @brief Build the sequences of filenames with several varying numbers.
+ * For each varying number, the filenames with the same other numbers are grouped with a hash, in linear time.
+ * The varying number chosen puts the most filenames in sequences of several files, with the fewest sequences
+ * (so the biggest ones), or is the last one if several numbers give the same result.
+ * The filenames which are alone in their sequence are split again, with the other numbers.
+ * So the result doesn't depend on the order of the filenames, it is sorted by the first filename of each group.
+ */
+void buildMultiSequences(
+	std::vector<Sequence>& result,
+	const Sequence& defaultSeq,
+	const FileStrings& stringParts,
+	const std::vector<FileNumbers>& numberParts )
+{
+	const std::size_t lastIndex = numberParts.front().size() - 1;
+	std::vector<SequencesGroup> groups;
+	std::vector<FileNumbers> remaining( numberParts );
+	FixedNumbersGroups candidate;
+	FixedNumbersGroups best;
+	std::vector<std::size_t> sequenceOfFile;
+	std::map<std::size_t, std::size_t> sequenceSizes;
+
+	while( ! remaining.empty() )
+	{
+		best.nbFilesInSequences = 0;
+		BOOST_FOREACH( const std::size_t index, getVaryingIndexes( remaining ) )
+		{
+			getFixedNumbersGroups( remaining, index, candidate );
+			if( candidate.nbFilesInSequences > best.nbFilesInSequences ||
+				( candidate.nbFilesInSequences == best.nbFilesInSequences && candidate.nbFilesInSequences != 0 && candidate.nbSequences <= best.nbSequences ) )
+			{
+				std::swap( best, candidate );
+			}
+		}
+
+		if( best.nbFilesInSequences == 0 )
+		{
+			// no filenames differ by only one number: each file is alone,
+			// set the number as the last number
+			for( std::vector<FileNumbers>::iterator it = remaining.begin(); it != remaining.end(); ++it )
+			{
+				groups.push_back( SequencesGroup( *it ) );
+				privateBuildSequencesAccordingToPadding( groups.back().sequences, defaultSeq, stringParts, it, boost::next( it ), lastIndex );
+			}
+			break;
+		}
+
+		std::vector<FileNumbers> alone;
+		std::vector<FileNumbers> inSequences;
+		for( std::size_t group = 0; group + 1 < best.groupBegins.size(); ++group )
+		{
+			const std::vector<FileNumbers>::iterator begin = best.grouped.begin() + best.groupBegins[group];
+			const std::vector<FileNumbers>::iterator end = best.grouped.begin() + best.groupBegins[group + 1];
+			// the filenames alone in their sequence may be part of a sequence with an other varying number
+			getSequencesAccordingToPadding( begin, end, best.varyingIndex, sequenceOfFile );
+			sequenceSizes.clear();
+			BOOST_FOREACH( const std::size_t sequence, sequenceOfFile )
+			{
+				++sequenceSizes[sequence];
+			}
+			inSequences.clear();
+			for( std::vector<FileNumbers>::iterator it = begin; it != end; ++it )
+			{
+				if( sequenceSizes[sequenceOfFile[it - begin]] < 2 )
+					alone.push_back( *it );
+				else
+					inSequences.push_back( *it );
+			}
+			if( inSequences.empty() )
+				continue;
+			groups.push_back( SequencesGroup( *std::min_element( inSequences.begin(), inSequences.end(), FileNumbers::SortByPadding() ) ) );
+			privateBuildSequencesAccordingToPadding( groups.back().sequences, defaultSeq, stringParts, inSequences.begin(), inSequences.end(), best.varyingIndex );
+		}
+		remaining.swap( alone );
+	}
+
+	std::stable_sort( groups.begin(), groups.end(), SortGroupsByFirstFilename() );
+	BOOST_FOREACH( const SequencesGroup& group, groups )
+	{
+		result.insert( result.end(), group.sequences.begin(), group.sequences.end() );
+	}
+}
+
+}
+
+std::vector<Sequence> buildSequences( const FileStrings& stringParts, std::vector<FileNumbers>& numberParts, const EDetection detectOptions )
 {
 	Sequence defaultSeq;
 
@@ -285,24 +581,7 @@ std::vector<Sequence> buildSequences( const boost::filesystem::path& directory,
 	}
 	
 	// detect which part is the sequence number
-	// for the moment, accept only one sequence
-	// but we can easily support multi-sequences
-	std::vector<std::size_t> allIndex; // vector of indices (with 0 < index < len) with value changes
-	for( std::size_t i = 0; i < len; ++i )
-	{
-		const std::string t = numberParts.front().getString( i );
-
-		BOOST_FOREACH( const FileNumbers& sn, numberParts )
-		{
-			if( sn.getString( i ) != t )
-			{
-				allIndex.push_back( i );
-				break;
-			}
-		}
-	}
-	
-	//std::cout << "allIndex.size(): " << allIndex.size() << std::endl;
+	const std::vector<std::size_t> allIndex = getVaryingIndexes( numberParts );
 	
 	if( allIndex.size() == 1 )
 	{
@@ -318,100 +597,80 @@ std::vector<Sequence> buildSequences( const boost::filesystem::path& directory,
 	// 1 3 3
 	// 1 4 3
 	// 1 5 3 // could go in both sequences
-	//// split here
 	// 1 5 4
 	// 1 5 5
 	// 1 5 6
 	// 1 5 7
-	
-	std::sort( numberParts.begin(), numberParts.end(), FileNumbers::SortByPadding() );
-
-	std::vector<FileNumbers>::iterator first = numberParts.begin();
-	std::vector<FileNumbers>::iterator it = boost::next(first);
-	std::vector<FileNumbers>::iterator itEnd = numberParts.end();
-	std::ssize_t previousIndex = -1;
-	std::ssize_t index = -1;
-	bool split = false;
-	
-	for( ; it != itEnd; ++it )
+	// the last number gives the biggest sequence: [1 5 3-7] then [1 2-4 3]
+	buildMultiSequences( result, defaultSeq, stringParts, numberParts );
+	return result;
+}
+
+namespace {
+
+inline bool isDigit( const char c )
+{
+	return c >= '0' && c <= '9';
+}
+
+inline bool isSign( const char c )
+{
+	return c == '-' || c == '+';
+}
+
+}
+
+std::size_t decomposeFilename( const std::string& filename, FileStrings& stringParts, std::vector<detail::FileNumber>& numberParts, const EDetection& options )
+{
+	// a number with more digits is split in multiple numbers
+	static const std::ptrdiff_t maxDigits = std::numeric_limits<std::size_t>::digits10;
+	static const unsigned long long maxTime = std::numeric_limits<Time>::max();
+	const bool detectNegative = options & eDetectionNegative;
+
+	const char* const end = filename.data() + filename.size();
+	const char* stringBegin = filename.data();
+	const char* it = filename.data();
+
+	while( it != end )
 	{
-		//std::cout << "________________________________________" <<  std::endl;
-		//std::cout << "first: " << *first <<  std::endl;
-		//std::cout << "it: " << *it <<  std::endl;
-		if( getVaryingNumber( index, *first, *it ) )
+		const char* numberBegin = it;
+		bool negative = false;
+		if( detectNegative && isSign( *it ) && ( it + 1 != end ) && isDigit( *( it + 1 ) ) )
 		{
-			if( previousIndex != -1 && // we previously have a sequence and
-			    index != previousIndex ) // the index is not the same than previous: split!
-			{
-				split = true;
-			}
-//			else
-//			{
-//				// we don't have a sequence before, there is now one varying number,
-//				// so it's the next sequence
-//			}
+			// the sign is part of the number
+			negative = ( *it == '-' );
+			++it;
 		}
-		else
+		else if( ! isDigit( *it ) )
 		{
-			// more than one varying number: split in all cases!
-			split = true;
-			// if no sequence before... the file is alone...
-			// Set the number as the last number.
-			if( previousIndex == -1 )
-				previousIndex = first->size() - 1;
+			++it;
+			continue;
 		}
-		if( split )
+
+		const char* digitsBegin = it;
+		unsigned long long value = 0;
+		for( ; it != end && isDigit( *it ) && ( it - digitsBegin ) < maxDigits; ++it )
 		{
-			privateBuildSequencesAccordingToPadding( result, defaultSeq, stringParts, first, it, previousIndex );
-			split = false;
-			index = -1;
-			first = it;
+			value = value * 10 + ( *it - '0' );
 		}
-		previousIndex = index;
-	}
-	if( previousIndex == -1 )
-		previousIndex = first->size() - 1;
-	privateBuildSequencesAccordingToPadding( result, defaultSeq, stringParts, first, it, previousIndex );
-	
-	return result;
-}
 
-std::size_t decomposeFilename( const std::string& filename, FileStrings& stringParts, FileNumbers& numberParts, const EDetection& options )
-{
-	static const std::size_t max = std::numeric_limits<std::size_t>::digits10;
-	std::string regex;
-	if( options & eDetectionNegative )
-	{
-		regex = "[\\+\\-]?+\\d{1," + boost::lexical_cast<std::string>( max ) + "}";
-	}
-	else
-	{
-		regex = "\\d{1," + boost::lexical_cast<std::string>( max ) + "}";
-	}
-	const boost::regex re( regex );
-	static const int subs[] = { -1, 0 }; // get before match and current match
-	boost::sregex_token_iterator m( filename.begin(), filename.end(), re, subs );
-	boost::sregex_token_iterator end;
-
-//	std::cout << "________________________________________" << std::endl;
-//	std::cout << "filename: " << filename << std::endl;
-//	std::cout << "regex: " << regex << std::endl;
-	while( m != end )
-	{
-		// begin with string id, can be an empty string if str begins with a number
-//		std::cout << "stringPart: " << *m << std::endl;
-		stringParts.getId().push_back( *m++ );
-		if( m != end ) // if end with a string and not a number
+		if( value > maxTime + negative )
 		{
-//			std::cout << "numberPart: " << *m << std::endl;
-			numberParts.push_back( *m++ );
+			// can't retrieve the number,
+			// the number is out of range for Time type,
+			// so keep it as a part of the string.
+			continue;
 		}
+		const Time time = negative ? ( value ? -Time( value - 1 ) - 1 : 0 ) : Time( value );
+
+		// begin with string id, can be an empty string if str begins with a number
+		stringParts.push_back( stringBegin, numberBegin );
+		numberParts.push_back( detail::FileNumber( time, numberBegin, it ) );
+		stringBegin = it;
 	}
-	if( stringParts.getId().size() == numberParts.size() )
-	{
-		stringParts.getId().push_back( "" ); // we end with an empty string
-	}
-	//std::cout << numberParts.size() << std::endl;
+	// end with a string id, can be an empty string if str ends with a number
+	stringParts.push_back( stringBegin, end );
+
 	return numberParts.size();
 }
 
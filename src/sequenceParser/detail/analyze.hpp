@@ -15,6 +15,7 @@ namespace sequenceParser {
 namespace detail {
 class FileStrings;
 class FileNumbers;
+struct FileNumber;
 }
 
 /**
@@ -59,7 +60,7 @@ void privateBuildSequencesAccordingToPadding(
  *          so there is no reason to create a copy.
  * @return a sequence object with all informations
  */
-std::vector<Sequence> buildSequences( const boost::filesystem::path& directory, const detail::FileStrings& stringParts, std::vector<detail::FileNumbers>& numberParts, const EDetection detectOptions );
+std::vector<Sequence> buildSequences( const detail::FileStrings& stringParts, std::vector<detail::FileNumbers>& numberParts, const EDetection detectOptions );
 
 /**
  * @brief Extract number and string parts from a filename.
@@ -67,16 +68,21 @@ std::vector<Sequence> buildSequences( const boost::filesystem::path& directory,
  * Example:
  * filename = "aa1b22cccc3"
  * Will return:
- * stringParts = ["aa", "b", "cccc"]
+ * stringParts = ["aa", "b", "cccc", ""]
  * numberParts = [1, 22, 3]
  * 
+ * The filename is scanned in a single pass. With eDetectionNegative,
+ * a '-' or '+' followed by a digit is part of the number.
+ * The outputs are appended, so reuse the same cleared objects for each
+ * filename to avoid memory allocations.
+ * 
  * @param[in] str the string to process (filename)
  * @param[out] stringParts vector of strings
  * @param[out] numberParts vector of integers
  * 
  * @return number of decteted numbers
  */
-std::size_t decomposeFilename( const std::string& filename, detail::FileStrings& stringParts, detail::FileNumbers& numberParts, const EDetection& options );
+std::size_t decomposeFilename( const std::string& filename, detail::FileStrings& stringParts, std::vector<detail::FileNumber>& numberParts, const EDetection& options );
 
 }
 
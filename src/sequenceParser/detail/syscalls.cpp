@@ -0,0 +1,120 @@
+#include "syscalls.hpp"
+
+#include <sequenceParser/filesystem.hpp>
+
+#include <boost/atomic.hpp>
+
+#ifdef __UNIX__
+#include <fcntl.h>
+#include <unistd.h>
+#endif
+
+
+namespace sequenceParser {
+
+namespace {
+
+boost::atomic<std::size_t> nbStat( 0 );
+boost::atomic<std::size_t> nbOpenDirectory( 0 );
+boost::atomic<std::size_t> nbReadDirectory( 0 );
+
+}
+
+FilesystemCounters getFilesystemCounters()
+{
+	FilesystemCounters counters;
+	counters.nbStat = nbStat.load();
+	counters.nbOpenDirectory = nbOpenDirectory.load();
+	counters.nbReadDirectory = nbReadDirectory.load();
+	return counters;
+}
+
+void resetFilesystemCounters()
+{
+	nbStat = 0;
+	nbOpenDirectory = 0;
+	nbReadDirectory = 0;
+}
+
+namespace detail {
+
+void countStat()
+{
+	nbStat.fetch_add( 1, boost::memory_order_relaxed );
+}
+
+void countOpenDirectory()
+{
+	nbOpenDirectory.fetch_add( 1, boost::memory_order_relaxed );
+}
+
+void countReadDirectory()
+{
+	nbReadDirectory.fetch_add( 1, boost::memory_order_relaxed );
+}
+
+#ifdef __UNIX__
+
+int lstat( const char* path, struct stat* statInfos )
+{
+	countStat();
+	return ::lstat( path, statInfos );
+}
+
+int stat( const char* path, struct stat* statInfos )
+{
+	countStat();
+	return ::stat( path, statInfos );
+}
+
+EType getTypeFromMode( const mode_t mode )
+{
+	if( S_ISLNK( mode ) )
+		return eTypeLink;
+	if( S_ISREG( mode ) )
+		return eTypeFile;
+	if( S_ISDIR( mode ) )
+		return eTypeFolder;
+	return eTypeUndefined;
+}
+
+#endif
+
+OpenedDirectory::OpenedDirectory( const boost::filesystem::path& path )
+	: _path( path )
+	, _fd( -1 )
+{
+#ifdef __UNIX__
+	countOpenDirectory();
+#ifdef O_PATH
+	// only used as a reference for fstatat, so no read permission is needed
+	const int flags = O_PATH | O_DIRECTORY | O_CLOEXEC;
+#else
+	const int flags = O_RDONLY | O_DIRECTORY | O_CLOEXEC;
+#endif
+	_fd = ::open( path.empty() ? "." : path.c_str(), flags );
+#endif
+}
+
+OpenedDirectory::~OpenedDirectory()
+{
+#ifdef __UNIX__
+	if( _fd != -1 )
+		::close( _fd );
+#endif
+}
+
+#ifdef __UNIX__
+
+int OpenedDirectory::lstat( const std::string& filename, struct stat* statInfos ) const
+{
+	if( _fd == -1 )
+		return detail::lstat( ( _path / filename ).c_str(), statInfos );
+	countStat();
+	return ::fstatat( _fd, filename.c_str(), statInfos, AT_SYMLINK_NOFOLLOW );
+}
+
+#endif
+
+}
+}
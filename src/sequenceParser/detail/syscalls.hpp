@@ -0,0 +1,73 @@
+#ifndef _SEQUENCE_PARSER_DETAIL_SYSCALLS_HPP_
+#define _SEQUENCE_PARSER_DETAIL_SYSCALLS_HPP_
+
+#include <sequenceParser/common.hpp>
+#include <sequenceParser/system.hpp>
+
+#include <boost/filesystem/path.hpp>
+#include <boost/noncopyable.hpp>
+
+#ifdef __UNIX__
+#include <sys/types.h>
+#include <sys/stat.h>
+#endif
+
+namespace sequenceParser {
+namespace detail {
+
+/**
+ * @brief Increment the filesystem counters.
+ * @see FilesystemCounters
+ */
+void countStat();
+void countOpenDirectory();
+void countReadDirectory();
+
+#ifdef __UNIX__
+/**
+ * @brief lstat, counted in the filesystem counters.
+ */
+int lstat( const char* path, struct stat* statInfos );
+
+/**
+ * @brief stat, counted in the filesystem counters.
+ */
+int stat( const char* path, struct stat* statInfos );
+
+/**
+ * @return The type of an element from its mode (st_mode field of stat).
+ */
+EType getTypeFromMode( const mode_t mode );
+#endif
+
+/**
+ * @brief A directory opened once to stat its entries relatively to it (with fstatat on Unix),
+ * so the path of the directory is not resolved again for each entry.
+ * If the directory can't be opened, the entries are stat with their full path.
+ * The opening is counted in the filesystem counters.
+ */
+class OpenedDirectory : boost::noncopyable
+{
+public:
+	explicit OpenedDirectory( const boost::filesystem::path& path );
+	~OpenedDirectory();
+
+	const boost::filesystem::path& getPath() const { return _path; }
+
+#ifdef __UNIX__
+	/**
+	 * @brief lstat of an entry of the directory, counted in the filesystem counters.
+	 * @note Can be called from several threads at the same time.
+	 */
+	int lstat( const std::string& filename, struct stat* statInfos ) const;
+#endif
+
+private:
+	boost::filesystem::path _path;
+	int _fd; ///< -1 if the directory is not opened
+};
+
+}
+}
+
+#endif
@@ -1,7 +1,51 @@
 #include "detector.hpp"
 
+#include "detail/SequenceGrouper.hpp"
+
+#include <boost/foreach.hpp>
+
 
 namespace sequenceParser {
 
+using detail::SequenceGrouper;
+using detail::splitSequence;
+
+std::vector<Sequence> detectSequences(
+	std::vector<std::string>& outNonSequence,
+	const std::vector<std::string>& names,
+	const EDetection detectOptions )
+{
+	SequenceGrouper grouper( detectOptions );
+
+	BOOST_FOREACH( const std::string& name, names )
+	{
+		if( name.empty() )
+			continue; // no sense...
+
+		// hidden files
+		if( ( detectOptions & eDetectionIgnoreDotFile ) && ( name[0] == '.' ) )
+			continue;
+
+		// if no number detected, it's not part of a sequence
+		if( ! grouper.add( name ) )
+			outNonSequence.push_back( name );
+	}
+
+	const std::vector<Sequence> sequences = grouper.buildSequences();
+	std::vector<Sequence> output;
+	BOOST_FOREACH( const Sequence& s, sequences )
+	{
+		splitSequence( s, detectOptions, output, outNonSequence );
+	}
+	return output;
+}
+
+std::vector<Sequence> detectSequences(
+	const std::vector<std::string>& names,
+	const EDetection detectOptions )
+{
+	std::vector<std::string> nonSequence;
+	return detectSequences( nonSequence, names, detectOptions );
+}
 
 }
@@ -4,15 +4,33 @@
 #include "common.hpp"
 #include "Sequence.hpp"
 
+#include <vector>
+#include <string>
+
 
 namespace sequenceParser {
 
-// TODO: detect Sequences from strings
-//
-//std::vector<Sequence> detectSequences(
-//	std::vector<std::string>& outNonSequence,
-//	const std::vector<std::string>& names,
-//	const EDetection detectOptions = eDetectionDefault );
+/**
+ * @brief Detect sequences from a list of names, without any access to the filesystem.
+ * Useful to detect sequences from render-farm manifests, archive indexes, etc.
+ * @param[out] outNonSequence: names which are not part of a sequence.
+ * @param[in] names: names to analyze, considered as filenames (there is no notion of folder).
+ * @param[in] detectOptions: some options to choose how to consider sequences.
+ * @note With eDetectionIgnoreDotFile, the names beginning with a '.' are ignored.
+ * @return The detected sequences.
+ */
+std::vector<Sequence> detectSequences(
+	std::vector<std::string>& outNonSequence,
+	const std::vector<std::string>& names,
+	const EDetection detectOptions = eDetectionDefault );
+
+/**
+ * @brief Detect sequences from a list of names, without any access to the filesystem.
+ * @see detectSequences
+ */
+std::vector<Sequence> detectSequences(
+	const std::vector<std::string>& names,
+	const EDetection detectOptions = eDetectionDefault );
 
 }
 
@@ -8,13 +8,6 @@
 #include "sequenceParser/detector.hpp"
 %}
 
-/*
-%template(FileObjectVector) ::boost::ptr_vector<sequenceParser::FileObject>;
-%template(FileVector) ::boost::ptr_vector<sequenceParser::File>;
-%template(FolderVector) ::boost::ptr_vector<sequenceParser::Folder>;
-%template(SequenceVector) ::boost::ptr_vector<sequenceParser::Sequence>;
-*/
+%template(SequenceVector) ::std::vector<sequenceParser::Sequence>;
 
 %include "detector.hpp"
-
-
@@ -1,25 +1,32 @@
 #include "filesystem.hpp"
 
 #include "utils.hpp"
+#include "FilenameFormatter.hpp"
 
 #include "detail/analyze.hpp"
-#include "detail/FileNumbers.hpp"
-#include "detail/FileStrings.hpp"
+#include "detail/DirectoryBrowser.hpp"
+#include "detail/FilenameFilters.hpp"
+#include "detail/Profiler.hpp"
+#include "detail/ThreadPool.hpp"
+#include "detail/syscalls.hpp"
 
 #include <boost/regex.hpp>
 #include <boost/unordered_map.hpp>
 #include <boost/lambda/lambda.hpp>
 #include <boost/foreach.hpp>
 #include <boost/lexical_cast.hpp>
+#include <boost/bind.hpp>
+#include <boost/thread/mutex.hpp>
 
+#include <algorithm>
 #include <set>
+#include <map>
+#include <stdexcept>
 
 
 namespace sequenceParser {
 
-using detail::FileNumbers;
-using detail::FileStrings;
-using detail::SeqIdHash;
+using detail::ThreadPool;
 namespace bfs = boost::filesystem;
 
 
@@ -34,8 +41,10 @@ bfs::path getDirectoryFromPath( const bfs::path& p )
 	return directory;
 }
 
-bool browseSequence( Sequence& outSequence, const std::string& pattern, const EPattern accept )
+bool browseSequence( Sequence& outSequence, const std::string& pattern, const EPattern accept, PerformanceReport* outReport )
 {
+	detail::OperationProfiler profiler( "browseSequence", pattern, outReport );
+	PerformanceReport* report = profiler.getReport();
 	outSequence.clear();
 	bfs::path directory = getDirectoryFromPath( pattern );
 
@@ -45,27 +54,37 @@ bool browseSequence( Sequence& outSequence, const std::string& pattern, const EP
 	if( !bfs::exists( directory ) )
 		return false; // an empty sequence
 
-	std::vector<std::string> allTimesStr;
 	std::vector<Time> allTimes;
-	bfs::directory_iterator itEnd;
-
-	for( bfs::directory_iterator iter( directory ); iter != itEnd; ++iter )
+	std::size_t nbEntries = 0;
 	{
-		// we don't make this check, which can take long time on big sequences (>1000 files)
-		// depending on your filesystem, we may need to do a stat() for each file
-		// if( bfs::is_directory( iter->status() ) )
-		// continue; // skip directories
-		Time time;
-		std::string timeStr;
-
-		// if the file is inside the sequence
-		if( outSequence.isIn( iter->path().filename().string(), time, timeStr ) )
+		detail::PhaseTimer timer( report, &PerformanceReport::readDirectoryTime );
+		bfs::directory_iterator itEnd;
+		detail::countOpenDirectory();
+		for( bfs::directory_iterator iter( directory ); iter != itEnd; ++iter )
 		{
-			// create a big vector of all times in our sequence
-			allTimesStr.push_back( timeStr );
-			allTimes.push_back( time );
+			detail::countReadDirectory();
+			++nbEntries;
+			// we don't make this check, which can take long time on big sequences (>1000 files)
+			// depending on your filesystem, we may need to do a stat() for each file
+			// if( bfs::is_directory( iter->status() ) )
+			// continue; // skip directories
+			Time time;
+			std::string timeStr;
+
+			// if the file is inside the sequence
+			if( outSequence.matchFilename( iter->path().filename().string(), time, timeStr ) )
+			{
+				// create a big vector of all times in our sequence
+				allTimes.push_back( time );
+			}
 		}
 	}
+	if( report )
+	{
+		report->nbDirectories = 1;
+		report->nbEntries = nbEntries;
+		report->nbSequences = allTimes.empty() ? 0 : 1;
+	}
 	if( allTimes.size() < 2 )
 	{
 		if( allTimes.size() == 1 )
@@ -75,124 +94,390 @@ bool browseSequence( Sequence& outSequence, const std::string& pattern, const EP
 		//std::cout << "empty => " <<  _firstTime << " > " << _lastTime << " : " << _nbFiles << std::endl;
 		return true; // an empty sequence
 	}
-	std::sort( allTimes.begin(), allTimes.end() );
+	detail::PhaseTimer buildTimer( report, &PerformanceReport::buildSequencesTime );
+	sortFrames( allTimes );
 	outSequence._ranges = extractFrameRanges( allTimes );
 	return true; // a real file sequence
 }
 
-bool isConsideredAsSingleFile( const Sequence& s, const EDetection detectOptions )
+namespace {
+
+/// A stat costs about the same time as reading this number of entries of a directory
+const std::size_t statCostInEntries = 8;
+/// Approximative number of bytes of an entry in the size of a directory
+const std::size_t directoryEntrySize = 32;
+/// Number of frames checked by a task
+const std::size_t nbFramesPerTask = 256;
+/// Without the size of the directory, more expected frames are found by reading the directory
+const std::size_t maxNbFramesToProbe = 4096;
+
+/**
+ * @brief Check if the files of some frames exist, with a stat relatively to their directory.
+ * @param[out] exists: for each frame, if its file exists
+ */
+void probeFrames(
+		const detail::OpenedDirectory& directory,
+		const FilenameFormatter& formatter,
+		const std::vector<Time>& frames,
+		const std::size_t begin,
+		const std::size_t end,
+		std::vector<char>& exists )
 {
-	return (detectOptions & eDetectionSequenceNeedAtLeastTwoFiles) && (s.getNbFiles() == 1);
+	std::string filename; // reused for all the frames
+	for( std::size_t i = begin; i < end; ++i )
+	{
+		formatter.format( frames[i], filename );
+#ifdef __UNIX__
+		struct stat statInfos;
+		exists[i] = ( directory.lstat( filename, &statInfos ) == 0 );
+#else
+		boost::system::error_code errorCode;
+		detail::countStat();
+		exists[i] = bfs::exists( bfs::symlink_status( directory.getPath() / filename, errorCode ) );
+#endif
+	}
 }
 
-std::vector<Item> browse(
-		const bfs::path& dir,
-		const EDetection detectOptions,
-		const std::vector<std::string>& filters )
+/**
+ * @brief Add the frames of a range (without overflow if the range ends near the max Time).
+ */
+void appendFrames( const FrameRange& range, std::vector<Time>& outFrames )
 {
-	std::vector<Item> output;
-	std::string tmpDir( dir.string() );
-	std::vector<std::string> tmpFilters( filters );
-	std::string filename;
+	if( range.first > range.last )
+		return;
+	for( Time t = range.first; ; t += range.step )
+	{
+		outFrames.push_back( t );
+		if( static_cast<unsigned long long>( range.last ) - static_cast<unsigned long long>( t ) < static_cast<unsigned long long>( range.step ) )
+			break;
+	}
+}
 
-	if( ! detectDirectoryInResearch( tmpDir, tmpFilters, filename ) )
-		return output;
+/**
+ * @brief Keep the frames which are in the expected ranges, without expanding the ranges.
+ * @param[in,out] frames: sorted frames
+ */
+void keepExpectedFrames( std::vector<Time>& frames, const std::vector<FrameRange>& expectedRanges )
+{
+	std::vector<char> expected( frames.size(), false );
+	BOOST_FOREACH( const FrameRange& range, expectedRanges )
+	{
+		for( std::vector<Time>::const_iterator it = std::lower_bound( frames.begin(), frames.end(), range.first );
+			it != frames.end() && *it <= range.last;
+			++it )
+		{
+			if( range.contains( *it ) )
+				expected[it - frames.begin()] = true;
+		}
+	}
+	std::size_t nbExpected = 0;
+	for( std::size_t i = 0; i < frames.size(); ++i )
+	{
+		if( expected[i] )
+			frames[nbExpected++] = frames[i];
+	}
+	frames.resize( nbExpected );
+}
+
+/**
+ * @brief Find the existing frames of a sequence by reading its directory.
+ * @param[in] expectedRanges: frames to look for
+ * @param[out] report: if not NULL, the times and the counts of the read are added
+ * @return sorted existing frames
+ */
+std::vector<Time> scanFrames(
+		const bfs::path& directory,
+		const Sequence& sequence,
+		const FilenameFormatter& formatter,
+		const std::vector<FrameRange>& expectedRanges,
+		PerformanceReport* report )
+{
+	detail::PhaseTimer timer( report, &PerformanceReport::readDirectoryTime );
+	std::vector<Time> frames;
+	std::string expectedFilename;
+	boost::system::error_code errorCode;
+	detail::countOpenDirectory();
+	for( bfs::directory_iterator it( directory, errorCode ), itEnd; it != itEnd; it.increment( errorCode ) )
+	{
+		detail::countReadDirectory();
+		if( report )
+			++report->nbEntries;
+		const std::string filename = it->path().filename().string();
+		Time time;
+		std::string timeStr;
+		if( ! sequence.matchFilename( filename, time, timeStr ) )
+			continue;
+		// only the padding of the pattern, like a stat of the frame
+		formatter.format( time, expectedFilename );
+		if( filename == expectedFilename )
+			frames.push_back( time );
+	}
+	sortFrames( frames );
+	keepExpectedFrames( frames, expectedRanges );
+	return frames;
+}
+
+/**
+ * @brief Choose between a stat per frame and a read of the directory.
+ * @return if a stat per frame is faster than a read of the directory
+ */
+bool isProbeFaster( const bfs::path& directory, const std::size_t nbFrames, bool& outDirectoryExists )
+{
+#ifdef __UNIX__
+	struct stat statInfos;
+	outDirectoryExists = ( detail::stat( directory.c_str(), &statInfos ) == 0 && S_ISDIR( statInfos.st_mode ) );
+	if( ! outDirectoryExists )
+		return false;
+	// the size of a directory grows with its number of entries
+	const std::size_t estimatedNbEntries = statInfos.st_size / directoryEntrySize;
+	// divide: the number of expected frames can be huge
+	return nbFrames <= estimatedNbEntries / statCostInEntries;
+#else
+	boost::system::error_code errorCode;
+	detail::countStat();
+	outDirectoryExists = bfs::is_directory( directory, errorCode );
+	// no size of the directory
+	return nbFrames <= maxNbFramesToProbe;
+#endif
+}
+
+}
 
-	const std::vector<boost::regex> reFilters = convertFilterToRegex( tmpFilters, detectOptions );
+bool browseSequence(
+		Sequence& outSequence,
+		const std::string& pattern,
+		const std::vector<FrameRange>& expectedRanges,
+		const EPattern accept,
+		const std::size_t nbThreads,
+		PerformanceReport* outReport )
+{
+	detail::OperationProfiler profiler( "browseSequence", pattern, outReport );
+	PerformanceReport* report = profiler.getReport();
+	outSequence.clear();
+	const bfs::path directory = getDirectoryFromPath( pattern );
 
-	// variables for sequence detection
-	typedef boost::unordered_map<FileStrings, std::vector<FileNumbers>, SeqIdHash> SeqIdMap;
-	bfs::path directory( dir );
-	SeqIdMap sequences;
-	FileStrings tmpStringParts; // an object uniquely identify a sequence
-	FileNumbers tmpNumberParts; // the vector of numbers inside one filename
+	if( !outSequence.initFromPattern( bfs::path( pattern ).filename().string(), accept ) )
+		return false; // not recognized as a pattern, maybe a still file
 
-	// for all files in the directory
-	bfs::directory_iterator itEnd;
-	for( bfs::directory_iterator iter( directory ); iter != itEnd; ++iter )
+	// the ranges can come from the bindings, where the step is not checked
+	BOOST_FOREACH( const FrameRange& range, expectedRanges )
 	{
-		// clear previous infos
-		tmpStringParts.clear();
-		tmpNumberParts.clear(); // (clear but don't realloc the vector inside)
+		if( range.step < 1 )
+			throw std::invalid_argument( "The step of a frame range must be at least 1." );
+	}
 
-		if( ! filepathRespectsAllFilters( iter->path(), reFilters, filename, detectOptions ) )
-			continue;
+	// choose before expanding the ranges: a huge range is read from the directory
+	bool directoryExists = false;
+	const bool probe = isProbeFaster( directory, FrameRangesView( expectedRanges ).size(), directoryExists );
+	if( ! directoryExists )
+		return false; // an empty sequence
 
-		// if at least one number detected
-		if( decomposeFilename( iter->path().filename().string(), tmpStringParts, tmpNumberParts, detectOptions ) )
+	const FilenameFormatter formatter( outSequence );
+	std::vector<Time> frames;
+	if( ! probe )
+	{
+		frames = scanFrames( directory, outSequence, formatter, expectedRanges, report );
+		if( report )
+			report->nbDirectories = 1;
+	}
+	else
+	{
+		// the expected ranges can overlap
+		std::vector<Time> expectedFrames;
+		BOOST_FOREACH( const FrameRange& range, expectedRanges )
 		{
-			const SeqIdMap::iterator it( sequences.find( tmpStringParts ) );
-			if( it != sequences.end() ) // is already in map
-			{
-				// append the vector of numbers
-				sequences.at( tmpStringParts ).push_back( tmpNumberParts );
-			}
-			else
+			appendFrames( range, expectedFrames );
+		}
+		std::sort( expectedFrames.begin(), expectedFrames.end() );
+		expectedFrames.erase( std::unique( expectedFrames.begin(), expectedFrames.end() ), expectedFrames.end() );
+
+		detail::PhaseTimer timer( report, &PerformanceReport::statTime );
+		if( report )
+			report->nbEntries = expectedFrames.size();
+		const detail::OpenedDirectory openedDirectory( directory );
+		std::vector<char> exists( expectedFrames.size(), false );
+		if( expectedFrames.size() <= nbFramesPerTask )
+		{
+			probeFrames( openedDirectory, formatter, expectedFrames, 0, expectedFrames.size(), exists );
+		}
+		else
+		{
+			ThreadPool pool( nbThreads );
+			for( std::size_t begin = 0; begin < expectedFrames.size(); begin += nbFramesPerTask )
 			{
-				// create an entry in the map
-				std::vector<FileNumbers> li;
-				li.push_back( tmpNumberParts );
-				sequences.insert( SeqIdMap::value_type( tmpStringParts, li ) );
+				const std::size_t end = std::min( begin + nbFramesPerTask, expectedFrames.size() );
+				pool.post( boost::bind( &probeFrames, boost::cref( openedDirectory ), boost::cref( formatter ), boost::cref( expectedFrames ), begin, end, boost::ref( exists ) ) );
 			}
+			pool.wait();
 		}
-		else
+		for( std::size_t i = 0; i < expectedFrames.size(); ++i )
 		{
-			output.push_back( Item( getTypeFromPath( iter->path() ), iter->path() ) );
+			if( exists[i] )
+				frames.push_back( expectedFrames[i] );
 		}
 	}
+	detail::PhaseTimer timer( report, &PerformanceReport::buildSequencesTime );
+	if( report )
+		report->nbSequences = frames.empty() ? 0 : 1;
+	outSequence._ranges = extractFrameRanges( frames );
+	return true;
+}
+
+namespace {
+
+/**
+ * @brief Browse the content of an existing directory.
+ * @param[out] output: files, sequences and folders which respect the filters
+ * @param[out] outSubFolders: if not NULL, all the folders inside the directory
+ *             (even if they don't respect the filters)
+ * @param[out] report: if not NULL, the times and the counts of the browse are added
+ */
+void browseDirectory(
+		std::vector<Item>& output,
+		const bfs::path& directory,
+		const boost::shared_ptr<const detail::FilenameFilters>& filters,
+		const std::string& filename,
+		const EDetection detectOptions,
+		std::vector<bfs::path>* outSubFolders,
+		PerformanceReport* report )
+{
+	detail::DirectoryBrowser browser( directory, filters, filename, detectOptions, outSubFolders, report );
+	const std::size_t nbPreviousItems = output.size();
+	Item item;
+	while( browser.next( item ) )
+	{
+		output.push_back( item );
+	}
+	if( report )
+		report->nbItems += output.size() - nbPreviousItems;
+}
 
-	// add sequences in the output vector
-	BOOST_FOREACH( SeqIdMap::value_type & p, sequences )
+/**
+ * @brief Browse a tree of directories, each directory is browsed in a task of the thread pool.
+ */
+class RecursiveBrowser
+{
+public:
+	typedef std::map<bfs::path, std::vector<Item> > ItemsPerFolder;
+
+	/**
+	 * @param[out] report: if not NULL, the times and the counts of the browses of all the directories are added
+	 */
+	RecursiveBrowser( ThreadPool& pool, const boost::shared_ptr<const detail::FilenameFilters>& filters, const EDetection detectOptions, const int maxDepth, PerformanceReport* report )
+		: _pool( pool )
+		, _filters( filters )
+		, _detectOptions( detectOptions )
+		, _maxDepth( maxDepth )
+		, _report( report )
+	{}
+
+	/**
+	 * @brief Browse the root directory in the current thread, so the errors are reported to the caller.
+	 */
+	void browseRoot( const bfs::path& directory, const std::string& filename )
 	{
-		const std::vector<Sequence> ss = buildSequences( directory, p.first, p.second, detectOptions );
+		std::vector<Item> items;
+		std::vector<bfs::path> subFolders;
+		PerformanceReport report;
+		browseDirectory( items, directory, _filters, filename, _detectOptions, &subFolders, _report ? &report : NULL );
+		addResult( directory, items, subFolders, report, 0 );
+	}
 
-		BOOST_FOREACH( const std::vector<Sequence>::value_type & s, ss )
+	void browseFolder( const bfs::path& directory, const int depth )
+	{
+		std::vector<Item> items;
+		std::vector<bfs::path> subFolders;
+		PerformanceReport report;
+		try
 		{
-			if( bfs::is_directory( directory / s.getFirstFilename() ) )
-			{
-				// It's a sequence of directories, so it's not a sequence.
-				BOOST_FOREACH( Time t, s.getFramesIterable() )
-				{
-					bfs::path folderPath = directory / s.getFilenameAt(t);
-					output.push_back( Item( getTypeFromPath(folderPath), folderPath ) );
-				}
-			}
-			else
-			{
-				// if it's a sequence of 1 file, it could be considered as a sequence or as a single file
-				if( isConsideredAsSingleFile( s, detectOptions ) )
-				{
-
-					output.push_back( Item( getTypeFromPath( directory / s.getFirstFilename() ), directory / s.getFirstFilename() ) );
-				}
-				else
-				{
-					// if it's a sequence with holes, it could be split in several sequences depending on the detect options
-					if( (detectOptions & eDetectionSequenceWithoutHoles) && (s.getFrameRanges().size() > 1) )
-					{
-						BOOST_FOREACH( FrameRange f, s.getFrameRanges() )
-						{
-							const Sequence sequenceWithoutHoles( s.getPrefix(), s.getFixedPadding(), s.getMaxPadding(), s.getSuffix(), f.first, f.last, f.step );
-							if( isConsideredAsSingleFile( sequenceWithoutHoles, detectOptions ) )
-							{
-								output.push_back( Item( getTypeFromPath( directory / sequenceWithoutHoles.getFirstFilename() ), directory / sequenceWithoutHoles.getFirstFilename() ) );
-							}
-							else
-							{
-								output.push_back( Item( Sequence( directory, sequenceWithoutHoles ), directory ) );
-							}
-						}
-					}
-					else
-					{
-						output.push_back( Item( Sequence( directory, s ), directory ) );
-					}
-				}
-			}
+			browseDirectory( items, directory, _filters, std::string(), _detectOptions, &subFolders, _report ? &report : NULL );
+		}
+		catch( const bfs::filesystem_error& )
+		{
+			// can't read the directory (permissions, removed...), skip it
+			return;
+		}
+		addResult( directory, items, subFolders, report, depth );
+	}
+
+	ItemsPerFolder& getResults() { return _results; }
+
+private:
+	void addResult( const bfs::path& directory, std::vector<Item>& items, const std::vector<bfs::path>& subFolders, const PerformanceReport& report, const int depth )
+	{
+		{
+			boost::mutex::scoped_lock lock( _mutex );
+			_results[directory].swap( items );
+			if( _report )
+				detail::mergePerformanceReports( *_report, report );
+		}
+		if( _maxDepth >= 0 && depth >= _maxDepth )
+			return;
+		BOOST_FOREACH( const bfs::path& subFolder, subFolders )
+		{
+			_pool.post( boost::bind( &RecursiveBrowser::browseFolder, this, subFolder, depth + 1 ) );
 		}
 	}
+
+private:
+	ThreadPool& _pool;
+	const boost::shared_ptr<const detail::FilenameFilters> _filters;
+	const EDetection _detectOptions;
+	const int _maxDepth;
+	PerformanceReport* _report;
+
+	boost::mutex _mutex;
+	ItemsPerFolder _results;
+};
+
+}
+
+std::vector<Item> browse(
+		const bfs::path& dir,
+		const EDetection detectOptions,
+		const std::vector<std::string>& filters,
+		PerformanceReport* outReport )
+{
+	detail::OperationProfiler profiler( "browse", dir.string(), outReport );
+	std::vector<Item> output;
+	std::string tmpDir( dir.string() );
+	std::vector<std::string> tmpFilters( filters );
+	std::string filename;
+
+	if( ! detectDirectoryInResearch( tmpDir, tmpFilters, filename ) )
+		return output;
+
+	browseDirectory( output, bfs::path( tmpDir ), detail::getFilenameFilters( tmpFilters, detectOptions ), filename, detectOptions, NULL, profiler.getReport() );
 	return output;
 }
 
+std::vector<Item> browseRecursive(
+		const bfs::path& root,
+		const EDetection detectOptions,
+		const std::vector<std::string>& filters,
+		const int maxDepth,
+		const std::size_t nbThreads,
+		PerformanceReport* outReport )
+{
+	detail::OperationProfiler profiler( "browseRecursive", root.string(), outReport );
+	std::vector<Item> output;
+	std::string tmpDir( root.string() );
+	std::vector<std::string> tmpFilters( filters );
+	std::string filename;
 
+	if( ! detectDirectoryInResearch( tmpDir, tmpFilters, filename ) )
+		return output;
+
+	ThreadPool pool( nbThreads );
+	RecursiveBrowser browser( pool, detail::getFilenameFilters( tmpFilters, detectOptions ), detectOptions, maxDepth, profiler.getReport() );
+	browser.browseRoot( bfs::path( tmpDir ), filename );
+	pool.wait();
+
+	// merge the results, sorted by folder
+	BOOST_FOREACH( RecursiveBrowser::ItemsPerFolder::value_type& folderItems, browser.getResults() )
+	{
+		output.insert( output.end(), folderItems.second.begin(), folderItems.second.end() );
+	}
+	return output;
+}
 }
@@ -4,6 +4,7 @@
 #include "common.hpp"
 #include "Item.hpp"
 #include "Sequence.hpp"
+#include "PerformanceReport.hpp"
 
 #include <boost/filesystem/path.hpp>
 
@@ -13,13 +14,61 @@
 
 namespace sequenceParser {
 
+/**
+ * @brief Number of calls to the filesystem done by the library (in all threads),
+ * since the last reset.
+ * @see getFilesystemCounters
+ */
+struct FilesystemCounters
+{
+	std::size_t nbStat; ///< stat, lstat, etc.
+	std::size_t nbOpenDirectory; ///< directories opened to read their content
+	std::size_t nbReadDirectory; ///< entries read from directories
+};
+
+/**
+ * @brief Get the number of calls to the filesystem done by the library.
+ * Useful to check the cost of a browse on a network filesystem.
+ */
+FilesystemCounters getFilesystemCounters();
+
+/**
+ * @brief Reset the number of calls to the filesystem done by the library.
+ */
+void resetFilesystemCounters();
+
 /**
  * @brief Browse your filesystem to detect the sequence from a pattern.
  * @param[out] outSequence: output sequence to create
  * @param[in] pattern: Absolute path of your sequence, like: "/tmp/foo####.jpg"
  * @param[in] accept: patterns to accept in the detection
+ * @param[out] outReport: if not NULL, filled with the times and the counts of the browse
+ */
+bool browseSequence( Sequence& outSequence, const std::string& pattern, const EPattern accept = ePatternDefault, PerformanceReport* outReport = NULL );
+
+/**
+ * @brief Browse your filesystem to find the files of a sequence, when its frames are known.
+ * Instead of reading the whole directory, the file of each expected frame is checked with a stat (in parallel),
+ * unless the expected frames are a large part of the directory (estimated from the size of the directory):
+ * then the directory is read, and both ways give the same result.
+ * @param[out] outSequence: output sequence to create, with the existing expected frames
+ * @param[in] pattern: Absolute path of your sequence, like: "/tmp/foo####.jpg"
+ * @param[in] expectedRanges: frames to look for, the other frames are ignored
+ * @param[in] accept: patterns to accept in the detection
+ * @param[in] nbThreads: number of threads for the stats (0 to use the number of hardware threads)
+ * @param[out] outReport: if not NULL, filled with the times and the counts of the browse
+ * @note Only the files with the padding of the pattern are found.
+ * @note With the python binding, the GIL is released during the browse.
+ * @return false if the pattern is not recognized, or if the directory doesn't exist
+ * @throw std::invalid_argument if the step of an expected range is not at least 1
  */
-bool browseSequence( Sequence& outSequence, const std::string& pattern, const EPattern accept = ePatternDefault );
+bool browseSequence(
+		Sequence& outSequence,
+		const std::string& pattern,
+		const std::vector<FrameRange>& expectedRanges,
+		const EPattern accept = ePatternDefault,
+		const std::size_t nbThreads = 0,
+		PerformanceReport* outReport = NULL );
 
 
 #ifndef SWIG
@@ -29,12 +78,34 @@ bool browseSequence( Sequence& outSequence, const std::string& pattern, const EP
  * @param[in] detectOptions: some options to choose how to consider sequences.
  * @param[in] filters: set filters to limit the search.
  *                     For example to limit to jpg files, use "*.jpg".
+ * @param[out] outReport: if not NULL, filled with the times and the counts of the browse
  * @return A vector of files, sequences and directories.
  */
 std::vector<Item> browse(
 		const boost::filesystem::path& directory,
 		const EDetection detectOptions = eDetectionDefault,
-		const std::vector<std::string>& filters = std::vector<std::string>() );
+		const std::vector<std::string>& filters = std::vector<std::string>(),
+		PerformanceReport* outReport = NULL );
+
+/**
+ * @brief Browse the content of a tree of directories, with the notion of Sequences.
+ * The directories are read in parallel.
+ * @param[in] root: the input directory in which it will search recursively.
+ * @param[in] detectOptions: some options to choose how to consider sequences.
+ * @param[in] filters: set filters to limit the search (the folders are browsed even if they don't respect the filters).
+ * @param[in] maxDepth: maximum depth of browsed folders under root (0 to browse only root, -1 for no limit).
+ * @param[in] nbThreads: number of threads to read the directories (0 to use the number of hardware threads).
+ * @param[out] outReport: if not NULL, filled with the times and the counts of the browse
+ * @note The folders which can't be read under root are skipped. The links are not followed.
+ * @return A vector of files, sequences and directories, grouped by folder.
+ */
+std::vector<Item> browseRecursive(
+		const boost::filesystem::path& root,
+		const EDetection detectOptions = eDetectionDefault,
+		const std::vector<std::string>& filters = std::vector<std::string>(),
+		const int maxDepth = -1,
+		const std::size_t nbThreads = 0,
+		PerformanceReport* outReport = NULL );
 
 #endif
 
@@ -42,12 +113,13 @@ std::vector<Item> browse(
 inline std::vector<Item> browse(
 		const std::string& directory,
 		const EDetection detectOptions = eDetectionDefault,
-		const std::vector<std::string>& filters = std::vector<std::string>() )
+		const std::vector<std::string>& filters = std::vector<std::string>(),
+		PerformanceReport* outReport = NULL )
 {
 #ifdef SWIGJAVA
-	return browse( boost::filesystem::path(utf8_to_latin1(directory)), detectOptions, filters );
+	return browse( boost::filesystem::path(utf8_to_latin1(directory)), detectOptions, filters, outReport );
 #else
-	return browse( boost::filesystem::path(directory), detectOptions, filters );
+	return browse( boost::filesystem::path(directory), detectOptions, filters, outReport );
 #endif
 }
 
@@ -55,9 +127,26 @@ inline std::vector<Item> browse(
 inline std::vector<Item> browse(
 		const Item& directory,
 		const EDetection detectOptions = eDetectionDefault,
-		const std::vector<std::string>& filters = std::vector<std::string>() )
+		const std::vector<std::string>& filters = std::vector<std::string>(),
+		PerformanceReport* outReport = NULL )
+{
+	return browse( directory.getPath(), detectOptions, filters, outReport );
+}
+
+
+inline std::vector<Item> browseRecursive(
+		const std::string& root,
+		const EDetection detectOptions = eDetectionDefault,
+		const std::vector<std::string>& filters = std::vector<std::string>(),
+		const int maxDepth = -1,
+		const std::size_t nbThreads = 0,
+		PerformanceReport* outReport = NULL )
 {
-	return browse( directory.getPath(), detectOptions, filters );
+#ifdef SWIGJAVA
+	return browseRecursive( boost::filesystem::path(utf8_to_latin1(root)), detectOptions, filters, maxDepth, nbThreads, outReport );
+#else
+	return browseRecursive( boost::filesystem::path(root), detectOptions, filters, maxDepth, nbThreads, outReport );
+#endif
 }
 
 
@@ -10,7 +10,8 @@
 #include <boost/exception/diagnostic_information.hpp>
 %}
 
-%template(ItemVector) ::std::vector<sequenceParser::Item>;
+SEQUENCEPARSER_RELEASE_GIL(sequenceParser::browseRecursive)
+SEQUENCEPARSER_RELEASE_GIL(sequenceParser::browseSequence(Sequence&, const std::string&, const std::vector<FrameRange>&, const EPattern, const std::size_t, PerformanceReport*))
 
 %include "filesystem.hpp"
 
@@ -19,5 +20,10 @@ namespace sequenceParser {
 		const boost::filesystem::path&,
 		const EDetection detectOptions,
 		const std::vector<std::string>& );
+%ignore browseRecursive(
+		const boost::filesystem::path&,
+		const EDetection detectOptions,
+		const std::vector<std::string>&,
+		const int,
+		const std::size_t );
 }
-
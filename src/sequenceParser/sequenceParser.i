@@ -3,10 +3,18 @@
 
 %include "common.i"
 
+%include "PerformanceReport.i"
 %include "FrameRange.i"
 %include "Sequence.i"
 %include "Item.i"
 %include "ItemStat.i"
+%include "FilenameFormatter.i"
+%include "SequenceFiles.i"
+%include "ItemStream.i"
+%include "SequenceWatcher.i"
 
 %include "detector.i"
 %include "filesystem.i"
+%include "BrowseCache.i"
+%include "BrowseRecords.i"
+%include "TreeIndex.i"
@@ -4,6 +4,7 @@
 #include "detail/analyze.hpp"
 #include "detail/FileNumbers.hpp"
 #include "detail/FileStrings.hpp"
+#include "detail/FilenameFilters.hpp"
 
 #include <boost/regex.hpp>
 #include <boost/unordered_map.hpp>
@@ -22,36 +23,7 @@ namespace bfs = boost::filesystem;
 
 boost::regex convertFilterToRegex( const std::string& filter, const EDetection detectOptions )
 {
-	std::string filterToRegex = filter;
-	
-	boost::cmatch match;
-	boost::regex expression( "(.*[%])([0-9]{2})([d].*)" ); // match to pattern like : %04d
-	if( boost::regex_match( filterToRegex.c_str(), match, expression ) )
-	{
-		std::string matched = match[1].second;
-		matched.erase( 2 , matched.size()-2); // keep only numbers
-		const int patternWidth = boost::lexical_cast<int>( matched );
-		std::string replacing( patternWidth, '#' );
-		filterToRegex = boost::regex_replace( filterToRegex, boost::regex( "\\%\\d{1,2}d" ), replacing );
-	}
-
-	// for detect sequence based on a single file
-	if( ( detectOptions & eDetectionSequenceFromFilename ) )
-		filterToRegex = boost::regex_replace( filterToRegex, boost::regex( "\\d" ), "[0-9]" );
-
-	filterToRegex = boost::regex_replace( filterToRegex, boost::regex( "\\*" ), "(.*)" );
-	filterToRegex = boost::regex_replace( filterToRegex, boost::regex( "\\?" ), "(.)" );
-	if( detectOptions & eDetectionNegative )
-	{
-		filterToRegex = boost::regex_replace( filterToRegex, boost::regex( "\\@" ), "[\\-\\+]?[0-9]+" ); // one @ correspond to one or more digits
-		filterToRegex = boost::regex_replace( filterToRegex, boost::regex( "\\#" ), "[\\-\\+]?[0-9]" ); // each # in pattern correspond to a digit
-	}
-	else
-	{
-		filterToRegex = boost::regex_replace( filterToRegex, boost::regex( "\\@" ), "[0-9]+" ); // one @ correspond to one or more digits
-		filterToRegex = boost::regex_replace( filterToRegex, boost::regex( "\\#" ), "[0-9]" ); // each # in pattern correspond to a digit
-	}
-	return boost::regex( filterToRegex );
+	return boost::regex( detail::convertFilterToRegexString( filter, detectOptions ) );
 }
 
 std::vector<boost::regex> convertFilterToRegex( const std::vector<std::string>& filters, const EDetection detectOptions )
@@ -12,6 +12,7 @@ namespace sequenceParser {
 /**
  * @brief Convert a user filter into a regex.
  * A user filter looks like: "foo###.jpg", "foo@.tiff" or "foo%04d.jpg".
+ * '*', '?', '#' and '@' are the wildcards and '.' is a dot, the other characters keep their regex meaning.
  */
 boost::regex convertFilterToRegex( const std::string& filter, const EDetection detectOptions );
 
@@ -0,0 +1,274 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the python binding on generated render directories.
+
+Each layout is generated in a temporary directory at several scales, then the main
+functions of the library are timed on it: browse, browseRecursive, browseSequence,
+ItemStat/statItems, Item.explode and Sequence.getFiles.
+The results are printed, and written in a json file to compare versions.
+
+The files are empty and stay in the page cache after their creation:
+the times are the ones of a warm cache, the filesystem counters give the calls done.
+
+Usage:
+    browseBenchmark.py [--scales 1 10 100] [--layouts flat shots ...] [--repeat 3]
+                       [--output results.json] [--label v2.1.0] [--directory /path/to/tmp]
+
+At scale 1, each layout has about 1000 files (flat-1000 is a folder of 1M frames).
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+from pySequenceParser import sequenceParser as seq
+
+
+def createFile(path, filename):
+    """
+    Create an empty file.
+    """
+    open(os.path.join(path, filename), 'w').close()
+
+
+def createFlat(path, scale):
+    """
+    A single folder with one sequence of 1000 * scale frames.
+    """
+    for frame in range(1, 1000 * scale + 1):
+        createFile(path, 'render.%07d.exr' % frame)
+    return {'pattern': os.path.join(path, 'render.#######.exr'), 'nbFrames': 1000 * scale}
+
+
+def createShots(path, scale):
+    """
+    10 * scale shot folders, each one with 2 short sequences and a file.
+    """
+    for shot in range(10 * scale):
+        shotPath = os.path.join(path, 'shot%04d' % shot)
+        os.mkdir(shotPath)
+        for frame in range(101, 151):
+            createFile(shotPath, 'plate.%04d.dpx' % frame)
+            createFile(shotPath, 'comp_v%03d.%04d.exr' % (shot % 7 + 1, frame))
+        createFile(shotPath, 'notes.txt')
+    return {}
+
+
+def createMixedPaddings(path, scale):
+    """
+    Sequences with several paddings in the same folder (like in testMultiPadding).
+    """
+    for frame in range(1, 250 * scale + 1):
+        createFile(path, 'a1b2c%d.j2c' % frame)
+        createFile(path, 'a1b2c%03d.j2c' % frame)
+        createFile(path, 'img.%04d.png' % frame)
+        createFile(path, 'img.%d.tif' % (frame * 3))
+    return {}
+
+
+def createNegative(path, scale):
+    """
+    A sequence with negative and positive frames.
+    """
+    half = 500 * scale
+    for frame in range(-half, half):
+        createFile(path, 'neg.%d.exr' % frame)
+    return {'pattern': os.path.join(path, 'neg.@.exr'), 'nbFrames': 2 * half}
+
+
+def createMultiNumbers(path, scale):
+    """
+    Filenames with several numbers (like in testMultiSequence).
+    """
+    for b in range(10 * scale):
+        for c in range(1, 101):
+            createFile(path, 'a1b%dc%d.j2c' % (b, c))
+    return {}
+
+
+def createDeep(path, scale):
+    """
+    A tree of depth 6 with 3 sub-folders by folder, and a sequence in each leaf.
+    """
+    def createLevel(levelPath, depth):
+        if depth == 6:
+            for frame in range(1, scale + 2):
+                createFile(levelPath, 'leaf.%04d.jpg' % frame)
+            return
+        for i in range(3):
+            subPath = os.path.join(levelPath, 'd%d' % i)
+            os.mkdir(subPath)
+            createLevel(subPath, depth + 1)
+    createLevel(path, 0)
+    return {}
+
+
+# name: (generator, recursive, detection options)
+layouts = {
+    'flat': (createFlat, False, seq.eDetectionDefault),
+    'shots': (createShots, True, seq.eDetectionDefault),
+    'mixedPaddings': (createMixedPaddings, False, seq.eDetectionDefault),
+    'negative': (createNegative, False, seq.eDetectionNegative),
+    'multiNumbers': (createMultiNumbers, False, seq.eDetectionDefault),
+    'deep': (createDeep, True, seq.eDetectionDefault),
+}
+
+
+def getCounters():
+    counters = seq.getFilesystemCounters()
+    return {
+        'nbStat': counters.nbStat,
+        'nbOpenDirectory': counters.nbOpenDirectory,
+        'nbReadDirectory': counters.nbReadDirectory,
+    }
+
+
+def timeOperation(function, repeat):
+    """
+    Call a function several times.
+    @return the times in seconds, and the filesystem counters of the last call.
+    """
+    times = []
+    for i in range(repeat):
+        seq.resetFilesystemCounters()
+        start = time.time()
+        function()
+        times.append(time.time() - start)
+    return times, getCounters()
+
+
+def getOperations(path, recursive, detectOptions, info):
+    """
+    @return the functions to time on a generated layout, by name.
+    """
+    if recursive:
+        items = seq.browseRecursive(path, detectOptions)
+    else:
+        items = seq.browse(path, detectOptions)
+    sequences = [item for item in items if item.getType() == seq.eTypeSequence]
+
+    def browse():
+        if recursive:
+            seq.browseRecursive(path, detectOptions)
+        else:
+            seq.browse(path, detectOptions)
+
+    def itemStat():
+        for item in sequences:
+            seq.ItemStat(item)
+
+    def statItems():
+        seq.statItems(items)
+
+    def explode():
+        for item in sequences:
+            item.explode()
+
+    def getFiles():
+        for item in sequences:
+            sequence = item.getSequence()
+            sequence.getFiles()
+
+    operations = [
+        ('browseRecursive' if recursive else 'browse', browse),
+        ('ItemStat', itemStat),
+        ('statItems', statItems),
+        ('explode', explode),
+        ('getFiles', getFiles),
+    ]
+
+    if 'pattern' in info:
+        def browseSequence():
+            sequence = seq.Sequence()
+            seq.browseSequence(sequence, info['pattern'])
+
+        operations.append(('browseSequence', browseSequence))
+
+        # the frames are already known, like to check a rendered sequence
+        expectedSequence = sequences[0].getSequence()
+        expectedRanges = expectedSequence.getFrameRanges()
+
+        def browseSequenceExpected():
+            sequence = seq.Sequence()
+            seq.browseSequence(sequence, info['pattern'], expectedRanges)
+
+        operations.append(('browseSequenceExpected', browseSequenceExpected))
+
+    return len(items), sum(item.getSequence().getNbFiles() if item.getType() == seq.eTypeSequence else 1 for item in items), operations
+
+
+def runLayout(name, scale, repeat, directory):
+    """
+    Generate a layout, and time the operations on it.
+    @return a list of results
+    """
+    generator, recursive, detectOptions = layouts[name]
+    path = tempfile.mkdtemp(prefix='%s-%d-' % (name, scale), dir=directory)
+    try:
+        start = time.time()
+        info = generator(path, scale)
+        generationTime = time.time() - start
+
+        nbItems, nbFiles, operations = getOperations(path, recursive, detectOptions, info)
+        results = []
+        for operationName, function in operations:
+            times, counters = timeOperation(function, repeat)
+            results.append({
+                'layout': name,
+                'scale': scale,
+                'nbItems': nbItems,
+                'nbFiles': nbFiles,
+                'operation': operationName,
+                'times': times,
+                'minTime': min(times),
+                'medianTime': sorted(times)[len(times) // 2],
+                'filesystemCounters': counters,
+                'generationTime': generationTime,
+            })
+            print('%-14s %6d %-24s %9d files %10.4fs (stat: %d, readdir: %d)' % (
+                name, scale, operationName, nbFiles, min(times),
+                counters['nbStat'], counters['nbReadDirectory']))
+            sys.stdout.flush()
+        return results
+    finally:
+        shutil.rmtree(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of sequenceParser on generated render directories.')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100],
+                        help='sizes of the layouts (about 1000 files by unit)')
+    parser.add_argument('--layouts', nargs='+', default=sorted(layouts.keys()), choices=sorted(layouts.keys()))
+    parser.add_argument('--repeat', type=int, default=3, help='number of calls of each operation')
+    parser.add_argument('--output', help='json file of the results')
+    parser.add_argument('--label', default='', help='name of the tested version, written in the results')
+    parser.add_argument('--directory', help='where to generate the layouts (default: the temporary directory)')
+    args = parser.parse_args()
+
+    results = []
+    for scale in args.scales:
+        for name in args.layouts:
+            results.extend(runLayout(name, scale, args.repeat, args.directory))
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump({
+                'label': args.label,
+                'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'repeat': args.repeat,
+                'results': results,
+            }, output, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+/**
+ * Micro benchmark of decomposeFilename, the per-entry step of browse().
+ *
+ * Compare the single-pass scanner with the previous implementation,
+ * which compiled a boost::regex for each filename.
+ *
+ * Usage: decomposeFilename [nbNames...] (default: 10000 100000 1000000)
+ */
+#include <sequenceParser/detail/analyze.hpp>
+#include <sequenceParser/detail/FileNumbers.hpp>
+#include <sequenceParser/detail/FileStrings.hpp>
+
+#include <boost/regex.hpp>
+#include <boost/lexical_cast.hpp>
+
+#include <ctime>
+#include <cstdio>
+#include <cstdlib>
+#include <limits>
+#include <vector>
+#include <string>
+
+using namespace sequenceParser;
+
+namespace {
+
+/**
+ * @brief Previous implementation of decomposeFilename, kept as reference.
+ */
+std::size_t legacyDecomposeFilename( const std::string& filename, std::vector<std::string>& stringParts, std::vector<std::pair<Time, std::string> >& numberParts, const EDetection& options )
+{
+	static const std::size_t max = std::numeric_limits<std::size_t>::digits10;
+	std::string regex;
+	if( options & eDetectionNegative )
+	{
+		regex = "[\\+\\-]?+\\d{1," + boost::lexical_cast<std::string>( max ) + "}";
+	}
+	else
+	{
+		regex = "\\d{1," + boost::lexical_cast<std::string>( max ) + "}";
+	}
+	const boost::regex re( regex );
+	static const int subs[] = { -1, 0 }; // get before match and current match
+	boost::sregex_token_iterator m( filename.begin(), filename.end(), re, subs );
+	boost::sregex_token_iterator end;
+
+	while( m != end )
+	{
+		stringParts.push_back( *m++ );
+		if( m != end )
+		{
+			const std::string s = *m++;
+			numberParts.push_back( std::make_pair( boost::lexical_cast<Time>( s ), s ) );
+		}
+	}
+	if( stringParts.size() == numberParts.size() )
+	{
+		stringParts.push_back( "" );
+	}
+	return numberParts.size();
+}
+
+std::vector<std::string> generateNames( const std::size_t nbNames )
+{
+	std::vector<std::string> names;
+	names.reserve( nbNames );
+	char buffer[256];
+	for( std::size_t i = 0; i < nbNames; ++i )
+	{
+		switch( i % 4 )
+		{
+			case 0:
+				std::sprintf( buffer, "shot%03d_comp_v%03d.%07d.exr", int( i / 40000 ), int( ( i / 10000 ) % 4 ), int( i ) );
+				break;
+			case 1:
+				std::sprintf( buffer, "plate-%d.dpx", int( i ) - int( nbNames / 2 ) );
+				break;
+			case 2:
+				std::sprintf( buffer, "render_layer_beauty.%04d.tif", int( i % 10000 ) );
+				break;
+			default:
+				std::sprintf( buffer, "README_%d.txt", int( i ) );
+				break;
+		}
+		names.push_back( buffer );
+	}
+	return names;
+}
+
+bool sameResult( const detail::FileStrings& stringParts, const std::vector<detail::FileNumber>& numberParts, const std::vector<std::string>& legacyStringParts, const std::vector<std::pair<Time, std::string> >& legacyNumberParts )
+{
+	if( stringParts.size() != legacyStringParts.size() || numberParts.size() != legacyNumberParts.size() )
+		return false;
+	for( std::size_t i = 0; i < stringParts.size(); ++i )
+	{
+		if( stringParts[i] != legacyStringParts[i] )
+			return false;
+	}
+	for( std::size_t i = 0; i < numberParts.size(); ++i )
+	{
+		if( numberParts[i].value != legacyNumberParts[i].first || numberParts[i].getString() != legacyNumberParts[i].second )
+			return false;
+	}
+	return true;
+}
+
+double nanosecondsPerEntry( const std::clock_t start, const std::clock_t stop, const std::size_t nbNames )
+{
+	return ( double( stop - start ) / CLOCKS_PER_SEC ) * 1e9 / nbNames;
+}
+
+void run( const std::size_t nbNames, const EDetection options )
+{
+	const std::vector<std::string> names = generateNames( nbNames );
+	// number of detected numbers, for both implementations
+	std::size_t nbNumbers = 0;
+	std::size_t legacyNbNumbers = 0;
+
+	// scanner: the same buffers are reused for each filename
+	detail::FileStrings stringParts;
+	std::vector<detail::FileNumber> numberParts;
+	const std::clock_t scannerStart = std::clock();
+	for( std::size_t i = 0; i < nbNames; ++i )
+	{
+		stringParts.clear();
+		numberParts.clear();
+		nbNumbers += decomposeFilename( names[i], stringParts, numberParts, options );
+	}
+	const std::clock_t scannerStop = std::clock();
+
+	// legacy regex implementation
+	std::vector<std::string> legacyStringParts;
+	std::vector<std::pair<Time, std::string> > legacyNumberParts;
+	std::size_t nbDifferences = 0;
+	const std::clock_t legacyStart = std::clock();
+	for( std::size_t i = 0; i < nbNames; ++i )
+	{
+		legacyStringParts.clear();
+		legacyNumberParts.clear();
+		legacyNbNumbers += legacyDecomposeFilename( names[i], legacyStringParts, legacyNumberParts, options );
+	}
+	const std::clock_t legacyStop = std::clock();
+
+	// check that both implementations give the same result
+	for( std::size_t i = 0; i < nbNames; ++i )
+	{
+		stringParts.clear();
+		numberParts.clear();
+		legacyStringParts.clear();
+		legacyNumberParts.clear();
+		decomposeFilename( names[i], stringParts, numberParts, options );
+		legacyDecomposeFilename( names[i], legacyStringParts, legacyNumberParts, options );
+		if( ! sameResult( stringParts, numberParts, legacyStringParts, legacyNumberParts ) )
+			++nbDifferences;
+	}
+	if( nbNumbers != legacyNbNumbers )
+		++nbDifferences;
+
+	const double legacy = nanosecondsPerEntry( legacyStart, legacyStop, nbNames );
+	const double scanner = nanosecondsPerEntry( scannerStart, scannerStop, nbNames );
+	std::printf( "%-10lu %-9s %12.1f %12.1f %9.1fx %12lu\n",
+		(unsigned long)nbNames,
+		( options & eDetectionNegative ) ? "negative" : "default",
+		legacy, scanner, legacy / scanner,
+		(unsigned long)nbDifferences );
+}
+
+}
+
+int main( int argc, char** argv )
+{
+	std::vector<std::size_t> sizes;
+	for( int i = 1; i < argc; ++i )
+		sizes.push_back( std::strtoul( argv[i], NULL, 10 ) );
+	if( sizes.empty() )
+	{
+		sizes.push_back( 10000 );
+		sizes.push_back( 100000 );
+		sizes.push_back( 1000000 );
+	}
+
+	std::printf( "%-10s %-9s %12s %12s %10s %12s\n", "nbNames", "options", "legacy ns", "scanner ns", "speedup", "differences" );
+	for( std::size_t i = 0; i < sizes.size(); ++i )
+	{
+		run( sizes[i], eDetectionDefault );
+		run( sizes[i], eDetectionDefault | eDetectionNegative );
+	}
+	return 0;
+}
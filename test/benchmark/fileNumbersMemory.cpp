@@ -0,0 +1,151 @@
+/**
+ * Memory benchmark of the numbers kept for each file during the browse of a directory.
+ *
+ * Compare the packed numbers stored in a flat buffer per group of files
+ * with the previous representation, which stored a std::string per number
+ * and a std::vector per file.
+ *
+ * Usage: fileNumbersMemory [nbFrames...] (default: 1000000)
+ */
+#include <sequenceParser/detail/analyze.hpp>
+#include <sequenceParser/detail/FileNumbers.hpp>
+#include <sequenceParser/detail/FileStrings.hpp>
+#include <sequenceParser/detail/SequenceGrouper.hpp>
+
+#include <boost/unordered_map.hpp>
+
+#include <ctime>
+#include <cstdio>
+#include <cstdlib>
+#include <new>
+#include <vector>
+#include <string>
+
+using namespace sequenceParser;
+
+namespace {
+
+/// number of bytes currently allocated with operator new
+std::size_t allocatedBytes = 0;
+
+}
+
+// dynamic exception specifications are not allowed since C++17
+#if __cplusplus < 201103L
+#define BENCHMARK_THROW_BAD_ALLOC throw( std::bad_alloc )
+#define BENCHMARK_NOTHROW throw()
+#else
+#define BENCHMARK_THROW_BAD_ALLOC
+#define BENCHMARK_NOTHROW noexcept
+#endif
+
+// count all the allocations of the benchmark
+void* operator new( std::size_t size ) BENCHMARK_THROW_BAD_ALLOC
+{
+	std::size_t* p = static_cast<std::size_t*>( std::malloc( size + sizeof( std::size_t ) ) );
+	if( ! p )
+		throw std::bad_alloc();
+	*p = size;
+	allocatedBytes += size;
+	return p + 1;
+}
+
+void operator delete( void* ptr ) BENCHMARK_NOTHROW
+{
+	if( ! ptr )
+		return;
+	std::size_t* p = static_cast<std::size_t*>( ptr ) - 1;
+	allocatedBytes -= *p;
+	std::free( p );
+}
+
+namespace {
+
+/**
+ * @brief Previous representation of the numbers of a filename, kept as reference.
+ */
+typedef std::vector<std::pair<Time, std::string> > LegacyFileNumbers;
+typedef boost::unordered_map<detail::FileStrings, std::vector<LegacyFileNumbers>, detail::SeqIdHash> LegacySeqIdMap;
+
+std::string frameName( const std::size_t i )
+{
+	char buffer[256];
+	std::sprintf( buffer, "shot010_comp_v003.%07d.exr", int( i ) );
+	return buffer;
+}
+
+double secondsFrom( const std::clock_t start )
+{
+	return double( std::clock() - start ) / CLOCKS_PER_SEC;
+}
+
+void run( const std::size_t nbFrames )
+{
+	const EDetection options = eDetectionDefault;
+	std::size_t legacyBytes = 0;
+	std::size_t packedBytes = 0;
+	double packedBuildTime = 0;
+
+	// legacy: one vector and one string per number, for each file
+	{
+		const std::size_t before = allocatedBytes;
+		LegacySeqIdMap sequences;
+		detail::FileStrings stringParts;
+		std::vector<detail::FileNumber> numberParts;
+		LegacyFileNumbers legacyNumberParts;
+		legacyNumberParts.reserve( 10 );
+		for( std::size_t i = 0; i < nbFrames; ++i )
+		{
+			stringParts.clear();
+			numberParts.clear();
+			legacyNumberParts.clear();
+			decomposeFilename( frameName( i ), stringParts, numberParts, options );
+			for( std::size_t n = 0; n < numberParts.size(); ++n )
+				legacyNumberParts.push_back( std::make_pair( numberParts[n].value, numberParts[n].getString() ) );
+			sequences[stringParts].push_back( legacyNumberParts );
+		}
+		legacyBytes = allocatedBytes - before;
+	}
+
+	// packed numbers, grouped in a flat buffer
+	{
+		const std::size_t before = allocatedBytes;
+		detail::SequenceGrouper grouper( options );
+		for( std::size_t i = 0; i < nbFrames; ++i )
+		{
+			grouper.add( frameName( i ) );
+		}
+		packedBytes = allocatedBytes - before;
+
+		const std::clock_t start = std::clock();
+		const std::vector<Sequence> sequences = grouper.buildSequences();
+		packedBuildTime = secondsFrom( start );
+		if( sequences.size() != 1 || sequences.front().getNbFiles() != nbFrames )
+			std::printf( "unexpected sequences\n" );
+	}
+
+	std::printf( "%-10lu %17.1f %17.1f %9.1fx %14.3f\n",
+		(unsigned long)nbFrames,
+		double( legacyBytes ) / nbFrames,
+		double( packedBytes ) / nbFrames,
+		double( legacyBytes ) / packedBytes,
+		packedBuildTime );
+}
+
+}
+
+int main( int argc, char** argv )
+{
+	std::vector<std::size_t> sizes;
+	for( int i = 1; i < argc; ++i )
+		sizes.push_back( std::strtoul( argv[i], NULL, 10 ) );
+	if( sizes.empty() )
+		sizes.push_back( 1000000 );
+
+	std::printf( "%-10s %17s %17s %10s %14s\n", "nbFrames", "legacy bytes/file", "packed bytes/file", "ratio", "build seconds" );
+	for( std::size_t i = 0; i < sizes.size(); ++i )
+	{
+		run( sizes[i] );
+	}
+	return 0;
+}
@@ -0,0 +1,116 @@
+/**
+ * Micro benchmark of the filenames of a sequence, the inner loop of getFiles, explode and the stats.
+ *
+ * Compare the FilenameFormatter, which writes the digits directly in a reused buffer,
+ * with the previous implementation, which used a std::ostringstream per filename.
+ *
+ * Usage: filenameFormatting [nbFrames...] (default: 100000 1000000)
+ */
+#include <sequenceParser/FilenameFormatter.hpp>
+#include <sequenceParser/Sequence.hpp>
+
+#include <ctime>
+#include <cstdio>
+#include <cstdlib>
+#include <cmath>
+#include <iomanip>
+#include <sstream>
+#include <vector>
+#include <string>
+
+using namespace sequenceParser;
+
+namespace {
+
+/**
+ * @brief Previous implementation of Sequence::getFilenameAt, kept as reference.
+ */
+std::string legacyFilenameAt( const Sequence& sequence, const Time time )
+{
+	std::ostringstream o;
+	if( time >= 0 )
+	{
+		o << sequence.getPrefix() << std::setw( sequence.getFixedPadding() ) << std::setfill( '0' ) << time << sequence.getSuffix();
+	}
+	else
+	{
+		o << sequence.getPrefix() << "-" << std::setw( sequence.getFixedPadding() ) << std::setfill( '0' ) << std::abs( (int) time ) << sequence.getSuffix();
+	}
+	return o.str();
+}
+
+double nanosecondsPerFrame( const std::clock_t start, const std::clock_t stop, const std::size_t nbFrames )
+{
+	return ( double( stop - start ) / CLOCKS_PER_SEC ) * 1e9 / nbFrames;
+}
+
+void run( const std::size_t nbFrames, const std::size_t padding )
+{
+	const Time first = -Time( nbFrames / 10 );
+	const Sequence sequence( "shot010_comp_v003.", padding, padding, ".exr", first, first + Time( nbFrames ) - 1 );
+
+	// legacy stream per filename
+	std::size_t legacyLength = 0;
+	const std::clock_t legacyStart = std::clock();
+	for( Time t = first; t < first + Time( nbFrames ); ++t )
+		legacyLength += legacyFilenameAt( sequence, t ).size();
+	const std::clock_t legacyStop = std::clock();
+
+	// formatter with a reused string
+	const FilenameFormatter formatter( sequence );
+	std::string name;
+	std::size_t length = 0;
+	std::size_t nbDifferences = 0;
+	const std::clock_t formatterStart = std::clock();
+	for( Time t = first; t < first + Time( nbFrames ); ++t )
+	{
+		formatter.format( t, name );
+		length += name.size();
+	}
+	const std::clock_t formatterStop = std::clock();
+
+	// all the names in a single buffer
+	const std::clock_t bulkStart = std::clock();
+	const std::string allNames = formatter.formatRanges( sequence.getFrameRanges() );
+	const std::clock_t bulkStop = std::clock();
+
+	// check that both implementations give the same result
+	for( Time t = first; t < first + Time( nbFrames ); ++t )
+	{
+		if( formatter.getNameAt( t ) != legacyFilenameAt( sequence, t ) )
+			++nbDifferences;
+	}
+	if( length != legacyLength || allNames.size() != length + nbFrames - 1 )
+		++nbDifferences;
+
+	const double legacy = nanosecondsPerFrame( legacyStart, legacyStop, nbFrames );
+	const double formatted = nanosecondsPerFrame( formatterStart, formatterStop, nbFrames );
+	const double bulk = nanosecondsPerFrame( bulkStart, bulkStop, nbFrames );
+	std::printf( "%-10lu %-8lu %12.1f %12.1f %12.1f %9.1fx %12lu\n",
+		(unsigned long)nbFrames,
+		(unsigned long)padding,
+		legacy, formatted, bulk, legacy / formatted,
+		(unsigned long)nbDifferences );
+}
+
+}
+
+int main( int argc, char** argv )
+{
+	std::vector<std::size_t> sizes;
+	for( int i = 1; i < argc; ++i )
+		sizes.push_back( std::strtoul( argv[i], NULL, 10 ) );
+	if( sizes.empty() )
+	{
+		sizes.push_back( 100000 );
+		sizes.push_back( 1000000 );
+	}
+
+	std::printf( "%-10s %-8s %12s %12s %12s %10s %12s\n", "nbFrames", "padding", "legacy ns", "format ns", "bulk ns", "speedup", "differences" );
+	for( std::size_t i = 0; i < sizes.size(); ++i )
+	{
+		run( sizes[i], 0 );
+		run( sizes[i], 4 );
+	}
+	return 0;
+}
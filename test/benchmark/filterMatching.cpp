@@ -0,0 +1,180 @@
+/**
+ * Micro benchmark of the browse filters, checked for each entry of a directory.
+ *
+ * Compare the compiled filters (names, suffixes and wildcards without regex)
+ * with the previous implementation, which converted each filter with 8 regexes
+ * for each browse, and matched each filename with each regex.
+ *
+ * Usage: filterMatching [nbNames...] (default: 10000 100000 1000000)
+ */
+#include <sequenceParser/detail/FilenameFilters.hpp>
+
+#include <boost/regex.hpp>
+#include <boost/lexical_cast.hpp>
+#include <boost/foreach.hpp>
+
+#include <ctime>
+#include <cstdio>
+#include <cstdlib>
+#include <vector>
+#include <string>
+
+using namespace sequenceParser;
+
+namespace {
+
+/**
+ * @brief Previous implementation of convertFilterToRegex, kept as reference.
+ * The '.' was any character, so the filters with a '.' can give different results.
+ */
+boost::regex legacyConvertFilterToRegex( const std::string& filter, const EDetection detectOptions )
+{
+	std::string filterToRegex = filter;
+	
+	boost::cmatch match;
+	boost::regex expression( "(.*[%])([0-9]{2})([d].*)" ); // match to pattern like : %04d
+	if( boost::regex_match( filterToRegex.c_str(), match, expression ) )
+	{
+		std::string matched = match[1].second;
+		matched.erase( 2 , matched.size()-2); // keep only numbers
+		const int patternWidth = boost::lexical_cast<int>( matched );
+		std::string replacing( patternWidth, '#' );
+		filterToRegex = boost::regex_replace( filterToRegex, boost::regex( "\\%\\d{1,2}d" ), replacing );
+	}
+
+	// for detect sequence based on a single file
+	if( ( detectOptions & eDetectionSequenceFromFilename ) )
+		filterToRegex = boost::regex_replace( filterToRegex, boost::regex( "\\d" ), "[0-9]" );
+
+	filterToRegex = boost::regex_replace( filterToRegex, boost::regex( "\\*" ), "(.*)" );
+	filterToRegex = boost::regex_replace( filterToRegex, boost::regex( "\\?" ), "(.)" );
+	if( detectOptions & eDetectionNegative )
+	{
+		filterToRegex = boost::regex_replace( filterToRegex, boost::regex( "\\@" ), "[\\-\\+]?[0-9]+" ); // one @ correspond to one or more digits
+		filterToRegex = boost::regex_replace( filterToRegex, boost::regex( "\\#" ), "[\\-\\+]?[0-9]" ); // each # in pattern correspond to a digit
+	}
+	else
+	{
+		filterToRegex = boost::regex_replace( filterToRegex, boost::regex( "\\@" ), "[0-9]+" ); // one @ correspond to one or more digits
+		filterToRegex = boost::regex_replace( filterToRegex, boost::regex( "\\#" ), "[0-9]" ); // each # in pattern correspond to a digit
+	}
+	return boost::regex( filterToRegex );
+}
+
+bool legacyMatch( const std::string& filename, const std::vector<boost::regex>& filters )
+{
+	BOOST_FOREACH( const boost::regex& filter, filters )
+	{
+		if( boost::regex_match( filename, filter ) )
+			return true;
+	}
+	return false;
+}
+
+std::vector<std::string> generateNames( const std::size_t nbNames )
+{
+	std::vector<std::string> names;
+	names.reserve( nbNames );
+	char buffer[256];
+	for( std::size_t i = 0; i < nbNames; ++i )
+	{
+		switch( i % 4 )
+		{
+			case 0:
+				std::sprintf( buffer, "shot%03d_comp_v%03d.%07d.exr", int( i / 40000 ), int( ( i / 10000 ) % 4 ), int( i ) );
+				break;
+			case 1:
+				std::sprintf( buffer, "plate.%d.dpx", int( i ) );
+				break;
+			case 2:
+				std::sprintf( buffer, "render_layer_beauty.%04d.tif", int( i % 10000 ) );
+				break;
+			default:
+				std::sprintf( buffer, "README_%d.txt", int( i ) );
+				break;
+		}
+		names.push_back( buffer );
+	}
+	return names;
+}
+
+double nanosecondsPerEntry( const std::clock_t start, const std::clock_t stop, const std::size_t nbNames )
+{
+	return ( double( stop - start ) / CLOCKS_PER_SEC ) * 1e9 / nbNames;
+}
+
+void run( const std::size_t nbNames, const char* name, const std::vector<std::string>& filters )
+{
+	const std::vector<std::string> names = generateNames( nbNames );
+	std::size_t nbMatches = 0;
+	std::size_t legacyNbMatches = 0;
+	std::size_t nbDifferences = 0;
+
+	// legacy: the filters are converted for each browse, so once per run
+	const std::clock_t legacyStart = std::clock();
+	std::vector<boost::regex> legacyFilters;
+	BOOST_FOREACH( const std::string& filter, filters )
+		legacyFilters.push_back( legacyConvertFilterToRegex( filter, eDetectionDefault ) );
+	for( std::size_t i = 0; i < nbNames; ++i )
+		legacyNbMatches += legacyMatch( names[i], legacyFilters );
+	const std::clock_t legacyStop = std::clock();
+
+	const std::clock_t compiledStart = std::clock();
+	const boost::shared_ptr<const detail::FilenameFilters> compiledFilters = detail::getFilenameFilters( filters, eDetectionDefault );
+	for( std::size_t i = 0; i < nbNames; ++i )
+		nbMatches += compiledFilters->match( names[i] );
+	const std::clock_t compiledStop = std::clock();
+
+	// the differences come from the '.', which is now a dot (it was any character)
+	for( std::size_t i = 0; i < nbNames; ++i )
+	{
+		if( compiledFilters->match( names[i] ) != legacyMatch( names[i], legacyFilters ) )
+			++nbDifferences;
+	}
+
+	const double legacy = nanosecondsPerEntry( legacyStart, legacyStop, nbNames );
+	const double compiled = nanosecondsPerEntry( compiledStart, compiledStop, nbNames );
+	std::printf( "%-10lu %-10s %12.1f %12.1f %9.1fx %10lu %12lu\n",
+		(unsigned long)nbNames, name,
+		legacy, compiled, legacy / compiled,
+		(unsigned long)nbMatches,
+		(unsigned long)nbDifferences );
+	if( nbMatches != legacyNbMatches )
+		std::printf( "different number of matches: %lu (legacy)\n", (unsigned long)legacyNbMatches );
+}
+
+}
+
+int main( int argc, char** argv )
+{
+	std::vector<std::size_t> sizes;
+	for( int i = 1; i < argc; ++i )
+		sizes.push_back( std::strtoul( argv[i], NULL, 10 ) );
+	if( sizes.empty() )
+	{
+		sizes.push_back( 10000 );
+		sizes.push_back( 100000 );
+		sizes.push_back( 1000000 );
+	}
+
+	std::vector<std::string> suffixes;
+	suffixes.push_back( "*.exr" );
+	suffixes.push_back( "*.dpx" );
+	suffixes.push_back( "*.tif" );
+
+	std::vector<std::string> wildcards;
+	wildcards.push_back( "shot###_comp_v###.@.exr" );
+	wildcards.push_back( "render_layer_?????.%04d.tif" );
+
+	std::vector<std::string> regexes;
+	regexes.push_back( "(shot|plate)*.(exr|dpx)" );
+
+	std::printf( "%-10s %-10s %12s %12s %10s %10s %12s\n", "nbNames", "filters", "legacy ns", "compiled ns", "speedup", "matches", "differences" );
+	for( std::size_t i = 0; i < sizes.size(); ++i )
+	{
+		run( sizes[i], "suffixes", suffixes );
+		run( sizes[i], "wildcards", wildcards );
+		run( sizes[i], "regexes", regexes );
+	}
+	return 0;
+}
@@ -0,0 +1,190 @@
+/**
+ * Micro benchmark of the extraction of the step and the ranges of the frames of a sequence.
+ *
+ * Compare with the previous implementations:
+ * - the step was the greatest common divisor of a std::set of all the differences,
+ * - the ranges were extracted from a copy of the frames,
+ * - the frames were sorted with std::sort (instead of a radix sort).
+ *
+ * Usage: frameRanges [nbFrames...] (default: 10000 100000 1000000)
+ */
+#include <sequenceParser/Sequence.hpp>
+#include <sequenceParser/FrameRange.hpp>
+
+#include <boost/random/mersenne_twister.hpp>
+#include <boost/random/uniform_int_distribution.hpp>
+
+#include <algorithm>
+#include <ctime>
+#include <cstdio>
+#include <cstdlib>
+#include <set>
+#include <vector>
+
+using namespace sequenceParser;
+
+namespace {
+
+std::size_t legacyGreatestCommonDivisor( std::size_t a, std::size_t b )
+{
+	std::size_t r;
+	if( b == 0 )
+		return 0;
+	while( ( r = a % b ) != 0 )
+	{
+		a = b;
+		b = r;
+	}
+	return b;
+}
+
+std::size_t legacyGreatestCommonDivisor( const std::set<std::size_t>& steps )
+{
+	if( steps.size() == 1 )
+	{
+		return *steps.begin();
+	}
+	std::set<std::size_t> allSteps;
+	for( std::set<std::size_t>::const_iterator itA = steps.begin(), itB = ++steps.begin(), itEnd = steps.end(); itB != itEnd; ++itA, ++itB )
+	{
+		allSteps.insert( legacyGreatestCommonDivisor( *itB, *itA ) );
+	}
+	return legacyGreatestCommonDivisor( allSteps );
+}
+
+/**
+ * @brief Previous implementation of extractStep, kept as reference.
+ */
+std::size_t legacyExtractStep( const std::vector<Time>& times )
+{
+	if( times.size() <= 1 )
+	{
+		return 1;
+	}
+	std::set<std::size_t> allSteps;
+	for( std::vector<Time>::const_iterator itA = times.begin(), itB = ++times.begin(), itEnd = times.end(); itB != itEnd; ++itA, ++itB )
+	{
+		allSteps.insert( *itB - *itA );
+	}
+	return legacyGreatestCommonDivisor( allSteps );
+}
+
+/**
+ * @brief A parsed filename, like the numbers of a filename during a browse.
+ */
+struct ParsedFilename
+{
+	Time otherNumber;
+	Time time;
+};
+
+/**
+ * @brief Sorted frames with a step of 2, and some holes and some steps of 4.
+ */
+std::vector<Time> generateFrames( const std::size_t nbFrames )
+{
+	std::vector<Time> frames;
+	frames.reserve( nbFrames );
+	Time time = -1000;
+	for( std::size_t i = 0; i < nbFrames; ++i )
+	{
+		time += ( i % 1000 == 999 ) ? 20 : ( ( i / 5000 ) % 2 ? 4 : 2 );
+		frames.push_back( time );
+	}
+	return frames;
+}
+
+double nanosecondsPerFrame( const std::clock_t start, const std::clock_t stop, const std::size_t nbFrames )
+{
+	return ( double( stop - start ) / CLOCKS_PER_SEC ) * 1e9 / nbFrames;
+}
+
+void printResult( const std::size_t nbFrames, const char* name, const double legacy, const double current, const bool same )
+{
+	std::printf( "%-10lu %-8s %12.2f %12.2f %9.1fx %6s\n",
+		(unsigned long)nbFrames, name, legacy, current, legacy / current, same ? "yes" : "NO" );
+}
+
+void run( const std::size_t nbFrames )
+{
+	const std::vector<Time> frames = generateFrames( nbFrames );
+
+	// step
+	std::clock_t start = std::clock();
+	const std::size_t legacyStep = legacyExtractStep( frames );
+	std::clock_t stop = std::clock();
+	const double legacyStepTime = nanosecondsPerFrame( start, stop, nbFrames );
+
+	start = std::clock();
+	const std::size_t step = extractStep( frames );
+	stop = std::clock();
+	printResult( nbFrames, "step", legacyStepTime, nanosecondsPerFrame( start, stop, nbFrames ), step == legacyStep );
+
+	// ranges from parsed filenames
+	std::vector<ParsedFilename> filenames( nbFrames );
+	for( std::size_t i = 0; i < nbFrames; ++i )
+	{
+		filenames[i].otherNumber = 1;
+		filenames[i].time = frames[i];
+	}
+
+	start = std::clock();
+	std::vector<Time> times;
+	times.reserve( filenames.size() );
+	for( std::size_t i = 0; i < filenames.size(); ++i )
+		times.push_back( filenames[i].time );
+	const std::vector<FrameRange> legacyRanges = extractFrameRanges( times );
+	stop = std::clock();
+	const double legacyRangesTime = nanosecondsPerFrame( start, stop, nbFrames );
+
+	start = std::clock();
+	std::vector<FrameRange> ranges;
+	FrameRangesBuilder builder( ranges );
+	for( std::size_t i = 0; i < filenames.size(); ++i )
+		builder.add( filenames[i].time );
+	builder.finish();
+	stop = std::clock();
+	printResult( nbFrames, "ranges", legacyRangesTime, nanosecondsPerFrame( start, stop, nbFrames ), ranges == legacyRanges );
+
+	// sort of the frames, read in the order of the directory
+	std::vector<Time> shuffled( frames );
+	boost::random::mt19937 generator( 42 );
+	for( std::size_t i = shuffled.size(); i > 1; --i )
+	{
+		boost::random::uniform_int_distribution<std::size_t> distribution( 0, i - 1 );
+		std::swap( shuffled[i - 1], shuffled[distribution( generator )] );
+	}
+	std::vector<Time> legacySorted( shuffled );
+	start = std::clock();
+	std::sort( legacySorted.begin(), legacySorted.end() );
+	stop = std::clock();
+	const double legacySortTime = nanosecondsPerFrame( start, stop, nbFrames );
+
+	std::vector<Time> sorted( shuffled );
+	start = std::clock();
+	sortFrames( sorted );
+	stop = std::clock();
+	printResult( nbFrames, "sort", legacySortTime, nanosecondsPerFrame( start, stop, nbFrames ), sorted == legacySorted && sorted == frames );
+}
+
+}
+
+int main( int argc, char** argv )
+{
+	std::vector<std::size_t> sizes;
+	for( int i = 1; i < argc; ++i )
+		sizes.push_back( std::strtoul( argv[i], NULL, 10 ) );
+	if( sizes.empty() )
+	{
+		sizes.push_back( 10000 );
+		sizes.push_back( 100000 );
+		sizes.push_back( 1000000 );
+	}
+
+	std::printf( "%-10s %-8s %12s %12s %10s %6s\n", "nbFrames", "measure", "legacy ns", "current ns", "speedup", "same" );
+	for( std::size_t i = 0; i < sizes.size(); ++i )
+	{
+		run( sizes[i] );
+	}
+	return 0;
+}
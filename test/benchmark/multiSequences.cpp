@@ -0,0 +1,125 @@
+/**
+ * Benchmark of the detection of the sequences in filenames with several varying numbers.
+ *
+ * The filenames with the same fixed numbers are grouped with a hash for each varying number,
+ * so the time should grow linearly with the number of files:
+ * - versions: "comp_v###.####.exr", some versions of the same frames,
+ * - shots: "sq##_sh####_v##.####.exr", some shots with several versions in the same folder,
+ * - interleaved: "a#b#c#.j2c", every combination of 3 numbers.
+ *
+ * Usage: multiSequences [nbFiles...] (default: 10000 100000 1000000)
+ */
+#include <sequenceParser/detail/SequenceGrouper.hpp>
+
+#include <boost/foreach.hpp>
+#include <boost/random/mersenne_twister.hpp>
+
+#include <algorithm>
+#include <ctime>
+#include <cstdio>
+#include <cstdlib>
+#include <string>
+#include <vector>
+
+using namespace sequenceParser;
+
+namespace {
+
+std::string versionsName( const std::size_t i, const std::size_t nbFiles )
+{
+	const std::size_t nbVersions = 20;
+	const std::size_t nbFrames = std::max( nbFiles / nbVersions, std::size_t( 1 ) );
+	char buffer[256];
+	std::sprintf( buffer, "comp_v%03d.%04d.exr", int( i / nbFrames + 1 ), int( i % nbFrames + 1 ) );
+	return buffer;
+}
+
+std::string shotsName( const std::size_t i, const std::size_t )
+{
+	const std::size_t nbFrames = 100;
+	const std::size_t nbVersions = 5;
+	const std::size_t shot = i / ( nbFrames * nbVersions );
+	char buffer[256];
+	std::sprintf( buffer, "sq%02d_sh%04d_v%02d.%04d.exr", int( shot / 100 ), int( shot % 100 * 10 ), int( i / nbFrames % nbVersions + 1 ), int( i % nbFrames + 1001 ) );
+	return buffer;
+}
+
+std::string interleavedName( const std::size_t i, const std::size_t )
+{
+	const std::size_t side = 100;
+	char buffer[256];
+	std::sprintf( buffer, "a%db%dc%d.j2c", int( i / ( side * side ) ), int( i / side % side ), int( i % side ) );
+	return buffer;
+}
+
+typedef std::string (*NameFunction)( const std::size_t i, const std::size_t nbFiles );
+
+double secondsFrom( const std::clock_t start )
+{
+	return double( std::clock() - start ) / CLOCKS_PER_SEC;
+}
+
+void run( const char* layout, NameFunction name, const std::size_t nbFiles )
+{
+	// the files of a directory are not sorted
+	std::vector<std::string> filenames;
+	filenames.reserve( nbFiles );
+	for( std::size_t i = 0; i < nbFiles; ++i )
+	{
+		filenames.push_back( name( i, nbFiles ) );
+	}
+	boost::random::mt19937 generator( 42 );
+	for( std::size_t i = filenames.size(); i > 1; --i )
+	{
+		std::swap( filenames[i - 1], filenames[generator() % i] );
+	}
+
+	detail::SequenceGrouper grouper( eDetectionDefault );
+	BOOST_FOREACH( const std::string& filename, filenames )
+	{
+		grouper.add( filename );
+	}
+
+	const std::clock_t start = std::clock();
+	const std::vector<Sequence> sequences = grouper.buildSequences();
+	const double buildTime = secondsFrom( start );
+
+	std::size_t nbSequenceFiles = 0;
+	BOOST_FOREACH( const Sequence& sequence, sequences )
+	{
+		nbSequenceFiles += sequence.getNbFiles();
+	}
+	if( nbSequenceFiles != nbFiles )
+		std::printf( "unexpected sequences\n" );
+
+	std::printf( "%-12s %-10lu %10lu %14.3f %17.3f\n",
+		layout,
+		(unsigned long)nbFiles,
+		(unsigned long)sequences.size(),
+		buildTime,
+		buildTime * 1e6 / nbFiles );
+}
+
+}
+
+int main( int argc, char** argv )
+{
+	std::vector<std::size_t> sizes;
+	for( int i = 1; i < argc; ++i )
+		sizes.push_back( std::strtoul( argv[i], NULL, 10 ) );
+	if( sizes.empty() )
+	{
+		sizes.push_back( 10000 );
+		sizes.push_back( 100000 );
+		sizes.push_back( 1000000 );
+	}
+
+	std::printf( "%-12s %-10s %10s %14s %17s\n", "layout", "nbFiles", "sequences", "build seconds", "microseconds/file" );
+	for( std::size_t i = 0; i < sizes.size(); ++i )
+	{
+		run( "versions", &versionsName, sizes[i] );
+		run( "shots", &shotsName, sizes[i] );
+		run( "interleaved", &interleavedName, sizes[i] );
+	}
+	return 0;
+}
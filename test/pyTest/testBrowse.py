@@ -61,3 +61,256 @@ def testBrowse():
             for f in sequence.getFramesIterable():
                 print("file:", sequence.getFilenameAt(f))
 
+
+
+def testBrowseWithoutStatPerEntry():
+    """
+    Check that the type of the entries comes from the directory read,
+    without a stat per entry.
+    """
+    global root_path
+    seq.resetFilesystemCounters()
+    items = seq.browse(root_path)
+    counters = seq.getFilesystemCounters()
+    # only the stat of the browsed directory
+    assert_equals(counters.nbStat, 1)
+    assert_equals(counters.nbOpenDirectory, 1)
+    assert_greater_equal(counters.nbReadDirectory, 16)
+
+    types = dict((item.getFilename(), item.getType()) for item in items)
+    assert_equals(types["plop.txt"], seq.eTypeFile)
+    assert_equals(types["dir1"], seq.eTypeFolder)
+    assert_equals(types["dir_d"], seq.eTypeFolder)
+    assert_equals(types["foo.###.png"], seq.eTypeSequence)
+
+
+def testBrowsePattern():
+    """
+    Check browse of a pattern inside a directory.
+    """
+    global root_path
+    items = seq.browse(os.path.join(root_path, "foo.###.png"))
+    assert_equals(len(items), 1)
+    assert_equals(items[0].getType(), seq.eTypeSequence)
+    assert_equals(items[0].getFolder(), root_path)
+    assert_equals(items[0].getSequence().getNbFiles(), 4)
+
+
+def testBrowseSequence():
+    """
+    Check the detection of the frames of a sequence from its pattern.
+    """
+    global root_path
+    sequence = seq.Sequence()
+    assert_true(seq.browseSequence(sequence, os.path.join(root_path, "foo.###.png")))
+    assert_equals(sequence.getNbFiles(), 4)
+    assert_equals(sequence.getFirstTime(), 1)
+    assert_equals(sequence.getLastTime(), 6)
+    assert_true(sequence.contains(6))
+    assert_false(sequence.contains(5))
+
+
+def testBrowseBigSequence():
+    """
+    Check the ranges of a sequence with more frames than the threshold of the radix sort.
+    """
+    global root_path
+    sequencePath = tempfile.mkdtemp(dir=root_path)
+    for i in list(range(-2000, 2000, 2)) + [5000]:
+        open(os.path.join(sequencePath, "big.%05d.exr" % i), "w").close()
+    sequence = seq.Sequence()
+    assert_true(seq.browseSequence(sequence, os.path.join(sequencePath, "big.#####.exr"), seq.ePatternAll))
+    assert_equals([str(r) for r in sequence.getFrameRanges()], ["-2000:1998x2", "5000"])
+
+
+def testBrowseSequenceExpectedRanges():
+    """
+    Check that the frames of a sequence are checked one by one when only a few are expected,
+    and that the whole directory is read when most of them are expected.
+    """
+    global root_path
+    sequencePath = tempfile.mkdtemp(dir=root_path)
+    for i in range(1, 201):
+        if i != 50:
+            open(os.path.join(sequencePath, "plop.%04d.exr" % i), "w").close()
+    pattern = os.path.join(sequencePath, "plop.####.exr")
+
+    # a few frames: a stat per frame, without reading the directory
+    seq.resetFilesystemCounters()
+    sequence = seq.Sequence()
+    expected = seq.FrameRangeVector()
+    expected.append(seq.FrameRange(48, 52, 2))
+    assert_true(seq.browseSequence(sequence, pattern, expected))
+    counters = seq.getFilesystemCounters()
+    assert_equals(counters.nbReadDirectory, 0)
+    assert_equals(counters.nbStat, 3 + 1)
+    assert_equals([t for t in sequence.getFramesIterable()], [48, 52])
+
+    # all the frames: read the directory, with the same result as without expected frames
+    seq.resetFilesystemCounters()
+    expected = seq.FrameRangeVector()
+    expected.append(seq.FrameRange(1, 300, 1))
+    assert_true(seq.browseSequence(sequence, pattern, expected))
+    assert_equals(seq.getFilesystemCounters().nbReadDirectory, 199)
+    fullSequence = seq.Sequence()
+    assert_true(seq.browseSequence(fullSequence, pattern))
+    assert_equals(list(sequence.getFramesIterable()), list(fullSequence.getFramesIterable()))
+    assert_equals(sequence.getNbFiles(), 199)
+
+    # a huge range is not expanded: the directory is read, and filtered with the step
+    seq.resetFilesystemCounters()
+    expected = seq.FrameRangeVector()
+    expected.append(seq.FrameRange(1, 2 ** 62 + 1, 2))
+    assert_true(seq.browseSequence(sequence, pattern, expected))
+    assert_equals(seq.getFilesystemCounters().nbReadDirectory, 199)
+    assert_equals(list(sequence.getFramesIterable()), list(range(1, 200, 2)))
+
+    # a range ending at the max frame doesn't overflow
+    expected = seq.FrameRangeVector()
+    expected.append(seq.FrameRange(2 ** 63 - 3, 2 ** 63 - 1))
+    assert_true(seq.browseSequence(sequence, pattern, expected))
+    assert_equals(sequence.getNbFiles(), 0)
+
+    invalidRange = seq.FrameRange(1, 10)
+    invalidRange.step = 0
+    expected = seq.FrameRangeVector()
+    expected.append(invalidRange)
+    assert_raises(ValueError, seq.browseSequence, sequence, pattern, expected)
+
+
+def testBrowseFilters():
+    """
+    Check the browse with each kind of filters: names, suffixes, wildcards and regexes.
+    """
+    global root_path
+    filtersPath = tempfile.mkdtemp(dir=root_path)
+    for f in ["a.0001.exr", "a.0002.exr", "b.exr", "bXexr", "readme.txt", "img-1.dpx"]:
+        open(os.path.join(filtersPath, f), "w").close()
+
+    def browseNames(filters, options=seq.eDetectionDefault):
+        items = seq.browse(filtersPath, options, filters)
+        return sorted([item.getFilename() for item in items])
+
+    assert_equals(browseNames([]), ["a.####.exr", "b.exr", "bXexr", "img-1.dpx", "readme.txt"])
+    assert_equals(browseNames(["readme.txt"]), ["readme.txt"])
+    # the dot is not a wildcard
+    assert_equals(browseNames(["*.exr"]), ["a.####.exr", "b.exr"])
+    assert_equals(browseNames(["b*"]), ["b.exr", "bXexr"])
+    assert_equals(browseNames(["a.####.exr"]), ["a.####.exr"])
+    assert_equals(browseNames(["a.%04d.exr"]), ["a.####.exr"])
+    assert_equals(browseNames(["a.@.exr", "*.txt"]), ["a.####.exr", "readme.txt"])
+    assert_equals(browseNames(["?.exr"]), ["b.exr"])
+    assert_equals(browseNames(["img#.dpx"]), [])
+    assert_equals(len(browseNames(["img#.dpx"], seq.eDetectionNegative)), 1)
+    # the other characters keep their regex meaning
+    assert_equals(browseNames(["(b|r)*"]), ["b.exr", "bXexr", "readme.txt"])
+    assert_equals(browseNames(["[ab].*"]), ["a.####.exr", "b.exr"])
+    # an escaped character keeps its regex meaning
+    assert_equals(browseNames([r"b\.exr"]), ["b.exr"])
+    assert_equals(browseNames([r"[ab]\.exr"]), ["b.exr"])
+    assert_equals(browseNames([r"img-\d\.dpx"]), ["img-1.dpx"])
+    assert_equals(browseNames([r"(b|c)\.exr"]), ["b.exr"])
+
+
+def testBrowseRecords():
+    """
+    Check that the columns of a browse give the same items as the browse.
+    """
+    global root_path
+    items = seq.browse(root_path)
+    records = seq.browseRecords(root_path)
+    assert_equals(len(records), len(items))
+
+    types = records.getTypes()
+    names = records.getNames()
+    folders = records.getFolders()
+    folderIndices = records.getFolderIndices()
+    firstTimes = records.getFirstTimes()
+    lastTimes = records.getLastTimes()
+    nbFiles = records.getNbFiles()
+    rangeOffsets = records.getRangeOffsets()
+    ranges = records.getRanges()
+    assert_equals(folders, [root_path])
+    assert_equals(len(rangeOffsets), len(items) + 1)
+
+    expected = sorted((item.getType(), item.getFilename()) for item in items)
+    assert_equals(sorted(zip(types.tolist(), names)), expected)
+    for i, item in enumerate(items):
+        assert_equals(folders[folderIndices[i]], item.getFolder())
+        assert_equals(records[i].getAbsoluteFilepath(), item.getAbsoluteFilepath())
+        if item.getType() != seq.eTypeSequence:
+            assert_equals(nbFiles[i], 1)
+            assert_equals(rangeOffsets[i + 1], rangeOffsets[i])
+            continue
+        sequence = item.getSequence()
+        assert_equals(records.getPrefixes()[i], sequence.getPrefix())
+        assert_equals(records.getSuffixes()[i], sequence.getSuffix())
+        assert_equals(records.getFixedPaddings()[i], sequence.getFixedPadding())
+        assert_equals((firstTimes[i], lastTimes[i], nbFiles[i]), (sequence.getFirstTime(), sequence.getLastTime(), sequence.getNbFiles()))
+        itemRanges = ranges.tolist()[rangeOffsets[i]:rangeOffsets[i + 1]]
+        assert_equals(itemRanges, sequence.getRangesBuffer().tolist())
+        recordItem = records[i]
+        assert_equals(str(recordItem.getSequence()), str(sequence))
+
+    # records of any list of items
+    assert_equals(seq.BrowseRecords(items).getNames(), names)
+    assert_raises(IndexError, records.getItem, len(items))
+
+
+def testBrowseCache():
+    """
+    Check that a browse cache reads a directory again only if it has changed.
+    """
+    # a separate root: the mtimes are changed, and the shared one is browsed by other tests
+    cacheRoot = tempfile.mkdtemp()
+    try:
+        checkBrowseCache(cacheRoot)
+    finally:
+        shutil.rmtree(cacheRoot)
+
+
+def checkBrowseCache(cacheRoot):
+    browsePath = os.path.join(cacheRoot, "browse")
+    os.mkdir(browsePath)
+    otherPath = os.path.join(cacheRoot, "other")
+    os.mkdir(otherPath)
+    for i in range(1, 4):
+        open(os.path.join(browsePath, "bar.%d.exr" % i), 'w').close()
+    # a directory modified in the last second is not cached
+    past = os.stat(browsePath).st_mtime - 10
+    os.utime(browsePath, (past, past))
+
+    cache = seq.BrowseCache(2)
+    items = cache.browse(browsePath)
+    assert_equals(cache.getCounters().nbMisses, 1)
+
+    # a single stat of the directory
+    seq.resetFilesystemCounters()
+    cachedItems = cache.browse(browsePath)
+    assert_equals(seq.getFilesystemCounters().nbStat, 1)
+    assert_equals(seq.getFilesystemCounters().nbOpenDirectory, 0)
+    assert_equals(cache.getCounters().nbHits, 1)
+    assert_equals([str(item) for item in cachedItems], [str(item) for item in items])
+
+    # other options
+    cache.browse(browsePath, seq.eDetectionDefault, ["*.exr"])
+    assert_equals(cache.getCounters().nbMisses, 2)
+    assert_equals(cache.size(), 2)
+
+    # a new file changes the directory
+    open(os.path.join(browsePath, "bar.4.exr"), 'w').close()
+    os.utime(browsePath, (past + 1, past + 1))
+    items = cache.browse(browsePath)
+    assert_equals(cache.getCounters().nbMisses, 3)
+    assert_equals(items[0].getSequence().getNbFiles(), 4)
+
+    # least recently used results are evicted
+    os.utime(otherPath, (past, past))
+    cache.browse(otherPath)
+    assert_equals(cache.getCounters().nbEvictions, 1)
+    assert_equals(cache.size(), 2)
+
+    cache.clear()
+    cache.resetCounters()
+    assert_equals(cache.size(), 0)
+    assert_equals(cache.getCounters().nbHits, 0)
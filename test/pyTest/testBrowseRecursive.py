@@ -0,0 +1,117 @@
+import tempfile
+import os
+import shutil
+import threading
+
+from pySequenceParser import sequenceParser as seq
+
+from nose.tools import *
+
+root_path = ''
+
+
+def setUp():
+    global root_path
+    root_path = tempfile.mkdtemp()
+    dirs_to_create = [
+        "shot1",
+        "shot1/comp",
+        "shot1/comp/v001",
+        "shot2",
+        ".hidden",
+    ]
+    for d in dirs_to_create:
+        os.mkdir(os.path.join(root_path, d))
+    files_to_create = [
+        "readme.txt",
+        "shot1/comp/v001/img.0001.exr",
+        "shot1/comp/v001/img.0002.exr",
+        "shot1/comp/v001/img.0003.exr",
+        "shot2/plate.1.dpx",
+        "shot2/plate.2.dpx",
+        ".hidden/file.1.txt",
+        ".hidden/file.2.txt",
+    ]
+    for f in files_to_create:
+        # create an empty file
+        open(os.path.join(root_path, f), 'w').close()
+
+
+def tearDown():
+    global root_path
+    shutil.rmtree(root_path)
+
+
+def getRelativePaths(items):
+    global root_path
+    return sorted([os.path.relpath(item.getAbsoluteFilepath(), root_path) for item in items])
+
+
+def testBrowseRecursive():
+    global root_path
+    expected = [
+        ".hidden",
+        ".hidden/file.@.txt",
+        "readme.txt",
+        "shot1",
+        "shot1/comp",
+        "shot1/comp/v001",
+        "shot1/comp/v001/img.####.exr",
+        "shot2",
+        "shot2/plate.@.dpx",
+    ]
+    for nbThreads in (0, 1, 4):
+        items = seq.browseRecursive(root_path, seq.eDetectionDefaultWithDotFile, [], -1, nbThreads)
+        assert_equals(getRelativePaths(items), expected)
+
+
+def testBrowseRecursiveSameAsBrowse():
+    global root_path
+    items = seq.browseRecursive(root_path, seq.eDetectionDefaultWithDotFile, [], 0)
+    assert_equals(getRelativePaths(items), getRelativePaths(seq.browse(root_path, seq.eDetectionDefaultWithDotFile)))
+
+
+def testBrowseRecursiveMaxDepth():
+    global root_path
+    items = seq.browseRecursive(root_path, seq.eDetectionDefaultWithDotFile, [], 1)
+    assert_equals(getRelativePaths(items), [
+        ".hidden",
+        ".hidden/file.@.txt",
+        "readme.txt",
+        "shot1",
+        "shot1/comp",
+        "shot2",
+        "shot2/plate.@.dpx",
+        ])
+
+
+def testBrowseRecursiveOptions():
+    global root_path
+    # the hidden folders are not browsed
+    items = seq.browseRecursive(root_path)
+    paths = getRelativePaths(items)
+    assert_false(".hidden/file.@.txt" in paths)
+    assert_true("shot1/comp/v001/img.####.exr" in paths)
+
+    # the folders which don't respect the filters are browsed anyway
+    items = seq.browseRecursive(root_path, seq.eDetectionDefault, ["*.exr"])
+    assert_equals(getRelativePaths(items), ["shot1/comp/v001/img.####.exr"])
+
+
+def testBrowseRecursiveNoDirectory():
+    # like browse, nothing is found in a directory which doesn't exist
+    assert_equals(len(seq.browseRecursive("/this/path/does/not/exist")), 0)
+
+
+def testBrowseRecursiveReleaseGIL():
+    """
+    The browse doesn't block the other Python threads.
+    """
+    global root_path
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(len(seq.browseRecursive(root_path)))) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert_equals(results, [7] * 4)
@@ -0,0 +1,67 @@
+from pySequenceParser import sequenceParser as seq
+
+from nose.tools import *
+
+
+def testDetectSequences():
+    """
+    Check sequence detection from a list of names, without any filesystem.
+    """
+    names = [
+        "foo.001.png",
+        "foo.002.png",
+        "foo.003.png",
+        "foo.006.png",
+        "plop.txt",
+        "bar.1.exr",
+    ]
+    nonSequence = seq.StringVector()
+    sequences = seq.detectSequences(nonSequence, names)
+    assert_equals(len(sequences), 1)
+
+    sequence = sequences[0]
+    assert_equals(sequence.getFilenameWithStandardPattern(), "foo.###.png")
+    assert_equals(sequence.getFirstTime(), 1)
+    assert_equals(sequence.getLastTime(), 6)
+    assert_equals(sequence.getNbFiles(), 4)
+
+    # a sequence needs at least two files by default
+    assert_equals(sorted(nonSequence), ["bar.1.exr", "plop.txt"])
+
+
+def testDetectSequencesOptions():
+    """
+    Check sequence detection from a list of names with detection options.
+    """
+    names = [
+        ".hidden.1.txt",
+        ".hidden.2.txt",
+        "neg.-2.exr",
+        "neg.-1.exr",
+        "neg.0.exr",
+        "neg.1.exr",
+        "single.1.exr",
+    ]
+    sequences = seq.detectSequences(names, seq.eDetectionDefault)
+    assert_equals(sorted([s.getFilenameWithStandardPattern() for s in sequences]), ["neg.-@.exr", "neg.@.exr"])
+
+    nonSequence = seq.StringVector()
+    sequences = seq.detectSequences(nonSequence, names, seq.eDetectionNegative)
+    patterns = sorted([s.getFilenameWithStandardPattern() for s in sequences])
+    assert_equals(patterns, [".hidden.@.txt", "neg.@.exr", "single.@.exr"])
+    for sequence in sequences:
+        if sequence.getPrefix() == "neg.":
+            assert_equals(sequence.getFirstTime(), -2)
+            assert_equals(sequence.getLastTime(), 1)
+    assert_equals(len(nonSequence), 0)
+
+
+def testDetectSequencesMultiPadding():
+    """
+    Check sequence detection from a list of names with multiple paddings.
+    """
+    names = ["a%d.jpg" % i for i in range(1, 20)] + ["a%03d.jpg" % i for i in range(1, 20)]
+    sequences = seq.detectSequences(names)
+    assert_equals(len(sequences), 2)
+    paddings = sorted([s.getFixedPadding() for s in sequences])
+    assert_equals(paddings, [0, 3])
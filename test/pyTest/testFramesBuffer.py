@@ -0,0 +1,71 @@
+import array
+
+from pySequenceParser import sequenceParser as seq
+
+from nose.tools import *
+
+
+def testFramesBuffer():
+    """
+    Check the export of the frames and the ranges of a sequence in int64 buffers.
+    """
+    sequence = seq.Sequence.fromFrames("foo.####.exr", [10, 2, 4, 6, 8, 20, 4])
+    assert_equals(sequence.getFilenameWithStandardPattern(), "foo.####.exr")
+
+    frames = sequence.getFramesBuffer()
+    assert_equals(frames.format, "q")
+    assert_equals(frames.itemsize, 8)
+    assert_equals(frames.tolist(), [2, 4, 6, 8, 10, 20])
+    assert_equals(frames.tolist(), list(sequence.getFramesIterable()))
+    assert_equals(sequence.getFramesIterable().getFramesBuffer().tolist(), frames.tolist())
+
+    ranges = sequence.getRangesBuffer()
+    assert_equals(ranges.shape, (2, 3))
+    assert_equals(ranges.tolist(), [[2, 10, 2], [20, 20, 1]])
+    assert_equals(sequence.getFrameRanges().getRangesBuffer().tolist(), ranges.tolist())
+    assert_equals(sequence.getFrameRanges().getFramesBuffer().tolist(), frames.tolist())
+
+    # an empty sequence
+    empty = seq.Sequence.fromFrames("foo.####.exr", [])
+    assert_equals(len(empty.getFramesBuffer()), 0)
+    assert_equals(len(empty.getRangesBuffer()), 0)
+
+    # the ranges modified from python are checked
+    for first, last, step in [(1, 5, 0), (1, 5, -1), (5, 1, 1)]:
+        invalidRange = seq.FrameRange(1, 5)
+        invalidRange.step = step
+        invalidRange.first = first
+        invalidRange.last = last
+        ranges = seq.FrameRangeVector()
+        ranges.append(invalidRange)
+        assert_raises(ValueError, ranges.getFramesBuffer)
+        assert_raises(ValueError, ranges.getRangesBuffer)
+
+    # the last frames of the type
+    ranges = seq.FrameRangeVector()
+    ranges.append(seq.FrameRange(2 ** 63 - 3, 2 ** 63 - 1))
+    assert_equals(ranges.getFramesBuffer().tolist(), [2 ** 63 - 3, 2 ** 63 - 2, 2 ** 63 - 1])
+
+
+def testSequenceFromBuffer():
+    """
+    Check the creation of a sequence from a buffer of frames, like a numpy array.
+    """
+    for typecode in ["q", "l", "i", "h", "H"]:
+        frames = array.array(typecode, range(1, 101))
+        sequence = seq.Sequence.fromFrames("foo.####.exr", frames)
+        assert_equals(sequence.getFirstTime(), 1)
+        assert_equals(sequence.getLastTime(), 100)
+        assert_equals(sequence.getNbFiles(), 100)
+
+    # the buffer of a sequence gives the same sequence
+    negative = seq.Sequence.fromFrames("foo.@.exr", array.array("q", [-3, -1, 1, 3]), seq.ePatternAll)
+    copy = seq.Sequence.fromFrames("foo.@.exr", negative.getFramesBuffer(), seq.ePatternAll)
+    assert_equals(str(copy.getFramesIterable()), str(negative.getFramesIterable()))
+    assert_equals(copy.getFirstTime(), -3)
+
+    assert_raises(ValueError, seq.Sequence.fromFrames, "foo.####.exr", array.array("d", [1.0, 2.0]))
+    assert_raises(ValueError, seq.Sequence.fromFrames, "foo.####.exr", array.array("Q", [2 ** 63]))
+    assert_equals(seq.Sequence.fromFrames("foo.@.exr", array.array("Q", [2 ** 63 - 1])).getLastTime(), 2 ** 63 - 1)
+    assert_raises(ValueError, seq.Sequence.fromFrames, "foo.####.exr", ["a", "b"])
+    assert_raises(ValueError, seq.Sequence.fromFrames, "foo.exr", [1, 2])
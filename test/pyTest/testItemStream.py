@@ -0,0 +1,75 @@
+import tempfile
+import os
+import shutil
+
+from pySequenceParser import sequenceParser as seq
+
+from nose.tools import *
+
+root_path = ''
+
+
+def setUp():
+    global root_path
+    root_path = tempfile.mkdtemp()
+    files_to_create = [
+        "plop.txt",
+        "foo.001.png",
+        "foo.002.png",
+        "foo.003.png",
+        "foo.006.png",
+        "a.1",
+        "bar_0100.dpx",
+        "bar_0101.dpx",
+    ]
+    for f in files_to_create:
+        # create an empty file
+        open(os.path.join(root_path, f), 'w').close()
+    os.mkdir(os.path.join(root_path, "dir1"))
+
+
+def tearDown():
+    global root_path
+    shutil.rmtree(root_path)
+
+
+def testItemStream():
+    """
+    The stream gives the same items as browse.
+    """
+    global root_path
+    streamed = [item.getAbsoluteFilepath() for item in seq.ItemStream(root_path)]
+    browsed = [item.getAbsoluteFilepath() for item in seq.browse(root_path)]
+    assert_equals(sorted(streamed), sorted(browsed))
+    assert_equals(len(streamed), 5)
+
+
+def testItemStreamOrder():
+    """
+    The files without number are given before the sequences.
+    """
+    global root_path
+    items = list(seq.ItemStream(root_path))
+    types = [item.getType() for item in items]
+    assert_equals(sorted(types[:2]), sorted([seq.eTypeFile, seq.eTypeFolder]))
+    assert_equals(types[2:].count(seq.eTypeSequence), 2)
+    assert_equals(items[0].getFolder(), root_path)
+
+
+def testItemStreamNext():
+    global root_path
+    stream = seq.ItemStream(root_path, seq.eDetectionDefault, ["*.dpx"])
+    item = next(stream)
+    assert_equals(item.getType(), seq.eTypeSequence)
+    assert_equals(item.getFilename(), "bar_####.dpx")
+    assert_raises(StopIteration, next, stream)
+    # the stream stays at its end
+    assert_raises(StopIteration, next, stream)
+
+
+def testItemStreamPattern():
+    global root_path
+    items = list(seq.ItemStream(os.path.join(root_path, "foo.###.png")))
+    assert_equals(len(items), 1)
+    assert_equals(items[0].getSequence().getNbFiles(), 4)
+    assert_equals(len(list(seq.ItemStream("/this/path/does/not/exist"))), 0)
@@ -209,3 +209,25 @@ def testMultiSequenceSingleFile():
     assert_equals(listSequence[0].getSequence().getFirstTime(), 1)
     assert_equals(listSequence[0].getSequence().getLastTime(), 1)
     assert_equals(listSequence[0].getSequence().getNbFiles(), 1)
+
+
+def setUpMultiSequenceVersions():
+    global path_bbb
+    path_bbb = tempfile.mkdtemp('bbb', dir=root_aaa)
+    # create sequences comp_v00#.####.exr, with the same frames in each version
+    for version in range(1, 4):
+        for frame in range(1001, 1011):
+            createFile(path_bbb, 'comp_v%03d.%04d.exr' % (version, frame))
+
+
+@with_setup(setUpMultiSequenceVersions, tearDownOneTest)
+def testMultiSequenceVersions():
+    """
+    Check sequence detection with several versions of the same frames: a sequence per version.
+    """
+    listSequence = getSequencesFromPath(path_bbb, seq.eDetectionDefault)
+    assert_equals(len(listSequence), 3)
+    for item in listSequence:
+        assert_equals(item.getSequence().getFirstTime(), 1001)
+        assert_equals(item.getSequence().getLastTime(), 1010)
+        assert_equals(item.getSequence().getNbFiles(), 10)
@@ -0,0 +1,104 @@
+import os
+import shutil
+import tempfile
+
+from pySequenceParser import sequenceParser as seq
+from . import createFile
+
+from nose.tools import *
+
+
+root_path = ""
+
+
+def setUp():
+    global root_path
+    root_path = tempfile.mkdtemp()
+    os.mkdir(os.path.join(root_path, "sub"))
+    for i in range(1, 21):
+        createFile(root_path, "img.%04d.exr" % i)
+    createFile(root_path, "notes.txt")
+    createFile(os.path.join(root_path, "sub"), "foo.txt")
+
+
+def tearDown():
+    seq.setPerformanceReportCallback(None)
+    shutil.rmtree(root_path)
+
+
+def testBrowseReport():
+    """
+    Check the report filled by a browse.
+    """
+    report = seq.PerformanceReport()
+    items = seq.browse(root_path, seq.eDetectionDefault, [], report)
+    assert_equals(len(items), 3)
+    assert_equals(report.operation, "browse")
+    assert_equals(report.path, root_path)
+    assert_equals(report.nbDirectories, 1)
+    assert_equals(report.nbEntries, 22)
+    assert_equals(report.nbFilteredEntries, 0)
+    assert_equals(report.nbSequenceGroups, 1)
+    assert_equals(report.nbSequences, 1)
+    assert_equals(report.nbItems, 3)
+    assert_equals(report.nbOpenDirectory, 1)
+    assert_true(report.groupedNumbersBytes > 0)
+    assert_true(report.totalTime >= report.decomposeTime)
+
+    report = seq.PerformanceReport()
+    items = seq.browse(root_path, seq.eDetectionDefault, ["*.txt"], report)
+    assert_equals(len(items), 1)
+    assert_equals(report.nbFilteredEntries, 21)
+
+    report = seq.PerformanceReport()
+    items = seq.browseRecursive(root_path, seq.eDetectionDefault, [], -1, 0, report)
+    assert_equals(report.operation, "browseRecursive")
+    assert_equals(report.nbDirectories, 2)
+    assert_equals(report.nbItems, len(items))
+
+
+def testBrowseSequenceReport():
+    """
+    Check the reports of browseSequence and ItemStat.
+    """
+    pattern = os.path.join(root_path, "img.####.exr")
+    report = seq.PerformanceReport()
+    sequence = seq.Sequence()
+    assert_true(seq.browseSequence(sequence, pattern, seq.ePatternDefault, report))
+    assert_equals(report.operation, "browseSequence")
+    assert_equals(report.nbEntries, 22)
+    assert_equals(report.nbSequences, 1)
+
+    report = seq.PerformanceReport()
+    assert_true(seq.browseSequence(sequence, pattern, [seq.FrameRange(1, 10)], seq.ePatternDefault, 0, report))
+    assert_equals(sequence.getNbFiles(), 10)
+    assert_equals(report.nbSequences, 1)
+
+    item = seq.Item(sequence, root_path)
+    report = seq.PerformanceReport()
+    seq.ItemStat(item, False, 32, report)
+    assert_equals(report.operation, "ItemStat")
+    assert_equals(report.nbStat, 10)
+
+
+def testReportCallback():
+    """
+    Check that a registered callback receives the reports of all the operations.
+    """
+    reports = []
+    seq.setPerformanceReportCallback(reports.append)
+    seq.browse(root_path)
+    seq.browseRecursive(root_path)
+    seq.setPerformanceReportCallback(None)
+    seq.browse(root_path)
+    assert_equals([report.operation for report in reports], ["browse", "browseRecursive"])
+    assert_equals(reports[0].nbItems, 3)
+
+    # an exception in the callback doesn't interrupt the browse
+    def failingCallback(report):
+        raise RuntimeError("failing callback")
+    seq.setPerformanceReportCallback(failingCallback)
+    assert_equals(len(seq.browse(root_path)), 3)
+    seq.setPerformanceReportCallback(None)
+
+    assert_raises(ValueError, seq.setPerformanceReportCallback, 3)
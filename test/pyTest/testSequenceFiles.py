@@ -0,0 +1,106 @@
+import tempfile
+import os
+import shutil
+
+from pySequenceParser import sequenceParser as seq
+from . import createFile, createSymLink, getSequencesFromPath
+
+from nose.tools import *
+
+root_path = ''
+
+
+def setUp():
+    global root_path
+    root_path = tempfile.mkdtemp()
+    for f in ["foo.001.png", "foo.002.png", "foo.003.png", "foo.006.png", "plop.txt"]:
+        createFile(root_path, f)
+    createSymLink(root_path, "foo.006.png", "foo.007.png")
+
+
+def tearDown():
+    global root_path
+    shutil.rmtree(root_path)
+
+
+def testSequenceFiles():
+    """
+    Check the lazy list of the files of a sequence.
+    """
+    sequence = seq.Sequence("foo.###.png", [seq.FrameRange(1, 3), seq.FrameRange(10, 20, 5), seq.FrameRange(-2)])
+    files = seq.SequenceFiles(sequence)
+    assert_equals(len(files), sequence.getNbFiles())
+    assert_equals(list(files), list(sequence.getFiles()))
+    # it can be iterated several times, each iterator with its own position
+    assert_equals(list(files), list(sequence.getFiles()))
+    assert_equals([a for a, b in zip(files, files) if a == b], list(files))
+    assert_equals(len([(a, b) for a in files for b in files]), len(files) ** 2)
+
+    files = seq.SequenceFiles(sequence, root_path)
+    assert_equals(list(files)[:2], [os.path.join(root_path, "foo.001.png"), os.path.join(root_path, "foo.002.png")])
+
+    assert_equals(list(seq.SequenceFiles(seq.Sequence())), [])
+
+
+def testExplodedItems():
+    """
+    Check the lazy explode of an item, with and without a stat per file.
+    """
+    item = getSequencesFromPath(root_path, seq.eDetectionDefault)[0]
+    nbFiles = item.getSequence().getNbFiles()
+
+    seq.resetFilesystemCounters()
+    items = list(seq.ExplodedItems(item))
+    assert_equals(seq.getFilesystemCounters().nbStat, 0)
+    assert_equals(len(items), nbFiles)
+    assert_equals([i.getType() for i in items], [seq.eTypeFile] * nbFiles)
+
+    seq.resetFilesystemCounters()
+    items = list(seq.ExplodedItems(item, True))
+    assert_equals(seq.getFilesystemCounters().nbStat, nbFiles)
+    assert_equals(items[-1].getType(), seq.eTypeLink)
+
+    explodedItems = item.explode()
+    assert_equals([i.getAbsoluteFilepath() for i in items], [i.getAbsoluteFilepath() for i in explodedItems])
+    assert_equals([i.getType() for i in items], [i.getType() for i in explodedItems])
+    exploded = seq.ExplodedItems(item)
+    assert_equals([str(a) for a, b in zip(exploded, exploded) if str(a) == str(b)], [str(i) for i in exploded])
+
+    # an item which is not a sequence
+    fileItem = seq.Item(seq.eTypeFile, os.path.join(root_path, "plop.txt"))
+    items = list(seq.ExplodedItems(fileItem))
+    assert_equals(len(items), 1)
+    assert_equals(items[0].getAbsoluteFilepath(), fileItem.getAbsoluteFilepath())
+
+
+def testFilenameFormatter():
+    """
+    Check the filenames built by a formatter, with negative frames and paddings.
+    """
+    sequence = seq.Sequence("foo.####.exr", [seq.FrameRange(-12, -10), seq.FrameRange(998, 1002, 2), seq.FrameRange(123456)])
+    formatter = seq.FilenameFormatter(sequence)
+    assert_equals(formatter.getNameAt(-12), "foo.-0012.exr")
+    assert_equals(formatter.getNameAt(0), "foo.0000.exr")
+    assert_equals(formatter.getNameAt(123456), "foo.123456.exr")
+    assert_equals(formatter.getNameAt(5), sequence.getFilenameAt(5))
+
+    # all the names in a single call
+    names = formatter.formatRanges(sequence.getFrameRanges()).split("\n")
+    assert_equals(names, list(sequence.getFiles()))
+    assert_equals(formatter.formatRange(seq.FrameRange(1, 2), ";"), "foo.0001.exr;foo.0002.exr")
+    # the last frame of the type is reached without overflow
+    maxTime = 2 ** 63 - 1
+    assert_equals(formatter.formatRange(seq.FrameRange(maxTime - 1, maxTime)).split("\n"), [formatter.getNameAt(maxTime - 1), formatter.getNameAt(maxTime)])
+    invalidRange = seq.FrameRange(1, 2)
+    invalidRange.step = 0
+    assert_raises(ValueError, formatter.formatRange, invalidRange)
+    assert_raises(ValueError, formatter.formatRanges, [invalidRange])
+    # a reversed range has no frame
+    reversedRange = seq.FrameRange(1, 2)
+    reversedRange.first = 10
+    assert_equals(formatter.formatRange(reversedRange), "")
+    assert_equals(formatter.formatRanges([reversedRange, seq.FrameRange(1)]), "foo.0001.exr")
+    assert_equals(sequence.getFilenameAt(-3), "foo.-0003.exr")
+
+    formatter = seq.FilenameFormatter(seq.Sequence("@.jpg", []), root_path)
+    assert_equals(formatter.getNameAt(-3), os.path.join(root_path, "-3.jpg"))
@@ -0,0 +1,94 @@
+import tempfile
+import os
+import shutil
+
+from pySequenceParser import sequenceParser as seq
+from . import createFile
+
+from nose.tools import *
+
+root_path = ''
+
+
+def setUp():
+    global root_path
+    root_path = tempfile.mkdtemp()
+    for i in range(1, 4):
+        createFile(root_path, "foo.%04d.exr" % i)
+
+
+def tearDown():
+    global root_path
+    shutil.rmtree(root_path)
+
+
+def getRanges(sequence):
+    return [(r.first, r.last, r.step) for r in sequence.getFrameRanges()]
+
+
+def testSequenceWatcher():
+    """
+    Check the update of the frame ranges of a sequence from the changes of its files.
+    """
+    global root_path
+    watcher = seq.SequenceWatcher(os.path.join(root_path, "foo.####.exr"))
+    assert_equals(getRanges(watcher.getSequence()), [(1, 3, 1)])
+    assert_false(watcher.update())
+
+    # new frame after a hole
+    createFile(root_path, "foo.0005.exr")
+    assert_true(watcher.update(1000))
+    assert_equals(getRanges(watcher.getSequence()), [(1, 3, 1), (5, 5, 1)])
+
+    # fill the hole
+    createFile(root_path, "foo.0004.exr")
+    assert_true(watcher.update(1000))
+    assert_equals(getRanges(watcher.getSequence()), [(1, 5, 1)])
+
+    # remove and rename frames
+    os.remove(os.path.join(root_path, "foo.0003.exr"))
+    os.rename(os.path.join(root_path, "foo.0005.exr"), os.path.join(root_path, "bar.0005.exr"))
+    assert_true(watcher.update(1000))
+    watcher.update(100)
+    assert_equals(getRanges(watcher.getSequence()), [(1, 2, 1), (4, 4, 1)])
+
+    # files outside of the sequence
+    createFile(root_path, "foo.0006.jpg")
+    createFile(root_path, "bar.0006.exr")
+    assert_false(watcher.update(100))
+
+
+def testSequenceWatcherIterator():
+    """
+    Check the python generator of a watcher created from a browsed sequence.
+    """
+    global root_path
+    items = [item for item in seq.browse(root_path) if item.getType() == seq.eTypeSequence]
+    watcher = seq.SequenceWatcher(items[0])
+    createFile(root_path, "foo.0010.exr")
+    sequence = next(iter(watcher))
+    assert_true(sequence.contains(10))
+    assert_equals(sequence.getNbFiles(), watcher.getSequence().getNbFiles())
+
+
+def testSequenceWatcherFolderRemoved():
+    """
+    Check that the python generator ends when the watched folder is removed.
+    """
+    global root_path
+    watchedPath = tempfile.mkdtemp(dir=root_path)
+    createFile(watchedPath, "foo.0001.exr")
+    watcher = seq.SequenceWatcher(os.path.join(watchedPath, "foo.####.exr"))
+    assert_false(watcher.isFolderRemoved())
+    shutil.rmtree(watchedPath)
+    # the last change is the removal of the frame
+    sequences = list(watcher)
+    assert_true(watcher.isFolderRemoved())
+    assert_true(len(sequences) <= 1)
+    assert_equals(watcher.getSequence().getNbFiles(), 0)
+    assert_false(watcher.update(-1))
+
+
+@raises(ValueError)
+def testSequenceWatcherNotSequence():
+    seq.SequenceWatcher(os.path.join(root_path, "foo.exr"))
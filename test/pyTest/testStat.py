@@ -285,3 +285,131 @@ def testUndefinedStat():
     itemFile = seq.Item(seq.eTypeUndefined, os.path.join(root_path, "plop.txt"))
     itemStat = seq.ItemStat(itemFile)
     checkUnsetItemStat(itemStat)
+
+
+def testSequenceSampledStat():
+    """
+    Check stats of a big sequence, computed on a subset of files.
+    """
+    sequencePath = tempfile.mkdtemp(dir=root_path)
+    nbFiles = 200
+    realSize = 0
+    for i in range(nbFiles):
+        fileSize = 100 + (i * 37) % 50
+        realSize += fileSize
+        with open(os.path.join(sequencePath, "big.%04d.exr" % i), 'w') as f:
+            f.write("a" * fileSize)
+    itemSequence = getSequencesFromPath(sequencePath, seq.eDetectionDefault)[0]
+
+    # stat all the files
+    itemStat = seq.ItemStat(itemSequence, False)
+    assert_equals(itemStat.nbSampledFiles, nbFiles)
+    assert_equals(itemStat.size, realSize)
+    assert_equals(itemStat.sizeErrorBound, 0)
+    assert_equals(itemStat.fullNbHardLinks, nbFiles)
+
+    # stat a subset of the files
+    itemStat = seq.ItemStat(itemSequence, True, 20)
+    assert_equals(itemStat.nbSampledFiles, 20)
+    assert_greater(itemStat.sizeErrorBound, 0)
+    assert_less_equal(abs(itemStat.size - realSize), itemStat.sizeErrorBound)
+    assert_equals(itemStat.fullNbHardLinks, nbFiles)
+    assert_equals(itemStat.nbHardLinks, 1)
+    assert_greater_equal(itemStat.minSize, 100)
+    assert_less_equal(itemStat.maxSize, 149)
+    checkCommonParameters(itemStat)
+
+    # the same files are sampled each time
+    assert_equals(seq.ItemStat(itemSequence, True, 20).size, itemStat.size)
+
+
+def testStatSyscalls():
+    """
+    Check that the stats of each file come from a single stat.
+    """
+    items = [
+        seq.Item(seq.eTypeFile, os.path.join(root_path, "plop.txt")),
+        seq.Item(seq.eTypeFolder, os.path.join(root_path, "dir1")),
+        seq.Item(seq.eTypeLink, os.path.join(root_path, "plop_sym_link.txt")),
+    ]
+    for item in items:
+        seq.resetFilesystemCounters()
+        seq.ItemStat(item)
+        assert_equals(seq.getFilesystemCounters().nbStat, 1)
+
+    itemSequence = getSequencesFromPath(root_path, seq.eDetectionDefault)[0]
+    nbFilesInSequence = itemSequence.getSequence().getNbFiles()
+    for approximative in (True, False):
+        seq.resetFilesystemCounters()
+        seq.ItemStat(itemSequence, approximative)
+        assert_equals(seq.getFilesystemCounters().nbStat, nbFilesInSequence)
+
+
+def testNameCache():
+    """
+    Check the options of the resolution of user and group names.
+    """
+    itemFile = seq.Item(seq.eTypeFile, os.path.join(root_path, "plop.txt"))
+    assert_true(seq.getResolveNames())
+    try:
+        # numeric ids only
+        seq.setResolveNames(False)
+        itemStat = seq.ItemStat(itemFile)
+        assert_equals(itemStat.userName, str(itemStat.userId))
+        assert_equals(itemStat.groupName, str(itemStat.groupId))
+    finally:
+        seq.setResolveNames(True)
+
+    # names from the cache, from the system without cache, and after a clear of the cache
+    for setUp in [lambda: None, lambda: seq.setNameCacheOptions(0, 0), seq.clearNameCache]:
+        setUp()
+        checkCommonParameters(seq.ItemStat(itemFile))
+        checkCommonParameters(seq.ItemStat(itemFile))
+    seq.setNameCacheOptions(1024, 300)
+
+
+def checkSameStat(itemStat, expectedItemStat):
+    """
+    Check that two ItemStats of the same item are equal.
+    """
+    for attribute in ["deviceId", "inodeId", "nbHardLinks", "fullNbHardLinks", "userId", "groupId",
+                      "userName", "groupName", "size", "minSize", "maxSize", "realSize", "sizeOnDisk",
+                      "nbSampledFiles", "sizeErrorBound", "accessTime", "modificationTime", "lastChangeTime",
+                      "ownerCanRead", "ownerCanWrite", "ownerCanExecute", "groupCanRead", "groupCanWrite",
+                      "groupCanExecute", "otherCanRead", "otherCanWrite", "otherCanExecute"]:
+        assert_equals(getattr(itemStat, attribute), getattr(expectedItemStat, attribute))
+
+
+def testStatItems():
+    """
+    Check the stats of a list of items computed in parallel.
+    """
+    sequencePath = tempfile.mkdtemp(dir=root_path)
+    nbFiles = 150
+    for i in range(nbFiles):
+        createFile(sequencePath, "big.%04d.exr" % i)
+    bigSequence = getSequencesFromPath(sequencePath, seq.eDetectionDefault)[0]
+
+    items = [
+        seq.Item(seq.eTypeFile, os.path.join(root_path, "plop.txt")),
+        seq.Item(seq.eTypeFolder, os.path.join(root_path, "dir1")),
+        seq.Item(seq.eTypeLink, os.path.join(root_path, "plop_sym_link.txt")),
+        seq.Item(seq.eTypeFile, os.path.join(root_path, "deleted.txt")),
+        seq.Item(seq.eTypeUndefined, os.path.join(root_path, "plop.txt")),
+        getSequencesFromPath(root_path, seq.eDetectionDefault)[0],
+        bigSequence,
+    ]
+    for approximative in (True, False):
+        seq.resetFilesystemCounters()
+        itemStats = seq.statItems(items, approximative, 32, 4)
+        counters = seq.getFilesystemCounters()
+        assert_equals(len(itemStats), len(items))
+        # each folder is opened once, and each file is stat once
+        assert_equals(counters.nbOpenDirectory, 2)
+        nbSampledFiles = nbFiles if not approximative else 32
+        assert_equals(counters.nbStat, 4 + 3 + nbSampledFiles)
+
+        for item, itemStat in zip(items, itemStats):
+            checkSameStat(itemStat, seq.ItemStat(item, approximative, 32))
+        assert_equals(itemStats[-1].nbSampledFiles, nbSampledFiles)
+    checkUnsetItemStat(itemStats[3])
@@ -131,3 +131,30 @@ def testSingleSequenceMultiRanges():
     subtimes = [14, 15, 16]
     for frame, time in zip(sequence.getFramesIterable(6, 17), subtimes):
         assert_equals(frame, time)
+
+    # frame lookup
+    for index, time in enumerate(times):
+        assert_true(sequence.contains(time))
+        assert_equals(sequence.indexOf(time), index)
+        assert_equals(sequence.frameAt(index), time)
+    for time in [1, 5, 13, 17, 21, 23, 25]:
+        assert_false(sequence.contains(time))
+        assert_equals(sequence.indexOf(time), -1)
+    assert_raises(IndexError, sequence.frameAt, len(times))
+    assert_raises(IndexError, sequence.frameAt, -1)
+
+    # same lookups with an index on the frame ranges
+    index = seq.FrameRangesIndex(sequence.getFrameRanges())
+    assert_equals(index.size(), len(times))
+    for i, time in enumerate(times):
+        assert_true(index.contains(time))
+        assert_equals(index.indexOf(time), i)
+        assert_equals(index.frameAt(i), time)
+    assert_false(index.contains(21))
+    assert_equals(index.indexOf(21), -1)
+    assert_raises(IndexError, index.frameAt, len(times))
+
+    # matchFilename only checks the pattern, not the frame ranges
+    assert_equals(sequence.matchFilename("a1b21.j2c"), [True, 21, '21'])
+    assert_equals(sequence.isIn("a1b21.j2c"), [False, 0, ''])
+    assert_equals(sequence.isIn("a1b22.j2c"), [True, 22, '22'])
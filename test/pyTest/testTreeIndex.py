@@ -0,0 +1,168 @@
+import os
+import shutil
+import tempfile
+import time
+
+from pySequenceParser import sequenceParser as seq
+
+from nose.tools import *
+
+
+root_path = ""
+
+
+def createFile(path):
+    open(path, 'w').close()
+
+
+def ageDirectories(*paths):
+    """
+    Set an old modification time to some directories: a directory modified during the last second is browsed again.
+    """
+    past = time.time() - 10
+    for path in paths:
+        os.utime(path, (past, past))
+
+
+def setUp():
+    global root_path
+    root_path = tempfile.mkdtemp()
+    os.mkdir(os.path.join(root_path, "shots"))
+    os.mkdir(os.path.join(root_path, "shots", "s01"))
+    os.mkdir(os.path.join(root_path, "shots", "s02"))
+    for i in range(1, 11):
+        createFile(os.path.join(root_path, "shots", "s01", "img.%04d.exr" % i))
+    for i in range(100, 121):
+        createFile(os.path.join(root_path, "shots", "s02", "img.%04d.dpx" % i))
+    createFile(os.path.join(root_path, "shots", "s02", "notes.txt"))
+    createFile(os.path.join(root_path, "README.txt"))
+    ageDirectories(*[dirpath for dirpath, dirnames, filenames in os.walk(root_path)])
+
+
+def tearDown():
+    shutil.rmtree(root_path)
+
+
+def testTreeIndexRefresh():
+    """
+    Check that a refresh only browses the modified directories.
+    """
+    index = seq.TreeIndex()
+    counters = index.refresh(root_path)
+    assert_equals(counters.nbDirectories, 4)
+    assert_equals(counters.nbBrowsedDirectories, 4)
+    assert_equals(index.getNbDirectories(), 4)
+    assert_equals(index.size(), 7)
+
+    counters = index.refresh(root_path)
+    assert_equals(counters.nbBrowsedDirectories, 0)
+    assert_equals(index.size(), 7)
+
+    # add a folder
+    s03 = os.path.join(root_path, "shots", "s03")
+    os.mkdir(s03)
+    createFile(os.path.join(s03, "plate.0001.jpg"))
+    ageDirectories(s03, os.path.dirname(s03))
+    counters = index.refresh(root_path)
+    assert_equals(counters.nbDirectories, 5)
+    assert_equals(counters.nbBrowsedDirectories, 2)
+    assert_equals(index.size(), 9)
+
+    # remove it
+    shutil.rmtree(s03)
+    ageDirectories(os.path.dirname(s03))
+    counters = index.refresh(root_path)
+    assert_equals(counters.nbDirectories, 4)
+    assert_equals(counters.nbBrowsedDirectories, 1)
+    assert_equals(counters.nbRemovedDirectories, 1)
+    assert_equals(index.size(), 7)
+
+    assert_raises(ValueError, index.refresh, os.path.join(root_path, "README.txt"))
+
+
+def testTreeIndexQuery():
+    """
+    Check the selection of indexed items.
+    """
+    index = seq.TreeIndex()
+    index.refresh(root_path + "/")
+    assert_equals(index.getRoot(), root_path)
+
+    query = seq.TreeIndexQuery()
+    assert_equals(len(index.query(query)), 7)
+
+    query.types = seq.eTypeSequence
+    assert_equals(sorted(item.getFilename() for item in index.query(query)), ["img.####.dpx", "img.####.exr"])
+
+    query = seq.TreeIndexQuery()
+    query.extension = "txt"
+    assert_equals(sorted(item.getFilename() for item in index.query(query)), ["README.txt", "notes.txt"])
+
+    query = seq.TreeIndexQuery()
+    query.folder = os.path.join(root_path, "shots", "s02")
+    query.prefix = "img."
+    items = index.query(query)
+    assert_equals(len(items), 1)
+    item = items[0]
+    assert_equals(item.getSequence().getFirstTime(), 100)
+
+    # a folder with a trailing separator, and its sub-folders
+    query.folder = os.path.join(root_path, "shots", "s02") + "/"
+    assert_equals([str(item) for item in index.query(query)], [str(item) for item in items])
+    query = seq.TreeIndexQuery()
+    query.folder = os.path.join(root_path, "shots")
+    shotsItems = sorted(str(item) for item in index.query(query))
+    assert_true(len(shotsItems) > 1)
+    query.folder += "//"
+    assert_equals(sorted(str(item) for item in index.query(query)), shotsItems)
+
+    query = seq.TreeIndexQuery()
+    query.setFrameRange(5, 50)
+    assert_equals([item.getFilename() for item in index.query(query)], ["img.####.exr"])
+    query.setFrameRange(11, 99)
+    assert_equals(len(index.query(query)), 0)
+
+
+def testTreeIndexSaveLoad():
+    """
+    Check that a saved index gives the same results, and a refresh from it browses nothing.
+    """
+    index = seq.TreeIndex()
+    index.refresh(root_path, seq.eDetectionDefault, True)
+    report = index.getReport(seq.TreeIndexQuery())
+    assert_equals(report.nbItems, 7)
+    assert_equals(report.nbFiles, 10 + 21 + 3 + 2)
+    assert_equals(report.nbItemsWithoutStat, 0)
+
+    indexPath = tempfile.mktemp()
+    try:
+        assert_true(index.save(indexPath))
+
+        loaded = seq.TreeIndex()
+        assert_true(loaded.load(indexPath))
+        assert_equals(loaded.getRoot(), root_path)
+        assert_equals(loaded.size(), 7)
+        assert_equals(
+            sorted(item.getAbsoluteFilepath() for item in loaded.query(seq.TreeIndexQuery())),
+            sorted(item.getAbsoluteFilepath() for item in index.query(seq.TreeIndexQuery())))
+        assert_equals(loaded.getReport(seq.TreeIndexQuery()).nbFiles, report.nbFiles)
+
+        query = seq.TreeIndexQuery()
+        query.setFrameRange(120, 200)
+        items = loaded.query(query)
+        assert_equals(len(items), 1)
+        item = items[0]
+        stat = seq.IndexedStat()
+        assert_true(loaded.getStat(item, stat))
+        assert_equals(stat.size, 0)
+
+        counters = loaded.refresh(root_path, seq.eDetectionDefault, True)
+        assert_equals(counters.nbBrowsedDirectories, 0)
+
+        # not an index
+        with open(indexPath, "w") as f:
+            f.write("foo")
+        assert_false(loaded.load(indexPath))
+        assert_equals(loaded.size(), 0)
+    finally:
+        os.remove(indexPath)